@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - ALERT COALESCER
+Deduplizierung von Alerts nach (Typ, Rig, Schweregrad) mit Unterdrückungsfenstern
+Unterdrückte Wiederholungen werden periodisch als ein Digest pro Kanal gesendet
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from python_modules.alert_dispatcher import SEVERITY_LEVELS
+
+
+DEFAULT_SUPPRESSION_SECONDS = {
+    "CRITICAL": 60,
+    "HIGH": 300,
+    "WARNING": 600,
+    "INFO": 900,
+}
+
+
+class _CoalesceEntry:
+    __slots__ = ("sent_at", "pending", "last_message", "last_seen")
+
+    def __init__(self):
+        self.sent_at: Optional[float] = None
+        self.pending = 0
+        self.last_message = ""
+        self.last_seen = 0.0
+
+
+class AlertCoalescer:
+    """Entscheidet pro Alert: sofort senden oder in den nächsten Digest
+
+    Der erste Alert eines Schlüssels geht sofort raus, Wiederholungen
+    innerhalb des Unterdrückungsfensters werden nur gezählt. Feuern in
+    einem Digest-Intervall mehr als burst_threshold verschiedene Rigs
+    denselben (Typ, Schweregrad), landen weitere Rigs ebenfalls im Digest.
+    CRITICAL ist von der Burst-Regel ausgenommen.
+    """
+
+    def __init__(self, suppression_seconds: Optional[Dict[str, float]] = None,
+                 digest_severities: Iterable[str] = (), burst_threshold: int = 5,
+                 max_keys: int = 5000, max_digest_lines: int = 25):
+        self.suppression_seconds = dict(DEFAULT_SUPPRESSION_SECONDS)
+        self.suppression_seconds.update(suppression_seconds or {})
+        self.digest_severities = set(digest_severities)
+        self.burst_threshold = int(burst_threshold)
+        self.max_keys = int(max_keys)
+        self.max_digest_lines = int(max_digest_lines)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, Optional[str], str], _CoalesceEntry]" = OrderedDict()
+        self._burst_counts: Dict[Tuple[str, str], int] = {}
+        self.stats = {"offered": 0, "sent": 0, "suppressed": 0, "digests": 0, "evicted": 0}
+
+    def offer(self, alert_type: str, rig_id: Optional[str], severity: str, message: str,
+              now: Optional[float] = None) -> bool:
+        """True = sofort senden, False = im Digest zusammenfassen"""
+        now = time.monotonic() if now is None else now
+        key = (alert_type, rig_id, severity)
+
+        with self._lock:
+            self.stats["offered"] += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _CoalesceEntry()
+                if len(self._entries) > self.max_keys:
+                    self._entries.popitem(last=False)
+                    self.stats["evicted"] += 1
+            else:
+                self._entries.move_to_end(key)
+            entry.last_message = message
+            entry.last_seen = now
+
+            window = self.suppression_seconds.get(severity, self.suppression_seconds["INFO"])
+            burst_key = (alert_type, severity)
+            if severity in self.digest_severities:
+                deferred = True
+            elif entry.sent_at is not None and now - entry.sent_at < window:
+                deferred = True
+            elif (severity != "CRITICAL" and self.burst_threshold > 0
+                  and self._burst_counts.get(burst_key, 0) >= self.burst_threshold):
+                deferred = True
+            else:
+                deferred = False
+
+            if deferred:
+                entry.pending += 1
+                self.stats["suppressed"] += 1
+                return False
+
+            entry.sent_at = now
+            self._burst_counts[burst_key] = self._burst_counts.get(burst_key, 0) + 1
+            self.stats["sent"] += 1
+            return True
+
+    def drain_digest(self, now: Optional[float] = None) -> Optional[Tuple[str, str]]:
+        """Baut den Digest aller zurückgehaltenen Alerts: (Text, höchster Schweregrad)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            pending = [(key, entry.pending, entry.last_message)
+                       for key, entry in self._entries.items() if entry.pending]
+            for key, entry in list(self._entries.items()):
+                entry.pending = 0
+                window = self.suppression_seconds.get(key[2], self.suppression_seconds["INFO"])
+                if entry.sent_at is None or now - entry.sent_at >= window:
+                    del self._entries[key]
+            self._burst_counts.clear()
+            if not pending:
+                return None
+            self.stats["digests"] += 1
+
+        # Eine Zeile je (Typ, Schweregrad), betroffene Rigs zusammengefasst
+        groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for (alert_type, rig_id, severity), count, message in pending:
+            group = groups.setdefault((alert_type, severity), {"count": 0, "rigs": [], "message": message})
+            group["count"] += count
+            group["message"] = message
+            if rig_id:
+                group["rigs"].append(rig_id)
+
+        rank = {severity: index for index, severity in enumerate(SEVERITY_LEVELS)}
+        ordered = sorted(groups.items(), key=lambda item: (rank.get(item[0][1], len(rank)), -item[1]["count"]))
+        total = sum(group["count"] for group in groups.values())
+
+        lines = [f"📋 ALERT DIGEST ({total} Alerts in {len(groups)} Gruppen)"]
+        for (alert_type, severity), group in ordered[:self.max_digest_lines]:
+            lines.append(f"• {severity} {alert_type}: {group['count']}×{_rig_summary(group['rigs'])}"
+                         f" - {_summary_line(group['message'])}")
+        if len(ordered) > self.max_digest_lines:
+            lines.append(f"... und {len(ordered) - self.max_digest_lines} weitere Gruppen")
+        lines.append(f"⏰ {datetime.now().strftime('%H:%M:%S')}")
+        return "\n".join(lines), ordered[0][0][1]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "tracked_keys": len(self._entries),
+                    "pending": sum(entry.pending for entry in self._entries.values())}
+
+
+def _rig_summary(rigs: list, max_rigs: int = 5) -> str:
+    """Kurzliste betroffener Rigs, z.B. "auf 3 Rigs (rig_1, rig_2, rig_3)"."""
+    if not rigs:
+        return ""
+    shown = ", ".join(rigs[:max_rigs])
+    more = f", +{len(rigs) - max_rigs}" if len(rigs) > max_rigs else ""
+    return f" auf {len(rigs)} Rigs ({shown}{more})"
+
+
+def _summary_line(message: str, max_length: int = 80) -> str:
+    """Erste inhaltliche Zeile eines Alerts (ohne Titel- und Zeitzeile)"""
+    lines = [line.strip() for line in message.splitlines() if line.strip() and not line.startswith("⏰")]
+    line = lines[1] if len(lines) > 1 else (lines[0] if lines else "")
+    return line if len(line) <= max_length else line[:max_length - 1] + "…"
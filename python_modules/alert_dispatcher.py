@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - ALERT DISPATCHER
+Nicht-blockierende Zustellung von Alerts über Hintergrund-Worker
+Begrenzte Queue mit Overflow-Policy, damit Regel-Schleifen nie auf Chat-Dienste warten
+Token-Bucket pro Kanal mit Prioritäts-Lanes: CRITICAL überholt informative Alerts
+"""
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, List, Optional
+
+from python_modules.http_client import LatencyHistogram
+from python_modules.rate_limiter import TokenBucket
+
+
+SEVERITY_LEVELS = ('CRITICAL', 'HIGH', 'WARNING', 'INFO')
+SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITY_LEVELS)}
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest')
+
+
+class ChannelRateLimited(Exception):
+    """Kanal hat mit HTTP 429 geantwortet; Job wird nach retry_after erneut zugestellt"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate-Limit, erneut in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class AlertJob:
+    """Ein zuzustellender Alert für genau einen Kanal"""
+    channel: str
+    message: str
+    alert_type: str
+    severity: str = 'INFO'
+    created_at: float = field(default_factory=time.time)
+    attempts: int = 0
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+class AlertDispatcher:
+    """Prioritäts-Lanes pro Kanal + Worker-Threads für die Alert-Zustellung
+
+    submit() kehrt sofort zurück. Jeder Kanal hat einen Token-Bucket; ein
+    Worker nimmt immer den wichtigsten Job eines Kanals mit freiem Token
+    (CRITICAL vor HIGH vor WARNING vor INFO, innerhalb einer Stufe FIFO).
+    Ist die Queue voll, greift die Overflow-Policy: drop_oldest verwirft
+    den ältesten Job der niedrigsten belegten Stufe, sofern diese nicht
+    wichtiger als der neue Job ist (sonst wird der neue verworfen);
+    drop_newest verwirft den neuen (außer er ist CRITICAL). Kritische Jobs
+    werden nur zugunsten anderer kritischer Jobs verworfen.
+    """
+
+    def __init__(self, handler: Callable[[AlertJob], bool], workers: int = 2,
+                 max_queue: int = 1000, overflow_policy: str = 'drop_oldest',
+                 on_drop: Optional[Callable[[AlertJob], None]] = None,
+                 rate_limits: Optional[Dict[str, Dict[str, float]]] = None):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unbekannte Overflow-Policy: {overflow_policy}")
+        self.handler = handler
+        self.on_drop = on_drop
+        self.max_queue = max(1, int(max_queue))
+        self.overflow_policy = overflow_policy
+
+        self._lanes: Dict[str, List[deque]] = {}
+        self._size = 0
+        self._buckets = {
+            channel: TokenBucket(limit.get('Rate', 1.0), limit.get('Burst', 1.0))
+            for channel, limit in (rate_limits or {}).items()
+        }
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._running = True
+        self.stats = {'submitted': 0, 'delivered': 0, 'failed': 0, 'dropped': 0,
+                      'rate_limited': 0, 'max_queue_depth': 0}
+        self.delivery_latency: Dict[str, LatencyHistogram] = {}
+
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"alert-worker-{i}", daemon=True)
+            for i in range(max(1, int(workers)))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def _lane(self, job: AlertJob) -> deque:
+        lanes = self._lanes.get(job.channel)
+        if lanes is None:
+            lanes = self._lanes[job.channel] = [deque() for _ in SEVERITY_LEVELS]
+        return lanes[SEVERITY_RANK.get(job.severity, len(SEVERITY_LEVELS) - 1)]
+
+    def submit(self, job: AlertJob) -> bool:
+        """Reiht einen Alert ein (nicht blockierend); False wenn verworfen"""
+        dropped = None
+        with self._cond:
+            if self._size >= self.max_queue:
+                dropped = self._make_room(job)
+            if dropped is not job:
+                self._lane(job).append(job)
+                self._size += 1
+                self.stats['submitted'] += 1
+                self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], self._size)
+                self._cond.notify()
+            if dropped is not None:
+                self.stats['dropped'] += 1
+
+        if dropped is not None and self.on_drop:
+            self.on_drop(dropped)
+        return dropped is not job
+
+    def _make_room(self, job: AlertJob) -> AlertJob:
+        """Wendet die Overflow-Policy an; liefert den verworfenen Job (ggf. job selbst)"""
+        rank = SEVERITY_RANK.get(job.severity, len(SEVERITY_LEVELS) - 1)
+        if self.overflow_policy == 'drop_newest' and rank > 0:
+            return job
+
+        # Ältesten Job der niedrigsten belegten Stufe suchen, die nicht über der
+        # des neuen Jobs liegt; sonst wird der Neue verworfen (Outbox: später erneut)
+        for victim_rank in range(len(SEVERITY_LEVELS) - 1, rank - 1, -1):
+            heads = [lanes[victim_rank] for lanes in self._lanes.values() if lanes[victim_rank]]
+            if heads:
+                lane = min(heads, key=lambda queued: queued[0].created_at)
+                self._size -= 1
+                return lane.popleft()
+        return job
+
+    def _next_job(self, now: float):
+        """Wichtigster zustellbarer Job oder (None, Sekunden bis ein Token frei wird)"""
+        best = best_lane = best_bucket = None
+        next_wait = None
+        for channel, lanes in self._lanes.items():
+            lane = next((queued for queued in lanes if queued), None)
+            if lane is None:
+                continue
+            bucket = self._buckets.get(channel)
+            wait = bucket.time_until_available(now=now) if bucket else 0.0
+            if wait > 0:
+                next_wait = wait if next_wait is None else min(next_wait, wait)
+                continue
+            head = lane[0]
+            key = (SEVERITY_RANK.get(head.severity, len(SEVERITY_LEVELS)), head.created_at)
+            if best is None or key < best:
+                best, best_lane, best_bucket = key, lane, bucket
+
+        if best_lane is None:
+            return None, next_wait
+        if best_bucket:
+            best_bucket.consume()
+        self._size -= 1
+        return best_lane.popleft(), None
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    job, wait = self._next_job(time.monotonic()) if self._size else (None, None)
+                    if job is not None:
+                        break
+                    if not self._running and not self._size:
+                        return
+                    self._cond.wait(wait)
+                self._in_flight += 1
+
+            rate_limited = None
+            try:
+                job.attempts += 1
+                delivered = bool(self.handler(job))
+            except ChannelRateLimited as e:
+                rate_limited = e.retry_after
+                delivered = False
+            except Exception as e:
+                print(f"❌ Alert-Worker Fehler ({job.channel}): {e}")
+                delivered = False
+
+            with self._cond:
+                self._in_flight -= 1
+                if rate_limited is not None:
+                    self._requeue(job, rate_limited)
+                else:
+                    self.stats['delivered' if delivered else 'failed'] += 1
+                    if delivered:
+                        self._record_latency(job)
+                self._cond.notify_all()
+
+    def _requeue(self, job: AlertJob, retry_after: float):
+        """429: Kanal sperren und Job vorne in seine Lane zurücklegen"""
+        bucket = self._buckets.get(job.channel)
+        if bucket is None:
+            bucket = self._buckets[job.channel] = TokenBucket(1.0, 1.0)
+        bucket.block_for(retry_after)
+        job.attempts -= 1
+        self._lane(job).appendleft(job)
+        self._size += 1
+        self.stats['rate_limited'] += 1
+
+    def _record_latency(self, job: AlertJob):
+        """Zeit von der Erzeugung bis zur Zustellung je Kanal und Schweregrad"""
+        key = f"{job.channel}:{job.severity}"
+        histogram = self.delivery_latency.get(key)
+        if histogram is None:
+            histogram = self.delivery_latency[key] = LatencyHistogram()
+        histogram.observe(max(time.time() - job.created_at, 0.0) * 1000)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wartet bis Queue leer und keine Zustellung mehr läuft"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._size or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def stop(self, timeout: float = 5.0):
+        """Stellt verbleibende Alerts zu und beendet die Worker"""
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=0.5)
+
+    def free_capacity(self) -> int:
+        """Freie Queue-Plätze"""
+        with self._cond:
+            return self.max_queue - self._size
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            lanes = {
+                channel: {severity: len(lane) for severity, lane in zip(SEVERITY_LEVELS, channel_lanes)}
+                for channel, channel_lanes in self._lanes.items()
+            }
+            return {**self.stats, 'queue_depth': self._size, 'in_flight': self._in_flight,
+                    'max_queue': self.max_queue, 'overflow_policy': self.overflow_policy,
+                    'lanes': lanes,
+                    'delivery_latency': {key: histogram.to_dict()
+                                         for key, histogram in self.delivery_latency.items()}}
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - ALERT HISTORY
+Ringpuffer-Historie aller Alerts mit Indizes nach Typ, Rig, Schweregrad und Zeit
+Abfragen wie "alle CRITICAL für Rig X der letzten Stunde" per Binärsuche statt Scan
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+
+class _SeqIndex:
+    """Aufsteigende Sequenznummern und Zeitstempel eines Index-Schlüssels
+
+    Verdrängte Einträge werden nicht sofort entfernt, sondern über head
+    übersprungen und beim Kompaktieren in einem Schritt abgeschnitten.
+    """
+    __slots__ = ('seqs', 'times', 'head')
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.times: List[float] = []
+        self.head = 0
+
+    def append(self, seq: int, timestamp: float):
+        self.seqs.append(seq)
+        self.times.append(timestamp)
+
+    def trim(self, oldest_seq: int):
+        """Überspringt verdrängte Einträge; kompaktiert wenn mehr als die Hälfte tot ist"""
+        self.head = bisect_left(self.seqs, oldest_seq, self.head)
+        if self.head > 64 and self.head * 2 > len(self.seqs):
+            del self.seqs[:self.head]
+            del self.times[:self.head]
+            self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.seqs) - self.head
+
+    def range(self, since: Optional[float], until: Optional[float]) -> Tuple[int, int]:
+        """Positionsbereich [lo, hi) mit since <= Zeit <= until"""
+        lo = self.head if since is None else bisect_left(self.times, since, self.head)
+        hi = len(self.times) if until is None else bisect_right(self.times, until, lo)
+        return lo, hi
+
+
+class AlertHistory:
+    """Begrenzte Alert-Historie (Ringpuffer) mit Sekundär-Indizes
+
+    Indiziert werden Typ, Rig, Schweregrad sowie die Kombinationen
+    Rig+Schweregrad und Typ+Schweregrad. Eine Abfrage wählt den
+    kleinsten passenden Index, grenzt den Zeitraum per Binärsuche ein
+    und prüft nur restliche Filter linear: O(log n + Treffer).
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = max(1, int(capacity))
+        self._ring: List[Optional[Dict[str, Any]]] = [None] * self.capacity
+        self._next_seq = 0
+        self._last_time = 0.0
+        self._all = _SeqIndex()
+        self._indexes: Dict[tuple, _SeqIndex] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def _oldest_seq(self) -> int:
+        return max(0, self._next_seq - self.capacity)
+
+    def record(self, alert_type: str, message: str, data: Optional[Dict[str, Any]] = None,
+               severity: str = 'INFO', rig_id: Optional[str] = None, title: Optional[str] = None,
+               timestamp: Optional[float] = None) -> Dict[str, Any]:
+        """Speichert einen Alert; title wird zusätzlich als Typ indiziert (Custom-Alerts)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        alert_type = alert_type.upper()
+        severity = (severity or 'INFO').upper()
+        entry = {
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+            'type': alert_type,
+            'severity': severity,
+            'rig_id': rig_id,
+            'message': message,
+            'data': data or {},
+        }
+
+        with self._lock:
+            # Zeitindex muss monoton sein (Uhr-Sprünge zurück werden geglättet)
+            index_time = max(timestamp, self._last_time)
+            self._last_time = index_time
+            entry['_time'] = index_time
+
+            seq = self._next_seq
+            self._next_seq += 1
+            self._ring[seq % self.capacity] = entry
+
+            self._all.append(seq, index_time)
+            self._all.trim(self._oldest_seq)
+            for key in self._index_keys(alert_type, severity, rig_id, title):
+                index = self._indexes.get(key)
+                if index is None:
+                    index = self._indexes[key] = _SeqIndex()
+                index.append(seq, index_time)
+                index.trim(self._oldest_seq)
+
+            if seq and seq % self.capacity == 0:
+                self._prune_indexes()
+        return entry
+
+    @staticmethod
+    def _index_keys(alert_type: str, severity: str, rig_id: Optional[str], title: Optional[str]):
+        keys = [('type', alert_type), ('severity', severity), ('type_severity', alert_type, severity)]
+        if title and title.upper() != alert_type:
+            keys += [('type', title.upper()), ('type_severity', title.upper(), severity)]
+        if rig_id:
+            keys += [('rig', rig_id), ('rig_severity', rig_id, severity)]
+        return keys
+
+    def _prune_indexes(self):
+        """Entfernt Schlüssel ohne lebende Einträge (z.B. abgebaute Rigs)"""
+        oldest = self._oldest_seq
+        for key in list(self._indexes):
+            index = self._indexes[key]
+            index.trim(oldest)
+            if not index:
+                del self._indexes[key]
+
+    def _select_index(self, alert_type: Optional[str], rig_id: Optional[str],
+                      severity: Optional[str]) -> _SeqIndex:
+        """Kleinster Index, der mindestens einen Filter exakt abdeckt"""
+        candidates = []
+        if rig_id and severity:
+            candidates.append(('rig_severity', rig_id, severity))
+        if alert_type and severity:
+            candidates.append(('type_severity', alert_type, severity))
+        if rig_id:
+            candidates.append(('rig', rig_id))
+        if alert_type:
+            candidates.append(('type', alert_type))
+        if severity:
+            candidates.append(('severity', severity))
+        if not candidates:
+            return self._all
+
+        empty = _SeqIndex()
+        indexes = [self._indexes.get(key, empty) for key in candidates]
+        for index in indexes:
+            index.trim(self._oldest_seq)
+        return min(indexes, key=len)
+
+    def _iter_matches(self, alert_type, rig_id, severity, since, until) -> Iterator[Dict[str, Any]]:
+        """Treffer vom neuesten zum ältesten (Aufrufer hält den Lock, Filter normalisiert)"""
+        index = self._select_index(alert_type, rig_id, severity)
+        lo, hi = index.range(since, until)
+        for position in range(hi - 1, lo - 1, -1):
+            entry = self._ring[index.seqs[position] % self.capacity]
+            if rig_id and entry['rig_id'] != rig_id:
+                continue
+            if severity and entry['severity'] != severity:
+                continue
+            if alert_type and alert_type not in (entry['type'], str(entry['data'].get('title', '')).upper()):
+                continue
+            yield entry
+
+    def query(self, alert_type: Optional[str] = None, rig_id: Optional[str] = None,
+              severity: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, last_seconds: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Gefilterte Alerts in chronologischer Reihenfolge (bei limit die neuesten)
+
+        since/until: Unix-Zeit; last_seconds ist eine Abkürzung für since=now-last_seconds.
+        """
+        if last_seconds is not None:
+            since = time.time() - last_seconds
+        alert_type = alert_type.upper() if alert_type else None
+        severity = severity.upper() if severity else None
+        results = []
+        with self._lock:
+            for entry in self._iter_matches(alert_type, rig_id, severity, since, until):
+                results.append(self._public(entry))
+                if limit is not None and len(results) >= limit:
+                    break
+        results.reverse()
+        return results
+
+    def count(self, alert_type: Optional[str] = None, rig_id: Optional[str] = None,
+              severity: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, last_seconds: Optional[float] = None) -> int:
+        """Anzahl passender Alerts (reine Binärsuche, wenn ein Index alle Filter abdeckt)"""
+        if last_seconds is not None:
+            since = time.time() - last_seconds
+        alert_type = alert_type.upper() if alert_type else None
+        severity = severity.upper() if severity else None
+        with self._lock:
+            filters = sum(1 for value in (alert_type, rig_id, severity) if value)
+            composite = filters == 2 and severity and (alert_type or rig_id)
+            if filters <= 1 or composite:
+                lo, hi = self._select_index(alert_type, rig_id, severity).range(since, until)
+                return hi - lo
+            return sum(1 for _ in self._iter_matches(alert_type, rig_id, severity, since, until))
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Die letzten limit Alerts (chronologisch)"""
+        return self.query(limit=limit)
+
+    @staticmethod
+    def _public(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in entry.items() if key != '_time'}
+
+    def __len__(self) -> int:
+        return min(self._next_seq, self.capacity)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'size': len(self), 'capacity': self.capacity, 'total_recorded': self._next_seq,
+                    'index_keys': len(self._indexes)}
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - ALERT OUTBOX
+Persistente Alert-Outbox (SQLite im WAL-Modus) vor der Zustellung
+Fehlgeschlagene Sends werden mit exponentiellem Backoff wiederholt, auch nach Neustarts
+"""
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+from python_modules.alert_dispatcher import AlertJob
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    job_id TEXT PRIMARY KEY,
+    channel TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    message TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+class AlertOutbox:
+    """Write-behind Outbox: add() puffert nur, ein Writer-Thread committet in Batches
+
+    Standardmäßig landen auch CRITICAL-Alerts erst mit dem nächsten
+    Batch-Commit (batch_interval) auf der Platte. Mit sync_critical werden
+    sie sofort im Aufrufer-Thread committet (inkl. fsync) und überleben
+    auch einen Absturz direkt nach dem Einreihen - dafür blockiert der
+    aufrufende Thermal-/Control-Loop für die Dauer des Commits.
+    Zustellung ist at-least-once: nach einem Neustart werden alle offenen
+    Einträge erneut eingereiht.
+    """
+
+    def __init__(self, path: str, batch_interval: float = 0.05, retry_poll_seconds: float = 1.0,
+                 backoff_base_seconds: float = 5.0, backoff_max_seconds: float = 900.0,
+                 max_attempts: int = 20, retention_days: float = 7.0, sync_critical: bool = False):
+        self.path = path
+        self.batch_interval = batch_interval
+        self.retry_poll_seconds = retry_poll_seconds
+        self.backoff_base = backoff_base_seconds
+        self.backoff_max = backoff_max_seconds
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_days * 86400
+        self.sync_critical = sync_critical
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+
+        self._buffer_lock = threading.Lock()
+        self._inserts: List[tuple] = []
+        self._updates: List[tuple] = []
+        self._in_flight = set()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_purge = 0.0
+        self.stats = {'added': 0, 'sent': 0, 'retries_scheduled': 0, 'resubmitted': 0,
+                      'dead': 0, 'commits': 0}
+
+    # --- Schreibpfad -------------------------------------------------------
+
+    def add(self, job: AlertJob):
+        """Vermerkt einen Alert vor der Zustellung (gepuffert, mit sync_critical CRITICAL synchron)"""
+        now = time.time()
+        row = (job.job_id, job.channel, job.alert_type, job.severity, job.message,
+               job.created_at, job.attempts, now, now)
+        with self._buffer_lock:
+            self._inserts.append(row)
+            self._in_flight.add(job.job_id)
+            self.stats['added'] += 1
+        if job.severity == 'CRITICAL':
+            if self.sync_critical:
+                self.flush()
+            else:
+                self._wakeup.set()  # Writer-Thread committet sofort, Aufrufer wartet nicht
+
+    def mark_sent(self, job: AlertJob):
+        self._queue_update(job, 'sent', job.attempts, time.time(), None)
+        self.stats['sent'] += 1
+
+    def mark_failed(self, job: AlertJob, error: str = None):
+        """Plant den nächsten Versuch; nach max_attempts 'dead' (außer CRITICAL)"""
+        if job.severity != 'CRITICAL' and job.attempts >= self.max_attempts:
+            self.mark_dead(job, error)
+            return
+        self._queue_update(job, 'pending', job.attempts, time.time() + self._backoff(job.attempts), error)
+        self.stats['retries_scheduled'] += 1
+
+    def mark_dead(self, job: AlertJob, error: str = None):
+        self._queue_update(job, 'dead', job.attempts, time.time(), error)
+        self.stats['dead'] += 1
+
+    def defer(self, job: AlertJob, delay: float = None):
+        """Gibt einen nicht zugestellten Job (z.B. Queue-Overflow) für später frei"""
+        delay = self.backoff_base if delay is None else delay
+        self._queue_update(job, 'pending', job.attempts, time.time() + delay, 'queue overflow')
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponentieller Backoff mit Jitter (halb fest, halb zufällig)"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(attempts - 1, 0)))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _queue_update(self, job: AlertJob, status: str, attempts: int, next_attempt_at: float,
+                      error: Optional[str]):
+        with self._buffer_lock:
+            self._updates.append((status, attempts, next_attempt_at, error, time.time(), job.job_id))
+            self._in_flight.discard(job.job_id)
+
+    def flush(self):
+        """Schreibt alle gepufferten Änderungen in einer Transaktion"""
+        with self._db_lock:
+            with self._buffer_lock:
+                inserts, self._inserts = self._inserts, []
+                updates, self._updates = self._updates, []
+            if not inserts and not updates:
+                return
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO outbox (job_id, channel, alert_type, severity, message, "
+                    "created_at, attempts, next_attempt_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    inserts)
+                self._db.executemany(
+                    "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, "
+                    "updated_at = ? WHERE job_id = ?", updates)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                with self._buffer_lock:
+                    self._inserts[:0] = inserts
+                    self._updates[:0] = updates
+                raise
+            self.stats['commits'] += 1
+
+    # --- Retry-Schleife ----------------------------------------------------
+
+    def due_jobs(self, limit: int = 100, now: float = None) -> List[AlertJob]:
+        """Offene Einträge, deren nächster Versuch fällig ist und die nicht laufen"""
+        now = time.time() if now is None else now
+        jobs = []
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT job_id, channel, alert_type, severity, message, created_at, attempts FROM outbox "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                (now, limit + len(self._in_flight))).fetchall()
+            # Solange _db_lock gehalten wird, kann kein flush laufen: alle seit dem
+            # letzten Commit erledigten Jobs stehen noch in _updates
+            with self._buffer_lock:
+                settled = {update[-1] for update in self._updates}
+                for job_id, channel, alert_type, severity, message, created_at, attempts in rows:
+                    if job_id in self._in_flight or job_id in settled or len(jobs) >= limit:
+                        continue
+                    self._in_flight.add(job_id)
+                    jobs.append(AlertJob(channel, message, alert_type, severity, created_at, attempts, job_id))
+        return jobs
+
+    def start(self, resubmit: Callable[[AlertJob], bool], capacity: Callable[[], int] = None):
+        """Startet Writer- und Retry-Thread
+
+        resubmit: reiht einen fälligen Job erneut ein (z.B. Dispatcher.submit);
+        verworfene Jobs gibt der Aufrufer über defer() zurück.
+        capacity: freie Plätze im Dispatcher, begrenzt Nachschub pro Runde.
+        """
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, args=(resubmit, capacity),
+                                        name="alert-outbox", daemon=True)
+        self._thread.start()
+
+    def _run(self, resubmit: Callable[[AlertJob], bool], capacity: Optional[Callable[[], int]]):
+        next_retry_scan = 0.0
+        while not self._stop.is_set():
+            self._wakeup.wait(self.batch_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                now = time.monotonic()
+                if now >= next_retry_scan:
+                    next_retry_scan = now + self.retry_poll_seconds
+                    limit = capacity() if capacity else 100
+                    for job in self.due_jobs(limit) if limit > 0 else []:
+                        self.stats['resubmitted'] += 1
+                        resubmit(job)
+                    self._purge()
+            except Exception as e:
+                print(f"❌ Alert-Outbox Fehler: {e}")
+                self._stop.wait(self.retry_poll_seconds)
+
+    def _purge(self):
+        """Löscht zugestellte/aufgegebene Einträge nach Ablauf der Aufbewahrung (stündlich)"""
+        now = time.time()
+        if now - self._last_purge < 3600:
+            return
+        self._last_purge = now
+        with self._db_lock:
+            self._db.execute("DELETE FROM outbox WHERE status IN ('sent', 'dead') AND updated_at < ?",
+                             (now - self.retention_seconds,))
+
+    def close(self):
+        """Stoppt den Hintergrund-Thread und schreibt offene Änderungen"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self.flush()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._db_lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        with self._buffer_lock:
+            buffered = len(self._inserts) + len(self._updates)
+            in_flight = len(self._in_flight)
+        return {**self.stats, 'pending': counts.get('pending', 0), 'sent_total': counts.get('sent', 0),
+                'dead_total': counts.get('dead', 0), 'buffered': buffered, 'in_flight': in_flight}
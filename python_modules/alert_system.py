@@ -3,11 +3,100 @@
 CASH MONEY COLORS ORIGINAL (R) - ALERT SYSTEM
 Telegram/Discord Integration für Live-Benachrichtigungen
 """
-import requests
 from datetime import datetime
 from typing import Dict, List, Any
+import atexit
 import os
+import re
+import threading
 from python_modules.config_manager import get_config
+from python_modules.http_client import http_client
+from python_modules.alert_dispatcher import (
+    AlertDispatcher,
+    AlertJob,
+    ChannelRateLimited,
+    SEVERITY_LEVELS,
+)
+from python_modules.alert_coalescer import AlertCoalescer
+from python_modules.alert_outbox import AlertOutbox
+from python_modules.alert_history import AlertHistory
+from python_modules.rate_limiter import parse_retry_after
+
+
+# Standard-Schweregrad je Alert-Typ
+ALERT_TYPE_SEVERITIES = {
+    "RIG_FAILURE": "CRITICAL",
+    "TEMPERATURE": "HIGH",
+    "MARKET": "INFO",
+    "PROFIT": "INFO",
+}
+
+# Schweregrad für die Emoji-Argumente von send_custom_alert
+EMOJI_SEVERITIES = {
+    "🚨": "CRITICAL",
+    "❌": "HIGH",
+    "🔥": "HIGH",
+    "⚠️": "WARNING",
+    "WARN": "WARNING",
+    "ERROR": "HIGH",
+    "SUCCESS": "INFO",
+}
+
+# Standard-Limits der Chat-APIs (Telegram ~1 Nachricht/s pro Chat, Discord 5 pro 2s pro Webhook)
+DEFAULT_CHANNEL_RATE_LIMITS = {
+    "telegram": {"Rate": 1.0, "Burst": 5},
+    "discord": {"Rate": 2.5, "Burst": 5},
+}
+
+# Rig-Kennung in Alert-Texten ("Rig GPU_1: ...", "🔌 Rig: GPU_1", "Mining-Rig rig_3 ...")
+RIG_PATTERN = re.compile(r"\bRig[:\s]+([\w.\-]+)", re.IGNORECASE)
+
+
+def resolve_severity(alert_type: str, hint: str = "") -> str:
+    """Leitet den Schweregrad aus Level-/Emoji-Hinweis oder Alert-Typ ab"""
+    hint = (hint or "").strip().strip("[]")
+    if hint.upper() in SEVERITY_LEVELS:
+        return hint.upper()
+    severity = EMOJI_SEVERITIES.get(hint) or EMOJI_SEVERITIES.get(hint.upper())
+    if severity:
+        return severity
+
+    alert_type = alert_type.upper()
+    if alert_type in ALERT_TYPE_SEVERITIES:
+        return ALERT_TYPE_SEVERITIES[alert_type]
+    if "CRITICAL" in alert_type or "EMERGENCY" in alert_type or "FAILURE" in alert_type:
+        return "CRITICAL"
+    if "ERROR" in alert_type:
+        return "HIGH"
+    if "WARN" in alert_type:
+        return "WARNING"
+    return "INFO"
+
+
+def raise_if_rate_limited(response):
+    """Wirft ChannelRateLimited bei HTTP 429 (Retry-After Header oder JSON-Body)"""
+    if response.status_code != 429:
+        return
+    retry_after = parse_retry_after(response, default=None)
+    if retry_after is None:
+        try:
+            body = response.json()
+            retry_after = float(
+                body.get("retry_after") or body.get("parameters", {}).get("retry_after", 1.0)
+            )
+        except (ValueError, AttributeError, TypeError):
+            retry_after = 1.0
+    raise ChannelRateLimited(retry_after)
+
+
+def extract_rig_id(message: str, data: Dict[str, Any] = None) -> str:
+    """Rig-Kennung aus Alert-Daten oder -Text (None wenn nicht rig-bezogen)"""
+    data = data or {}
+    rig_id = data.get("rig_id") or data.get("id")
+    if rig_id:
+        return str(rig_id)
+    match = RIG_PATTERN.search(message)
+    return match.group(1) if match else None
 
 
 class AlertSystem:
@@ -17,7 +106,11 @@ class AlertSystem:
         self.telegram_config = get_config("Alerts.Telegram", {})
         self.discord_config = get_config("Alerts.Discord", {})
         self.enabled_alerts = []
-        self.alert_history = []
+        self.alert_history = AlertHistory(get_config("Alerts.HistoryCapacity", 10000))
+        self.channel_senders = {
+            "telegram": self._send_telegram_alert,
+            "discord": self._send_discord_alert,
+        }
 
         # Aktiviere verfügbare Services
         if self.telegram_config.get("Enabled", False):
@@ -33,8 +126,75 @@ class AlertSystem:
                 "oder Discord in settings.json"
             )
 
+        # Outbox, Worker und Digest-Thread nur, wenn überhaupt zugestellt wird
+        self.outbox = None
+        self.dispatcher = None
+        self.coalescer = None
+        self._digest_stop = threading.Event()
+        if self.enabled_alerts:
+            self._start_delivery()
+
         print("🚨 ALERT SYSTEM INITIALIZED")
 
+    def _start_delivery(self):
+        """Startet Outbox, Dispatcher-Worker und Digest-Thread (nur mit aktivem Kanal)"""
+        # Alerts werden vor der Zustellung persistiert und bei Fehlern wiederholt
+        outbox_config = get_config("Alerts.Outbox", {})
+        if outbox_config.get("Enabled", True):
+            try:
+                self.outbox = AlertOutbox(
+                    outbox_config.get(
+                        "Path",
+                        os.path.join(get_config("Logging.LogDir", "logs"), "alert_outbox.db"),
+                    ),
+                    batch_interval=float(outbox_config.get("BatchIntervalMs", 50)) / 1000,
+                    retry_poll_seconds=float(outbox_config.get("RetryPollSeconds", 1.0)),
+                    backoff_base_seconds=float(outbox_config.get("BackoffBaseSeconds", 5.0)),
+                    backoff_max_seconds=float(outbox_config.get("BackoffMaxSeconds", 900.0)),
+                    max_attempts=int(outbox_config.get("MaxAttempts", 20)),
+                    retention_days=float(outbox_config.get("RetentionDays", 7)),
+                    # Opt-in: CRITICAL sofort fsyncen (absturzsicher, blockiert aber den Aufrufer)
+                    sync_critical=outbox_config.get("SyncCritical", False),
+                )
+                atexit.register(self.outbox.close)
+            except Exception as e:
+                print(f"⚠️ Alert-Outbox nicht verfügbar: {e}")
+
+        # Zustellung läuft in Hintergrund-Workern, Aufrufer warten nie auf HTTP
+        dispatch_config = get_config("Alerts.Dispatch", {})
+        self.dispatcher = AlertDispatcher(
+            self._deliver,
+            workers=int(dispatch_config.get("Workers", 2)),
+            max_queue=int(dispatch_config.get("MaxQueueSize", 1000)),
+            overflow_policy=dispatch_config.get("OverflowPolicy", "drop_oldest"),
+            on_drop=self._on_dispatch_drop,
+            rate_limits={
+                **DEFAULT_CHANNEL_RATE_LIMITS,
+                **get_config("Alerts.RateLimits", {}),
+            },
+        )
+        if self.outbox:
+            # Offene Alerts aus früheren Läufen werden hier wieder eingereiht
+            self.outbox.start(self.dispatcher.submit, capacity=self.dispatcher.free_capacity)
+        atexit.register(
+            self.dispatcher.flush, float(dispatch_config.get("ShutdownFlushSeconds", 2.0))
+        )
+
+        # Wiederholte Alerts je (Typ, Rig, Schweregrad) bündeln
+        coalescing_config = get_config("Alerts.Coalescing", {})
+        if coalescing_config.get("Enabled", True):
+            self.coalescer = AlertCoalescer(
+                suppression_seconds=coalescing_config.get("SuppressionSeconds"),
+                digest_severities=coalescing_config.get("DigestSeverities", []),
+                burst_threshold=int(coalescing_config.get("BurstThreshold", 5)),
+                max_keys=int(coalescing_config.get("MaxKeys", 5000)),
+                max_digest_lines=int(coalescing_config.get("MaxDigestLines", 25)),
+            )
+            self.digest_interval = float(coalescing_config.get("DigestIntervalSeconds", 300))
+            threading.Thread(target=self._digest_loop, name="alert-digest", daemon=True).start()
+            # atexit läuft LIFO: Digest wird vor dem Dispatcher-Flush eingereiht
+            atexit.register(self.flush_digest)
+
     def send_profit_alert(self, profit_data: Dict[str, Any]):
         """Benachrichtigung bei Profit-Milestones"""
         current_profit = profit_data.get("current_total_profit", 0)
@@ -72,7 +232,7 @@ class AlertSystem:
                 f"⏰ {datetime.now().strftime('%H:%M:%S')}"
             )
 
-            self._send_alert(message, "TEMPERATURE")
+            self._send_alert(message, "TEMPERATURE", rig_id=extract_rig_id(message, rig_data))
             self._log_alert("TEMPERATURE", message, rig_data)
 
     def send_rig_failure_alert(self, rig_data: Dict[str, Any]):
@@ -85,7 +245,7 @@ class AlertSystem:
             f"⏰ {datetime.now().strftime('%H:%M:%S')}"
         )
 
-        self._send_alert(message, "RIG_FAILURE")
+        self._send_alert(message, "RIG_FAILURE", rig_id=extract_rig_id(message, rig_data))
         self._log_alert("RIG_FAILURE", message, rig_data)
 
     def send_market_alert(self, market_data: Dict[str, Any]):
@@ -118,7 +278,12 @@ class AlertSystem:
             f"⏰ {datetime.now().strftime('%H:%M:%S')}"
         )
 
-        self._send_alert(formatted_message, alert_type.upper())
+        self._send_alert(
+            formatted_message,
+            alert_type.upper(),
+            resolve_severity(alert_type),
+            rig_id=extract_rig_id(message, data),
+        )
         self._log_alert(alert_type.upper(), formatted_message, data or {})
 
     def send_custom_alert(self, title: str, message: str, emoji: str = "ℹ️"):
@@ -129,15 +294,26 @@ class AlertSystem:
             f"⏰ {datetime.now().strftime('%H:%M:%S')}"
         )
 
-        self._send_alert(formatted_message, "CUSTOM")
+        severity = resolve_severity(title, emoji)
+        self._send_alert(
+            formatted_message,
+            "CUSTOM",
+            severity,
+            rig_id=extract_rig_id(message),
+            coalesce_type=title.upper(),
+        )
         self._log_alert(
-            "CUSTOM", formatted_message, {"title": title, "emoji": emoji}
+            "CUSTOM",
+            formatted_message,
+            {"title": title, "emoji": emoji},
+            severity=severity,
+            title=title,
         )
 
-    def _send_telegram_alert(self, message: str):
-        """Sendet Alert via Telegram"""
+    def _send_telegram_alert(self, message: str) -> bool:
+        """Sendet Alert via Telegram; True bei Erfolg, ChannelRateLimited bei 429"""
         if "telegram" not in self.enabled_alerts:
-            return
+            return False
 
         bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         if not bot_token:
@@ -149,7 +325,7 @@ class AlertSystem:
 
         if not bot_token or not chat_id:
             print("⚠️ Telegram-Bot nicht konfiguriert")
-            return
+            return False
 
         try:
             url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
@@ -159,19 +335,23 @@ class AlertSystem:
                 "parse_mode": "HTML",
             }
 
-            response = requests.post(url, json=payload, timeout=10)
+            response = http_client.post(url, json=payload, endpoint="telegram /sendMessage")
+            raise_if_rate_limited(response)
             if response.status_code == 200:
                 print("📱 Telegram Alert gesendet")
-            else:
-                print(f"❌ Telegram Fehler: {response.status_code}")
+                return True
+            print(f"❌ Telegram Fehler: {response.status_code}")
 
+        except ChannelRateLimited:
+            raise
         except Exception as e:
             print(f"❌ Telegram Exception: {e}")
+        return False
 
-    def _send_discord_alert(self, message: str):
-        """Sendet Alert via Discord Webhook"""
+    def _send_discord_alert(self, message: str) -> bool:
+        """Sendet Alert via Discord Webhook; True bei Erfolg, ChannelRateLimited bei 429"""
         if "discord" not in self.enabled_alerts:
-            return
+            return False
 
         webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
         if not webhook_url:
@@ -179,7 +359,7 @@ class AlertSystem:
 
         if not webhook_url:
             print("⚠️ Discord-Webhook nicht konfiguriert")
-            return
+            return False
 
         try:
             payload = {
@@ -188,46 +368,160 @@ class AlertSystem:
                 "avatar_url": "https://i.imgur.com/4M34hi2.png",
             }
 
-            response = requests.post(webhook_url, json=payload, timeout=10)
+            response = http_client.post(webhook_url, json=payload, endpoint="discord /webhook")
+            raise_if_rate_limited(response)
             if response.status_code == 204:
                 print("🎮 Discord Alert gesendet")
-            else:
-                print(f"❌ Discord Fehler: {response.status_code}")
+                return True
+            print(f"❌ Discord Fehler: {response.status_code}")
 
+        except ChannelRateLimited:
+            raise
         except Exception as e:
             print(f"❌ Discord Exception: {e}")
+        return False
 
-    def _send_alert(self, message: str, alert_type: str):
-        """Sendet Alert an alle aktivierten Services"""
-        if self.telegram_config.get(
-            "Enabled", False
-        ) and alert_type in self.telegram_config.get("AlertTypes", ["all"]):
-            self._send_telegram_alert(message)
-
-        if self.discord_config.get(
-            "Enabled", False
-        ) and alert_type in self.discord_config.get("AlertTypes", ["all"]):
-            self._send_discord_alert(message)
-
-    def _log_alert(self, alert_type: str, message: str, data: Dict[str, Any]):
-        """Loggt Alert intern"""
-        alert_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "type": alert_type,
-            "message": message,
-            "data": data,
-        }
-        self.alert_history.append(alert_entry)
+    def _channel_accepts(self, channel_config: Dict[str, Any], alert_type: str) -> bool:
+        """Prüft Enabled und AlertTypes-Filter eines Kanals ("all" = alle Typen)"""
+        alert_types = channel_config.get("AlertTypes", ["all"])
+        return channel_config.get("Enabled", False) and (
+            "all" in alert_types or alert_type in alert_types
+        )
 
-        # Behalte nur die letzten 100 Alerts
-        if len(self.alert_history) > 100:
-            self.alert_history.pop(0)
+    def _send_alert(
+        self,
+        message: str,
+        alert_type: str,
+        severity: str = None,
+        rig_id: str = None,
+        coalesce_type: str = None,
+    ):
+        """Reiht den Alert für alle aktivierten Services ein (nicht blockierend)
+
+        coalesce_type: Schlüssel für die Deduplizierung (Standard: alert_type),
+        z.B. der Titel eines Custom-Alerts.
+        """
+        severity = severity or resolve_severity(alert_type)
+        if self.coalescer and not self.coalescer.offer(
+            coalesce_type or alert_type, rig_id, severity, message
+        ):
+            return
+        self._dispatch(message, alert_type, severity)
+
+    def _dispatch(self, message: str, alert_type: str, severity: str, digest: bool = False):
+        """Übergibt einen Alert pro akzeptierendem Kanal an den Dispatcher"""
+        if not self.dispatcher:
+            return
+        channels = (
+            ("telegram", self.telegram_config),
+            ("discord", self.discord_config),
+        )
+        for channel, channel_config in channels:
+            # Digests gehen an jeden aktiven Kanal, unabhängig vom AlertTypes-Filter
+            if (digest and channel_config.get("Enabled", False)) or self._channel_accepts(
+                channel_config, alert_type
+            ):
+                job = AlertJob(channel, message, alert_type, severity)
+                if self.outbox:
+                    self.outbox.add(job)
+                self.dispatcher.submit(job)
+
+    def flush_digest(self):
+        """Sendet zurückgehaltene Alerts sofort als Digest"""
+        digest = self.coalescer.drain_digest() if self.coalescer else None
+        if digest:
+            message, severity = digest
+            self._dispatch(message, "DIGEST", severity, digest=True)
+
+    def _digest_loop(self):
+        while not self._digest_stop.wait(self.digest_interval):
+            try:
+                self.flush_digest()
+            except Exception as e:
+                print(f"❌ Alert-Digest Fehler: {e}")
+
+    def _deliver(self, job: AlertJob) -> bool:
+        """Worker-Callback: stellt einen Alert zu und meldet das Ergebnis an die Outbox"""
+        if job.channel not in self.enabled_alerts:
+            # z.B. Kanal seit dem Neustart deaktiviert: nicht endlos wiederholen
+            if self.outbox:
+                self.outbox.mark_dead(job, "channel disabled")
+            return False
 
+        try:
+            delivered = self.channel_senders[job.channel](job.message)
+        except ChannelRateLimited:
+            # Dispatcher sperrt den Kanal und stellt den Job erneut zu
+            raise
+        except Exception as e:
+            print(f"❌ Alert-Zustellung Fehler ({job.channel}): {e}")
+            delivered = False
+
+        if self.outbox:
+            if delivered:
+                self.outbox.mark_sent(job)
+            else:
+                self.outbox.mark_failed(job, "send failed")
+        return delivered
+
+    def _on_dispatch_drop(self, job: AlertJob):
+        """Queue-Overflow: Alert bleibt in der Outbox und wird später erneut versucht"""
+        if self.outbox:
+            self.outbox.defer(job)
+
+    def flush_alerts(self, timeout: float = 10.0) -> bool:
+        """Wartet bis alle eingereihten Alerts zugestellt sind"""
+        return self.dispatcher.flush(timeout) if self.dispatcher else True
+
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """Queue-Tiefe, Zustell-Zähler und Zustell-Latenzen des Dispatchers"""
+        if not self.dispatcher:
+            return {"enabled_channels": []}
+        stats = self.dispatcher.get_metrics()
+        if self.outbox:
+            stats["outbox"] = self.outbox.get_metrics()
+        if self.coalescer:
+            stats["coalescing"] = self.coalescer.get_metrics()
+        return stats
+
+    def _log_alert(
+        self,
+        alert_type: str,
+        message: str,
+        data: Dict[str, Any],
+        severity: str = None,
+        rig_id: str = None,
+        title: str = None,
+    ):
+        """Loggt Alert intern (indizierte Ringpuffer-Historie)"""
+        self.alert_history.record(
+            alert_type,
+            message,
+            data,
+            severity=severity or resolve_severity(alert_type),
+            rig_id=rig_id or extract_rig_id(message, data),
+            title=title,
+        )
         print(f"🚨 ALERT LOGGED: {alert_type}")
 
     def get_alert_history(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Gibt Alert-Historie zurück"""
-        return self.alert_history[-limit:]
+        return self.alert_history.recent(limit)
+
+    def query_alerts(
+        self,
+        alert_type: str = None,
+        rig_id: str = None,
+        severity: str = None,
+        since: float = None,
+        until: float = None,
+        last_seconds: float = None,
+        limit: int = None,
+    ) -> List[Dict[str, Any]]:
+        """Gefilterte Alert-Historie, z.B. query_alerts(rig_id="GPU_1", severity="CRITICAL", last_seconds=3600)"""
+        return self.alert_history.query(
+            alert_type, rig_id, severity, since, until, last_seconds, limit
+        )
 
     def test_alert(self, service: str = "all"):
         """Test-Funktion für Alerts"""
@@ -238,10 +532,16 @@ class AlertSystem:
             f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
 
-        if service in ["telegram", "all"]:
-            self._send_telegram_alert(test_message)
-        if service in ["discord", "all"]:
-            self._send_discord_alert(test_message)
+        senders = (
+            ("telegram", self._send_telegram_alert),
+            ("discord", self._send_discord_alert),
+        )
+        for channel, sender in senders:
+            if service in [channel, "all"]:
+                try:
+                    sender(test_message)
+                except ChannelRateLimited as e:
+                    print(f"⚠️ {channel} Rate-Limit: {e}")
 
         print(f"🧪 Test-Alert gesendet an: {service}")
 
@@ -291,6 +591,28 @@ def get_alert_history(limit=20):
     return alert_system.get_alert_history(limit)
 
 
+def query_alerts(alert_type=None, rig_id=None, severity=None, last_seconds=None, limit=None):
+    """Gefilterte Alert-Historie"""
+    return alert_system.query_alerts(
+        alert_type, rig_id, severity, last_seconds=last_seconds, limit=limit
+    )
+
+
+def flush_alerts(timeout=10.0):
+    """Wartet auf die Zustellung aller eingereihten Alerts"""
+    return alert_system.flush_alerts(timeout)
+
+
+def flush_alert_digest():
+    """Zurückgehaltene Alerts sofort als Digest senden"""
+    alert_system.flush_digest()
+
+
+def get_alert_dispatch_stats():
+    """Dispatcher-Statistik"""
+    return alert_system.get_dispatch_stats()
+
+
 if __name__ == "__main__":
     print("CASH MONEY COLORS ORIGINAL (R) - ALERT SYSTEM")
     print("=" * 50)
@@ -315,6 +637,7 @@ if __name__ == "__main__":
         "ETH": {"usd": 3800, "change_24h": 12.3},
     }
     send_market_alert(test_market_data)
+    flush_alerts()
 
     print("\n✅ ALERT SYSTEM BEREIT!")
     print(
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - ALGORITHM SWITCH BACKTESTER
+Vektorisierter Backtest der Algorithmus-Wechsel-Strategie auf historischen Daten
+Parameter-Sweep über SwitchThreshold, MinSwitchIntervalMinutes, RiskTolerance, VolatilityMultiplier, VolatilityModel
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+
+try:
+    from python_modules.algorithm_catalog import ALGORITHMS, DEFAULT_ALGORITHM, RISK_TOLERANCE_FACTORS
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from python_modules.algorithm_catalog import ALGORITHMS, DEFAULT_ALGORITHM, RISK_TOLERANCE_FACTORS
+
+
+MINUTES_PER_DAY = 1440
+
+
+@dataclass
+class MarketSeries:
+    """Historische Preis- und Pool-Profitabilitäts-Zeitreihen"""
+    timestamps: np.ndarray      # (T,) Unix-Sekunden, aufsteigend
+    coins: List[str]
+    prices_usd: np.ndarray      # (T, C) Coin-Preise in USD
+    algorithms: List[str]
+    paying_usd: np.ndarray      # (T, A) Pool paying_usd, NaN = nicht verfügbar
+
+
+def load_market_series(path: str) -> MarketSeries:
+    """Lädt aufgezeichnete Zeitreihen aus einer .npz-Datei"""
+    data = np.load(path, allow_pickle=False)
+    return MarketSeries(
+        timestamps=data['timestamps'].astype(np.float64),
+        coins=[str(c) for c in data['coins']],
+        prices_usd=data['prices_usd'].astype(np.float64),
+        algorithms=[str(a) for a in data['algorithms']],
+        paying_usd=data['paying_usd'].astype(np.float64),
+    )
+
+
+def save_market_series(series: MarketSeries, path: str):
+    """Speichert Zeitreihen als .npz-Datei"""
+    np.savez_compressed(
+        path,
+        timestamps=series.timestamps,
+        coins=np.array(series.coins),
+        prices_usd=series.prices_usd,
+        algorithms=np.array(series.algorithms),
+        paying_usd=series.paying_usd,
+    )
+
+
+def generate_synthetic_series(days: int = 365, seed: int = 42,
+                              algorithms: Optional[Dict[str, Dict[str, Any]]] = None) -> MarketSeries:
+    """Erzeugt reproduzierbare 1-Minuten-Zeitreihen (Random Walk) für Tests"""
+    algorithms = algorithms or ALGORITHMS
+    rng = np.random.default_rng(seed)
+    steps = days * MINUTES_PER_DAY
+
+    coins = sorted({coin for config in algorithms.values() for coin in config['coins']})
+    start_prices = rng.uniform(0.05, 50000, len(coins))
+    log_returns = rng.normal(0, 0.0008, (steps, len(coins)))
+    prices = start_prices * np.exp(np.cumsum(log_returns, axis=0))
+
+    algo_names = list(algorithms.keys())
+    paying_start = rng.uniform(0.05, 0.3, len(algo_names))
+    paying_returns = rng.normal(0, 0.0015, (steps, len(algo_names)))
+    paying = paying_start * np.exp(np.cumsum(paying_returns, axis=0))
+
+    timestamps = time.time() - (steps - np.arange(steps)) * 60.0
+    return MarketSeries(timestamps, coins, prices, algo_names, paying)
+
+
+class SwitchBacktester:
+    """Spielt Zeitreihen durch die Switch-Logik des AlgorithmSwitcher"""
+
+    def __init__(self, series: MarketSeries, rig_count: int = 1,
+                 initial_algorithm: Optional[str] = None,
+                 algorithms: Optional[Dict[str, Dict[str, Any]]] = None,
+                 window_hours: float = 24, ewma_halflife_hours: float = 6,
+                 min_history_minutes: int = 60):
+        """window_hours/ewma_halflife_hours/min_history_minutes entsprechen
+        Market.VolatilityWindowHours, Market.EwmaHalfLifeHours und Market.MinHistoryMinutes
+        """
+        self.series = series
+        self.rig_count = rig_count
+        algorithms = algorithms or ALGORITHMS
+
+        # Nur Algorithmen mit Pool-Zeitreihe und bekanntem Mapping
+        self.algorithms = [a for a in series.algorithms if a in algorithms]
+        columns = [series.algorithms.index(a) for a in self.algorithms]
+        paying = series.paying_usd[:, columns]
+
+        initial = initial_algorithm or DEFAULT_ALGORITHM
+        self.initial_index = self.algorithms.index(initial) if initial in self.algorithms else 0
+
+        self.timestamps = series.timestamps
+        step_seconds = float(np.median(np.diff(self.timestamps))) if len(self.timestamps) > 1 else 60.0
+        self.step_minutes = step_seconds / 60.0
+
+        # Tages-Volatilität je Coin wie PriceHistory (realisiert/EWMA); solange die
+        # Historie kürzer als min_history_minutes ist, wie live abs(change_24h)
+        coin_volatility = self._coin_volatility(series.prices_usd, window_hours,
+                                                ewma_halflife_hours, min_history_minutes)
+
+        # Volatilitäts-Kategorie je Modell und Algorithmus (T, A):
+        # +1 ruhig (<5%), -1 volatil (>20%), 0 neutral
+        self.volatility_category = {}
+        for model, per_coin in coin_volatility.items():
+            volatility = np.zeros((len(self.timestamps), len(self.algorithms)))
+            for j, algo in enumerate(self.algorithms):
+                coin_columns = [series.coins.index(c) for c in algorithms[algo]['coins'] if c in series.coins]
+                if coin_columns:
+                    volatility[:, j] = per_coin[:, coin_columns].mean(axis=1)
+            self.volatility_category[model] = np.where(
+                volatility > 20, -1, np.where(volatility < 5, 1, 0)).astype(np.int8)
+        self.difficulty = np.array([algorithms[a]['difficulty_multiplier'] for a in self.algorithms])
+
+        # Geschätzter Tagesprofit wie analyze_algorithm_performance (NaN = nicht im Pool)
+        self.available = ~np.isnan(paying)
+        self.local_profit = np.where(self.available, rig_count * np.nan_to_num(paying) * 100, 0.0)
+
+        # Kumulierter realisierter Profit je Algorithmus für O(1)-Segmentsummen
+        step_days = self.step_minutes / MINUTES_PER_DAY
+        self.cumulative_profit = np.vstack([
+            np.zeros((1, len(self.algorithms))),
+            np.cumsum(self.local_profit * step_days, axis=0)
+        ])
+
+    def _coin_volatility(self, prices: np.ndarray, window_hours: float, ewma_halflife_hours: float,
+                         min_history_minutes: int) -> Dict[str, np.ndarray]:
+        """Volatilität in % pro Tag je Zeitpunkt und Coin (T, C) für 'realized' und 'ewma'
+
+        Gleiche Definition wie CoinPriceSeries: Log-Renditen zwischen
+        1-Minuten-Buckets, über die Zeitdifferenz normiert.
+        """
+        minutes = np.floor(self.timestamps / 60.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.nan_to_num(np.diff(np.log(prices), axis=0), nan=0.0, posinf=0.0, neginf=0.0)
+        returns = np.vstack([np.zeros((1, prices.shape[1])), returns])
+        dt = np.concatenate([[0.0], np.diff(minutes)])
+
+        # Realisiert: Renditen i mit minutes[i-1] >= jetzt - Fenster (wie _evict)
+        window_start = np.searchsorted(minutes, minutes - window_hours * 60, side='left') + 1
+        window_start = np.minimum(window_start, np.arange(len(minutes)) + 1)
+        cumulative_sq = np.cumsum(returns * returns, axis=0)
+        previous = np.maximum(window_start - 1, 0)
+        sum_sq = cumulative_sq - cumulative_sq[previous]
+        sum_dt = minutes - minutes[previous]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            realized = np.sqrt(np.maximum(sum_sq, 0.0) / sum_dt[:, None] * MINUTES_PER_DAY) * 100
+
+        # EWMA der Varianzrate: var_t = d_t * var_(t-1) + (1 - d_t) * r_t^2 / dt_t
+        tau = ewma_halflife_hours * 60 / np.log(2)
+        decay = np.exp(-dt / tau)
+        decay[:2] = 0.0  # erste Rendite initialisiert die Varianz (wie ewma_var = None)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = np.nan_to_num(returns * returns / np.maximum(dt, 1)[:, None])
+        weights = np.where(np.arange(len(dt)) == 1, 1.0, 1.0 - decay)
+        ewma = np.sqrt(_linear_recurrence(decay, rate * weights[:, None]) * MINUTES_PER_DAY) * 100
+
+        # Fallback auf abs(change_24h) wie CoinGecko usd_24h_change
+        lag = max(1, int(round(MINUTES_PER_DAY / self.step_minutes)))
+        reference = np.empty_like(prices)
+        reference[lag:] = prices[:-lag]
+        reference[:lag] = prices[0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_24h = np.nan_to_num(np.abs((prices / reference - 1.0) * 100.0))
+
+        short_history = (sum_dt < min_history_minutes)[:, None]
+        return {
+            'realized': np.where(short_history, change_24h, np.nan_to_num(realized)),
+            'ewma': np.where(short_history, change_24h, ewma),
+        }
+
+    def _decision_indices(self, check_interval_minutes: float) -> np.ndarray:
+        step = max(1, int(round(check_interval_minutes / self.step_minutes)))
+        return np.arange(0, len(self.timestamps), step)
+
+    def _scores(self, decision_idx: np.ndarray, params: Dict[str, Any]) -> np.ndarray:
+        """final_score je Entscheidungszeitpunkt und Algorithmus (vektorisiert)"""
+        base_risk = RISK_TOLERANCE_FACTORS.get(params.get('RiskTolerance', 'medium'), 1.0)
+        multiplier = params.get('VolatilityMultiplier', 1.0)
+
+        model = params.get('VolatilityModel', 'realized')
+        category = self.volatility_category.get(model, self.volatility_category['realized'])[decision_idx]
+        adjustment = np.where(category < 0, 1.0 - multiplier * 0.2,
+                              np.where(category > 0, 1.0 + multiplier * 0.1, 1.0))
+        risk = np.clip(base_risk * adjustment * self.difficulty[None, :], 0.1, 2.0)
+
+        scores = self.local_profit[decision_idx] * risk * params.get('PoolBias', 1.0)
+        return np.where(self.available[decision_idx], scores, -np.inf)
+
+    def run(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Backtest einer Parameter-Kombination"""
+        check_interval = params.get('CheckIntervalMinutes',
+                                    params.get('AnalysisWindowHours', 24) * 60 / 24)
+        decision_idx = self._decision_indices(check_interval)
+        decision_minutes = (self.timestamps[decision_idx] - self.timestamps[0]) / 60.0
+
+        scores = self._scores(decision_idx, params)
+        best_idx = np.argmax(scores, axis=1)
+        best_score = scores[np.arange(len(decision_idx)), best_idx]
+
+        # Verbesserung gegenüber jedem möglichen aktuellen Algorithmus (wie get_optimal_algorithm)
+        current_scores = np.where(np.isfinite(scores), scores, 0.0)
+        with np.errstate(invalid='ignore'):
+            improvement = (best_score[:, None] - current_scores) / np.maximum(current_scores, 0.01) * 100
+        threshold = params.get('SwitchThreshold', 15.0)
+        switch_candidates = (
+            (improvement >= threshold)
+            & np.isfinite(best_score)[:, None]
+            & (best_idx[:, None] != np.arange(len(self.algorithms))[None, :])
+        )
+        candidates_per_algo = [np.flatnonzero(switch_candidates[:, j]) for j in range(len(self.algorithms))]
+
+        # Ereignisgesteuerte Simulation: nur Switch-Zeitpunkte werden besucht
+        min_interval = params.get('MinSwitchIntervalMinutes', 60)
+        current = self.initial_index
+        position = 0
+        switches = []
+        while True:
+            candidates = candidates_per_algo[current]
+            k = np.searchsorted(candidates, position)
+            if k >= len(candidates):
+                break
+            decision = candidates[k]
+            new_algo = int(best_idx[decision])
+            switches.append((int(decision_idx[decision]), current, new_algo))
+            current = new_algo
+            position = int(np.searchsorted(decision_minutes, decision_minutes[decision] + min_interval))
+
+        # Realisierter Profit über Segmente des jeweils aktiven Algorithmus
+        realized = 0.0
+        segment_start = 0
+        active = self.initial_index
+        for switch_at, _, new_algo in switches:
+            realized += self.cumulative_profit[switch_at, active] - self.cumulative_profit[segment_start, active]
+            segment_start, active = switch_at, new_algo
+        realized += self.cumulative_profit[-1, active] - self.cumulative_profit[segment_start, active]
+
+        downtime_minutes = params.get('SwitchDowntimeMinutes', 0)
+        if downtime_minutes and switches:
+            average_per_minute = realized / max(len(self.timestamps) * self.step_minutes, 1)
+            realized -= average_per_minute * downtime_minutes * len(switches)
+
+        return {
+            'params': dict(params),
+            'realized_profit': float(realized),
+            'switch_count': len(switches),
+            'final_algorithm': self.algorithms[active],
+        }
+
+    def hold_profit(self, algorithm: Optional[str] = None) -> float:
+        """Referenz: Profit ohne jeden Wechsel"""
+        j = self.algorithms.index(algorithm) if algorithm in self.algorithms else self.initial_index
+        return float(self.cumulative_profit[-1, j])
+
+
+def _linear_recurrence(decay: np.ndarray, inputs: np.ndarray) -> np.ndarray:
+    """y_t = decay_t * y_(t-1) + inputs_t (y_-1 = 0) als paralleler Scan in O(T log T)"""
+    a = decay[:, None] * np.ones((1, inputs.shape[1]))
+    b = inputs.copy()
+    shift = 1
+    while shift < len(b):
+        b[shift:] += a[shift:] * b[:-shift]
+        a[shift:] = a[shift:] * a[:-shift]
+        shift *= 2
+    return b
+
+
+def build_parameter_grid(**values: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Kartesisches Produkt der Parameterlisten, z.B. SwitchThreshold=[5, 10]"""
+    keys = list(values.keys())
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(values[k] for k in keys))]
+
+
+# Worker-State für den Prozess-Pool (einmal pro Prozess initialisiert)
+_worker_backtester: Optional[SwitchBacktester] = None
+
+
+def _init_worker(series: MarketSeries, rig_count: int, initial_algorithm: Optional[str]):
+    global _worker_backtester
+    _worker_backtester = SwitchBacktester(series, rig_count, initial_algorithm)
+
+
+def _run_chunk(param_chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [_worker_backtester.run(params) for params in param_chunk]
+
+
+def run_parameter_sweep(series: MarketSeries, grid: List[Dict[str, Any]], rig_count: int = 1,
+                        initial_algorithm: Optional[str] = None, workers: Optional[int] = None,
+                        chunk_size: int = 16) -> List[Dict[str, Any]]:
+    """Parameter-Sweep über mehrere Prozesse, sortiert nach realisiertem Profit"""
+    workers = workers or os.cpu_count() or 1
+    chunks = [grid[i:i + chunk_size] for i in range(0, len(grid), chunk_size)]
+
+    if workers <= 1:
+        _init_worker(series, rig_count, initial_algorithm)
+        results = [r for chunk in chunks for r in _run_chunk(chunk)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(series, rig_count, initial_algorithm)) as executor:
+            results = [r for chunk_results in executor.map(_run_chunk, chunks) for r in chunk_results]
+
+    return sorted(results, key=lambda r: r['realized_profit'], reverse=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Backtest der Algorithmus-Wechsel-Strategie")
+    parser.add_argument('--data', help=".npz mit timestamps/coins/prices_usd/algorithms/paying_usd")
+    parser.add_argument('--days', type=int, default=365, help="Tage synthetischer Daten ohne --data")
+    parser.add_argument('--rigs', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[5, 10, 15, 20, 25, 30, 40, 50, 75, 100])
+    parser.add_argument('--intervals', type=float, nargs='+', default=[15, 30, 60, 120, 240])
+    parser.add_argument('--risk', nargs='+', default=list(RISK_TOLERANCE_FACTORS.keys()))
+    parser.add_argument('--volatility', type=float, nargs='+', default=[0.5, 1.0, 1.5])
+    parser.add_argument('--volatility-model', nargs='+', default=['realized'], choices=['realized', 'ewma'])
+    parser.add_argument('--check-interval', type=float, default=60.0, help="Minuten zwischen Analysen")
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print("CASH MONEY COLORS ORIGINAL (R) - ALGORITHM SWITCH BACKTESTER")
+    print("=" * 60)
+
+    series = load_market_series(args.data) if args.data else generate_synthetic_series(args.days)
+    grid = build_parameter_grid(
+        SwitchThreshold=args.thresholds,
+        MinSwitchIntervalMinutes=args.intervals,
+        RiskTolerance=args.risk,
+        VolatilityMultiplier=args.volatility,
+        VolatilityModel=args.volatility_model,
+        CheckIntervalMinutes=[args.check_interval],
+    )
+
+    print(f"Zeitreihe: {len(series.timestamps)} Punkte | Grid: {len(grid)} Kombinationen")
+    start = time.perf_counter()
+    results = run_parameter_sweep(series, grid, rig_count=args.rigs, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    hold = SwitchBacktester(series, args.rigs).hold_profit()
+    print(f"Sweep abgeschlossen in {elapsed:.1f}s | Referenz ohne Wechsel: {hold:.2f}")
+    for result in results[:args.top]:
+        params = result['params']
+        print(f"   Profit {result['realized_profit']:12.2f} | Switches {result['switch_count']:5d} | "
+              f"Threshold {params['SwitchThreshold']:g}% | Intervall {params['MinSwitchIntervalMinutes']:g}min | "
+              f"{params['RiskTolerance']} | VolMult {params['VolatilityMultiplier']:g} | {params['VolatilityModel']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
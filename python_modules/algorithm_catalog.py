@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - ALGORITHM CATALOG
+Statische Algorithmus- und Hardware-Tabellen für Switcher und Backtester
+Ohne Seiteneffekte importierbar (keine Singletons, Threads oder Dateien)
+"""
+
+# Start-Algorithmus ohne Historie
+DEFAULT_ALGORITHM = "ethash"
+
+# Algorithmus-Mapping: gemünzte Coins und relative Schwierigkeit
+ALGORITHMS = {
+    'ethash': {'coins': ['ETH', 'ETC'], 'difficulty_multiplier': 1.0},
+    'kawpow': {'coins': ['RVN'], 'difficulty_multiplier': 0.8},
+    'randomx': {'coins': ['XMR'], 'difficulty_multiplier': 0.6},
+    'autolykos': {'coins': ['ERG'], 'difficulty_multiplier': 0.7},
+    'octopus': {'coins': ['CFX'], 'difficulty_multiplier': 0.9},
+    'kheavyhash': {'coins': ['KAS'], 'difficulty_multiplier': 0.5},
+    'sha256': {'coins': ['BTC', 'BCH'], 'difficulty_multiplier': 1.2}
+}
+
+# Hardware-Profile: relative Hashrate/Leistung je Algorithmus pro Geräteklasse
+# (bezogen auf den konfigurierten Algorithmus des Rigs; 0 = nicht unterstützt)
+HARDWARE_PROFILES = {
+    'gpu': {
+        'hashrate': {'ethash': 1.0, 'kawpow': 0.45, 'autolykos': 2.0,
+                     'octopus': 0.9, 'kheavyhash': 10.0, 'randomx': 0.0, 'sha256': 0.0},
+        'power': {'ethash': 1.0, 'kawpow': 1.1, 'autolykos': 0.8,
+                  'octopus': 1.05, 'kheavyhash': 0.6, 'randomx': 1.0, 'sha256': 1.0}
+    },
+    'asic': {
+        'hashrate': {'sha256': 1.0},
+        'power': {'sha256': 1.0}
+    }
+}
+
+# Basis-Risikofaktoren je Risiko-Toleranz
+RISK_TOLERANCE_FACTORS = {
+    'conservative': 0.7,
+    'medium': 1.0,
+    'aggressive': 1.3
+}
@@ -7,11 +7,14 @@ import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 import threading
-from python_modules.config_manager import get_config, get_rigs_config
-from python_modules.market_integration import get_crypto_prices, calculate_mining_profit
-from python_modules.nicehash_integration import get_pool_stats, calculate_profit_comparison
+import numpy as np
+from python_modules.config_manager import get_config, get_rigs_config, get_config_version
+from python_modules.market_integration import get_crypto_prices, calculate_mining_profit, market_integration
+from python_modules.nicehash_integration import get_pool_stats, calculate_profit_comparison, nicehash_integration
 from python_modules.alert_system import send_custom_alert
 from python_modules.enhanced_logging import log_event
+from python_modules.switch_executor import SwitchExecutor
+from python_modules.algorithm_catalog import ALGORITHMS, DEFAULT_ALGORITHM, HARDWARE_PROFILES, RISK_TOLERANCE_FACTORS
 
 class AlgorithmSwitcher:
     """Intelligenter Algorithmus-Wechsler für optimale Profite"""
@@ -21,8 +24,25 @@ class AlgorithmSwitcher:
         self.monitoring_active = False
         self.switch_history = []
         self.performance_history = {}
-        self.current_algorithm = "ethash"
-        self.best_algorithm = "ethash"
+        self.current_algorithm = DEFAULT_ALGORITHM
+        self.best_algorithm = DEFAULT_ALGORITHM
+        self.rig_assignments = {}
+
+        # Event-Modus: Re-Scoring nur bei relevanten Preis-/Pool-Bewegungen
+        self._rescore_event = threading.Event()
+        self._switch_lock = threading.Lock()
+        self._retry_timer: Optional[threading.Timer] = None
+        self._reference_prices: Dict[str, float] = {}
+        self._reference_paying: Dict[str, float] = {}
+        self._latest_prices: Dict[str, float] = {}
+        self._latest_paying: Dict[str, float] = {}
+        self.event_stats = {'price_updates': 0, 'pool_updates': 0, 'triggers': 0, 'rescores': 0}
+
+        # Inkrementeller Scoring-Cache (versioniert nach Preis-/Pool-/Rig-Eingaben)
+        self._score_cache: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+        self._analysis_cache: Optional[Dict[str, Any]] = None
+        self.score_cache_stats = {'tick_hits': 0, 'version_hits': 0,
+                                  'recomputed_algorithms': 0, 'reused_algorithms': 0}
 
         # Default-Konfiguration
         if not self.switch_config:
@@ -33,19 +53,29 @@ class AlgorithmSwitcher:
                 'AnalysisWindowHours': 24,  # 24h historische Daten
                 'RiskTolerance': 'medium',  # conservative/medium/aggressive
                 'VolatilityMultiplier': 1.0,  # Marktrisiko-Anpassung
-                'PoolBias': 0.9  # Bevorzuge Pool-Mining um 10%
+                'PoolBias': 0.9,  # Bevorzuge Pool-Mining um 10%
+                'TriggerMode': 'interval',  # interval/event
+                'PriceDeltaPercent': 1.0,  # Event-Modus: Re-Scoring ab 1% Preisbewegung
+                'PoolDeltaPercent': 2.0,  # Event-Modus: Re-Scoring ab 2% Pool-Paying-Bewegung
+                'EventDebounceSeconds': 1.0,  # Bündelt gleichzeitige Updates
+                'PoolPollSeconds': 300,  # Event-Modus: Pool-Abfrage ohne sonstige Trigger
+                'MaxParallelSwitches': 16,  # Gleichzeitige Rig-Umstellungen
+                'SwitchTimeoutSeconds': 30,
+                'SwitchDelaySeconds': 2,  # Simulierte Umstellzeit pro Rig
+                'RollbackOnPartialFailure': True,
+                'ScoreCacheTickSeconds': 5  # Wiederholte Analysen innerhalb eines Ticks kostenlos
             }
 
-        # Algorithmus-Mapping
-        self.algorithms = {
-            'ethash': {'coins': ['ETH', 'ETC'], 'difficulty_multiplier': 1.0},
-            'kawpow': {'coins': ['RVN'], 'difficulty_multiplier': 0.8},
-            'randomx': {'coins': ['XMR'], 'difficulty_multiplier': 0.6},
-            'autolykos': {'coins': ['ERG'], 'difficulty_multiplier': 0.7},
-            'octopus': {'coins': ['CFX'], 'difficulty_multiplier': 0.9},
-            'kheavyhash': {'coins': ['KAS'], 'difficulty_multiplier': 0.5},
-            'sha256': {'coins': ['BTC', 'BCH'], 'difficulty_multiplier': 1.2}
-        }
+        # Algorithmus-Mapping und Hardware-Profile (siehe algorithm_catalog)
+        self.algorithms = ALGORITHMS
+        self.hardware_profiles = self.switch_config.get('HardwareProfiles') or HARDWARE_PROFILES
+
+        self.switch_executor = SwitchExecutor(
+            max_parallel=self.switch_config.get('MaxParallelSwitches', 16),
+            timeout_seconds=self.switch_config.get('SwitchTimeoutSeconds', 30),
+            rollback_on_failure=self.switch_config.get('RollbackOnPartialFailure', True),
+            switch_delay_seconds=self.switch_config.get('SwitchDelaySeconds', 2)
+        )
 
         print("🧠 ALGORITHM SWITCHER INITIALIZED")
         print(f"   Switching Enabled: {self.switch_config.get('Enabled', True)}")
@@ -57,6 +87,16 @@ class AlgorithmSwitcher:
             return
 
         self.monitoring_active = True
+
+        if self.switch_config.get('TriggerMode', 'interval') == 'event':
+            market_integration.add_price_listener(self._on_price_update)
+            nicehash_integration.add_stats_listener(self._on_pool_update)
+            monitor_thread = threading.Thread(target=self._event_monitor_loop, daemon=True)
+            monitor_thread.start()
+            self._rescore_event.set()  # Initiale Bewertung
+            print("🔄 Algorithm Monitoring gestartet (Event-Modus)")
+            return
+
         monitor_thread = threading.Thread(target=self._algorithm_monitor_loop, daemon=True)
         monitor_thread.start()
 
@@ -65,63 +105,404 @@ class AlgorithmSwitcher:
     def stop_algorithm_monitoring(self):
         """Stoppt Algorithmus-Monitoring"""
         self.monitoring_active = False
+
+        market_integration.remove_price_listener(self._on_price_update)
+        nicehash_integration.remove_stats_listener(self._on_pool_update)
+        if self._retry_timer:
+            self._retry_timer.cancel()
+            self._retry_timer = None
+        self._rescore_event.set()  # Event-Thread aufwecken, damit er endet
+
         print("⏹️ Algorithm Monitoring gestoppt")
 
+    def _on_price_update(self, prices: Dict[str, Any]):
+        """Preis-Listener: triggert Re-Scoring nur bei relevanter Bewegung"""
+        self.event_stats['price_updates'] += 1
+        tracked_coins = {coin for algo in self.algorithms.values() for coin in algo['coins']}
+        latest = {coin: data.get('usd', 0) for coin, data in prices.items() if coin in tracked_coins}
+        self._latest_prices.update(latest)
+
+        threshold = self.switch_config.get('PriceDeltaPercent', 1.0)
+        if self._exceeds_delta(latest, self._reference_prices, threshold):
+            self._trigger_rescore()
+
+    def _on_pool_update(self, pool_stats: Dict[str, Any]):
+        """Pool-Listener: triggert Re-Scoring nur bei relevanter Bewegung"""
+        self.event_stats['pool_updates'] += 1
+        latest = {algo: data.get('paying_usd', 0) for algo, data in pool_stats.items() if algo in self.algorithms}
+        self._latest_paying.update(latest)
+
+        threshold = self.switch_config.get('PoolDeltaPercent', 2.0)
+        if self._exceeds_delta(latest, self._reference_paying, threshold):
+            self._trigger_rescore()
+
+    @staticmethod
+    def _exceeds_delta(latest: Dict[str, float], reference: Dict[str, float], threshold_percent: float) -> bool:
+        """Prüft ob ein Wert seit dem letzten Re-Scoring über die Schwelle gewandert ist"""
+        for key, value in latest.items():
+            if key not in reference:
+                return True
+            previous = reference[key]
+            if previous == 0:
+                if value != 0:
+                    return True
+                continue
+            if abs(value - previous) / abs(previous) * 100 >= threshold_percent:
+                return True
+        return False
+
+    def _trigger_rescore(self):
+        self.event_stats['triggers'] += 1
+        self._rescore_event.set()
+
+    def _event_monitor_loop(self):
+        """Event-Schleife: schläft ohne CPU-/API-Last bis ein Trigger eintrifft"""
+        debounce = self.switch_config.get('EventDebounceSeconds', 1.0)
+        pool_poll = self.switch_config.get('PoolPollSeconds', 300)
+
+        while self.monitoring_active:
+            if not self._rescore_event.wait(pool_poll):
+                # Pool-Daten haben keinen eigenen Refresh: selten aktiv abfragen,
+                # der Pool-Listener triggert bei relevanter Bewegung
+                try:
+                    get_pool_stats()
+                except Exception as e:
+                    print(f"Algorithm Monitor Pool-Abfrage fehlgeschlagen: {e}")
+                continue
+            if not self.monitoring_active:
+                break
+
+            # Kurz bündeln, damit Preis- und Pool-Update desselben Ticks ein Re-Scoring ergeben
+            if debounce > 0:
+                time.sleep(debounce)
+
+            try:
+                self._rescore()
+            except Exception as e:
+                print(f"Algorithm Monitor Fehler: {e}")
+                send_custom_alert("Algorithm Monitor Error", f"Fehler im Algorithmus-Monitoring: {e}")
+
+    def _rescore(self) -> Dict[str, Any]:
+        """Re-Scoring mit Hysterese; plant Nachprüfung wenn nur das Zeit-Intervall blockiert"""
+        with self._switch_lock:
+            self.event_stats['rescores'] += 1
+
+            # Referenz und Trigger vor der Bewertung übernehmen: Updates, die während
+            # der Analyse eintreffen, lösen danach ein weiteres Re-Scoring aus
+            self._rescore_event.clear()
+            self._reference_prices = dict(self._latest_prices)
+            self._reference_paying = dict(self._latest_paying)
+
+            if self._analysis_cache:
+                # Neue Eingaben sind da: Tick-Cache überspringen, Versions-Cache bleibt aktiv
+                self._analysis_cache['computed_at'] = float('-inf')
+            result = self.switch_to_best_algorithm()
+
+        recommendation = result.get('recommendation', {})
+        blocked_by_interval = (
+            recommendation
+            and not recommendation.get('can_switch', True)
+            and recommendation.get('recommended_algorithm') != self.current_algorithm
+            and recommendation.get('improvement_percentage', 0) >= recommendation.get('switch_threshold', float('inf'))
+        )
+        if blocked_by_interval and self.monitoring_active:
+            self._schedule_retry(max(recommendation.get('time_until_next_switch', 0), 1) * 60)
+
+        return result
+
+    def _schedule_retry(self, delay_seconds: float):
+        """Plant ein Re-Scoring nach Ablauf des Mindest-Switch-Intervalls"""
+        if self._retry_timer:
+            self._retry_timer.cancel()
+        self._retry_timer = threading.Timer(delay_seconds, self._trigger_rescore)
+        self._retry_timer.daemon = True
+        self._retry_timer.start()
+
     def analyze_algorithm_performance(self, time_window_hours: int = 24) -> Dict[str, Any]:
-        """Analysiert Performance aller Algorithmen über Zeitfenster"""
+        """Analysiert Performance aller Algorithmen über Zeitfenster
+
+        Inkrementell: innerhalb eines Ticks (ScoreCacheTickSeconds) wird das
+        letzte Ergebnis ohne Upstream-Zugriff geliefert; danach werden nur
+        Algorithmen neu bewertet, deren Eingaben (Coin-Preise, Pool-Daten,
+        Rig-Konfiguration, Risiko-Parameter) eine neue Version haben.
+        """
+        config_version = get_config_version()
+        tick_seconds = self.switch_config.get('ScoreCacheTickSeconds', 5)
+        cached = self._analysis_cache
+        if (cached and cached['config_version'] == config_version
+                and time.monotonic() - cached['computed_at'] < tick_seconds):
+            self.score_cache_stats['tick_hits'] += 1
+            return dict(cached['results'])
+
         market_data = get_crypto_prices()
         pool_stats = get_pool_stats()
         rigs = get_rigs_config()
 
+        score_params = (
+            self.switch_config.get('RiskTolerance', 'medium'),
+            self.switch_config.get('VolatilityMultiplier', 1.0),
+            self.switch_config.get('PoolBias', 1.0),
+            self.switch_config.get('VolatilityModel', 'realized'),
+        )
+        # Volatilität aus der Preis-Historie ändert sich auch ohne neuen Preis-Snapshot
+        # (z.B. sobald MinHistoryMinutes erreicht ist) und gehört daher in die Schlüssel
+        coin_volatility = {
+            coin: market_integration.get_coin_volatility(coin, score_params[3])
+            for algo_config in self.algorithms.values() for coin in algo_config['coins']
+        }
+        inputs_key = (market_integration.price_snapshot_id, nicehash_integration.pool_snapshot_id,
+                      config_version, score_params, tuple(sorted(coin_volatility.items())))
+
+        if cached and cached['inputs_key'] == inputs_key:
+            self.score_cache_stats['version_hits'] += 1
+            cached['computed_at'] = time.monotonic()
+            return dict(cached['results'])
+
         analysis_results = {}
-        total_rigs_power = sum(rig.get('power_consumption', 0) for rig in rigs)
+        rig_count = len(rigs)
 
         for algo_name, algo_config in self.algorithms.items():
             if algo_name not in pool_stats:
                 continue
 
-            # Hole Pool-Statistiken
-            pool_data = pool_stats.get(algo_name, {})
-            nh_paying = pool_data.get('paying_usd', 0)
-
-            # Lokale Berechnung (vereinfacht für Alle Rigs)
-            rig_count = len(rigs)
-            avg_power_per_rig = total_rigs_power / max(rig_count, 1)
-            estimated_local_profit = rig_count * nh_paying * 100  # Rough estimate
-
-            # Markt-Volatilität für Risiko-Bewertung
-            coin_volatility = 0
-            coin_count = 0
-
-            for coin in algo_config['coins']:
-                if coin in market_data:
-                    coin_count += 1
-                    coin_volatility += abs(market_data[coin].get('change_24h', 0))
-
-            avg_volatility = coin_volatility / max(coin_count, 1)
-
-            # Risiko-Adjustierung
-            risk_factor = self._calculate_risk_factor(avg_volatility, algo_config['difficulty_multiplier'])
-
-            # Endgültige Bewertung
-            adjusted_profit = estimated_local_profit * risk_factor
-            pool_bias = self.switch_config.get('PoolBias', 1.0)
-            final_score = adjusted_profit * pool_bias
-
-            analysis_results[algo_name] = {
-                'algorithm': algo_name,
-                'pool_profit_per_day': nh_paying,
-                'estimated_local_profit': estimated_local_profit,
-                'adjusted_profit': adjusted_profit,
-                'final_score': final_score,
-                'volatility': avg_volatility,
-                'difficulty_multiplier': algo_config['difficulty_multiplier'],
-                'risk_factor': risk_factor,
-                'supported_coins': algo_config['coins'],
-                'timestamp': datetime.now().isoformat()
+            dependency_key = (
+                tuple(market_integration.coin_versions.get(coin, 0) for coin in algo_config['coins']),
+                tuple(coin_volatility[coin] for coin in algo_config['coins']),
+                nicehash_integration.algo_versions.get(algo_name, 0),
+                config_version,
+                score_params,
+            )
+            cached_score = self._score_cache.get(algo_name)
+            if cached_score and cached_score[0] == dependency_key:
+                analysis_results[algo_name] = cached_score[1]
+                self.score_cache_stats['reused_algorithms'] += 1
+                continue
+
+            result = self._score_algorithm(algo_name, algo_config, pool_stats[algo_name], market_data, rig_count)
+            self._score_cache[algo_name] = (dependency_key, result)
+            analysis_results[algo_name] = result
+            self.score_cache_stats['recomputed_algorithms'] += 1
+
+        self._analysis_cache = {
+            'inputs_key': inputs_key,
+            'config_version': config_version,
+            'computed_at': time.monotonic(),
+            'results': analysis_results,
+        }
+        return dict(analysis_results)
+
+    def _score_algorithm(self, algo_name: str, algo_config: Dict[str, Any], pool_data: Dict[str, Any],
+                         market_data: Dict[str, Any], rig_count: int) -> Dict[str, Any]:
+        """Bewertet einen einzelnen Algorithmus"""
+        nh_paying = pool_data.get('paying_usd', 0)
+
+        # Lokale Berechnung (vereinfacht für Alle Rigs)
+        estimated_local_profit = rig_count * nh_paying * 100  # Rough estimate
+
+        # Markt-Volatilität für Risiko-Bewertung
+        avg_volatility = self._get_algorithm_volatility(algo_config, market_data)
+
+        # Risiko-Adjustierung
+        risk_factor = self._calculate_risk_factor(avg_volatility, algo_config['difficulty_multiplier'])
+
+        # Endgültige Bewertung
+        adjusted_profit = estimated_local_profit * risk_factor
+        pool_bias = self.switch_config.get('PoolBias', 1.0)
+        final_score = adjusted_profit * pool_bias
+
+        return {
+            'algorithm': algo_name,
+            'pool_profit_per_day': nh_paying,
+            'estimated_local_profit': estimated_local_profit,
+            'adjusted_profit': adjusted_profit,
+            'final_score': final_score,
+            'volatility': avg_volatility,
+            'difficulty_multiplier': algo_config['difficulty_multiplier'],
+            'risk_factor': risk_factor,
+            'supported_coins': algo_config['coins'],
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def invalidate_score_cache(self):
+        """Verwirft alle zwischengespeicherten Bewertungen"""
+        self._score_cache.clear()
+        self._analysis_cache = None
+
+    def _get_algorithm_volatility(self, algo_config: Dict[str, Any], market_data: Dict[str, Any]) -> float:
+        """Durchschnittliche Tages-Volatilität der Coins eines Algorithmus
+
+        Nutzt die Preis-Historie (realisiert oder EWMA); ohne ausreichende
+        Historie wird auf die 24h-Änderung zurückgefallen.
+        """
+        model = self.switch_config.get('VolatilityModel', 'realized')
+        coin_volatility = 0
+        coin_count = 0
+
+        for coin in algo_config['coins']:
+            if coin in market_data:
+                coin_count += 1
+                volatility = market_integration.get_coin_volatility(coin, model)
+                if volatility is None:
+                    volatility = abs(market_data[coin].get('change_24h', 0))
+                coin_volatility += volatility
+
+        return coin_volatility / max(coin_count, 1)
+
+    def _get_device_class(self, rig: Dict[str, Any]) -> str:
+        """Bestimmt die Geräteklasse (gpu/asic) eines Rigs"""
+        device_class = rig.get('device_class')
+        if device_class in self.hardware_profiles:
+            return device_class
+
+        rig_type = str(rig.get('type', '')).lower()
+        if any(marker in rig_type for marker in ('asic', 'antminer', 'whatsminer', 'avalon')):
+            return 'asic'
+        return 'gpu'
+
+    def build_profit_matrix(self, rigs: Optional[List[Dict[str, Any]]] = None,
+                            pool_stats: Optional[Dict[str, Any]] = None,
+                            market_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Baut die (Rigs x Algorithmen) Profit-Matrix in einem NumPy-Durchlauf
+
+        Hashrate und Leistung je Algorithmus kommen aus ``algorithm_profiles``
+        des Rigs (falls gesetzt) oder aus dem Hardware-Profil seiner
+        Geräteklasse. Nicht unterstützte oder nicht bepreiste Kombinationen
+        erhalten ``-inf``.
+        """
+        if rigs is None:
+            rigs = get_rigs_config()
+        if pool_stats is None:
+            pool_stats = get_pool_stats()
+        if market_data is None:
+            market_data = get_crypto_prices()
+
+        algo_names = list(self.algorithms.keys())
+        algo_index = {name: j for j, name in enumerate(algo_names)}
+        class_names = list(self.hardware_profiles.keys())
+        rig_count, algo_count = len(rigs), len(algo_names)
+
+        # Profil-Tabellen je Geräteklasse (Klassen x Algorithmen)
+        class_hashrate = np.zeros((len(class_names), algo_count))
+        class_power = np.ones((len(class_names), algo_count))
+        for c, class_name in enumerate(class_names):
+            profile = self.hardware_profiles[class_name]
+            for algo, factor in profile.get('hashrate', {}).items():
+                if algo in algo_index:
+                    class_hashrate[c, algo_index[algo]] = factor
+            for algo, factor in profile.get('power', {}).items():
+                if algo in algo_index:
+                    class_power[c, algo_index[algo]] = factor
+
+        # Rig-Basisdaten einsammeln
+        class_idx = np.zeros(rig_count, dtype=np.intp)
+        native_idx = np.full(rig_count, algo_index.get(self.current_algorithm, 0), dtype=np.intp)
+        base_hashrate = np.zeros(rig_count)
+        base_power = np.zeros(rig_count)
+        efficiency = np.ones(rig_count)
+        overrides = []
+        for i, rig in enumerate(rigs):
+            class_idx[i] = class_names.index(self._get_device_class(rig))
+            if rig.get('algorithm') in algo_index:
+                native_idx[i] = algo_index[rig['algorithm']]
+            base_hashrate[i] = rig.get('hash_rate', 0)
+            base_power[i] = rig.get('power_consumption', 0)
+            efficiency[i] = rig.get('efficiency', 1.0)
+            if rig.get('algorithm_profiles'):
+                overrides.append((i, rig['algorithm_profiles']))
+
+        # Hashrate/Leistung relativ zum konfigurierten Algorithmus skalieren
+        rows = np.arange(rig_count)
+        hashrate_factors = class_hashrate[class_idx]
+        power_factors = class_power[class_idx]
+        native_hashrate = hashrate_factors[rows, native_idx]
+        native_power = power_factors[rows, native_idx]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hashrate_matrix = np.where(native_hashrate[:, None] > 0,
+                                       base_hashrate[:, None] * hashrate_factors / native_hashrate[:, None],
+                                       0.0)
+            power_matrix = np.where(native_power[:, None] > 0,
+                                    base_power[:, None] * power_factors / native_power[:, None],
+                                    base_power[:, None])
+
+        for i, profiles in overrides:
+            for algo, profile in profiles.items():
+                if algo in algo_index:
+                    j = algo_index[algo]
+                    hashrate_matrix[i, j] = profile.get('hash_rate', hashrate_matrix[i, j])
+                    power_matrix[i, j] = profile.get('power_consumption', power_matrix[i, j])
+
+        # Preis- und Risiko-Vektoren je Algorithmus
+        paying_usd = np.zeros(algo_count)
+        risk_factors = np.zeros(algo_count)
+        priced = np.zeros(algo_count, dtype=bool)
+        for algo, j in algo_index.items():
+            if algo not in pool_stats:
+                continue
+            priced[j] = True
+            paying_usd[j] = pool_stats[algo].get('paying_usd', 0)
+            volatility = self._get_algorithm_volatility(self.algorithms[algo], market_data)
+            risk_factors[j] = self._calculate_risk_factor(volatility, self.algorithms[algo]['difficulty_multiplier'])
+
+        electricity_cost = get_config('Mining.ElectricityCostPerKwh', 0.15)
+        pool_bias = self.switch_config.get('PoolBias', 1.0)
+
+        # Vektorisierte Bewertung (gleiche Ertragsformel wie NiceHash-Vergleich)
+        revenue = hashrate_matrix * efficiency[:, None] * paying_usd[None, :] * 24
+        cost = power_matrix * 24 / 1000 * electricity_cost
+        profit = revenue * risk_factors[None, :] * pool_bias - cost
+        profit = np.where((hashrate_matrix > 0) & priced[None, :], profit, -np.inf)
+
+        return {
+            'rig_ids': [rig.get('id', f"rig_{i}") for i, rig in enumerate(rigs, start=1)],
+            'algorithms': algo_names,
+            'revenue': revenue,
+            'cost': cost,
+            'profit': profit,
+        }
+
+    def assign_algorithms_per_rig(self, rigs: Optional[List[Dict[str, Any]]] = None,
+                                  pool_stats: Optional[Dict[str, Any]] = None,
+                                  market_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Weist jedem Rig seinen profitabelsten Algorithmus zu"""
+        if rigs is None:
+            rigs = get_rigs_config()
+
+        matrix = self.build_profit_matrix(rigs, pool_stats, market_data)
+        profit = matrix['profit']
+        algo_names = matrix['algorithms']
+
+        if profit.size == 0:
+            return {}
+
+        best_idx = np.argmax(profit, axis=1)
+        best_profit = profit[np.arange(profit.shape[0]), best_idx]
+
+        assignments = {}
+        for i, rig_id in enumerate(matrix['rig_ids']):
+            current = self.rig_assignments.get(rig_id, {}).get('current_algorithm') or rigs[i].get('algorithm')
+            if not np.isfinite(best_profit[i]):
+                assignments[rig_id] = {
+                    'algorithm': current,
+                    'daily_profit': None,
+                    'current_algorithm': current,
+                    'reason': 'Keine bewertbaren Algorithmen'
+                }
+                continue
+
+            current_profit = None
+            if current in algo_names:
+                value = profit[i, algo_names.index(current)]
+                current_profit = float(value) if np.isfinite(value) else None
+
+            assignments[rig_id] = {
+                'algorithm': algo_names[best_idx[i]],
+                'daily_profit': float(best_profit[i]),
+                'current_algorithm': current,
+                'current_daily_profit': current_profit,
             }
 
-        return analysis_results
+        self.rig_assignments = assignments
+        return assignments
 
     def get_optimal_algorithm(self) -> Tuple[str, Dict[str, Any]]:
         """Findet den optimalen Algorithmus für aktuelle Marktbedingungen"""
@@ -227,13 +608,7 @@ class AlgorithmSwitcher:
         """Berechnet Risiko-Faktor basierend auf Marktbedingungen"""
         risk_tolerance = self.switch_config.get('RiskTolerance', 'medium')
 
-        risk_factors = {
-            'conservative': 0.7,
-            'medium': 1.0,
-            'aggressive': 1.3
-        }
-
-        base_risk = risk_factors.get(risk_tolerance, 1.0)
+        base_risk = RISK_TOLERANCE_FACTORS.get(risk_tolerance, 1.0)
 
         # Volatilitäts-Adjustment
         volatility_multiplier = self.switch_config.get('VolatilityMultiplier', 1.0)
@@ -278,18 +653,35 @@ class AlgorithmSwitcher:
         return max(0, int(min_interval_minutes - time_since_last_switch))
 
     def _execute_algorithm_switch(self, new_algorithm: str, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Führt Algorithmus-Wechsel durch"""
+        """Führt Algorithmus-Wechsel parallel auf allen Rigs durch"""
         try:
-            # Hier würde die eigentliche Hardware-Konfiguration erfolgen
-            # Für Mining-Rigs: GPU-Treiber neu laden, Pool-URLs ändern, etc.
-
-            # Simuliert Switch-Delay
-            time.sleep(2)
+            changes = {}
+            for i, rig in enumerate(get_rigs_config(), start=1):
+                rig_id = rig.get('id', f"rig_{i}")
+                previous = (self.rig_assignments.get(rig_id, {}).get('current_algorithm')
+                            or rig.get('algorithm') or self.current_algorithm)
+                if previous != new_algorithm:
+                    changes[rig_id] = (previous, new_algorithm)
+
+            execution = self.switch_executor.execute(changes)
+
+            if not execution['success']:
+                return {
+                    'success': False,
+                    'message': f"Switch fehlgeschlagen auf {len(execution['failed_rigs'])} Rigs "
+                               f"({len(execution['rolled_back_rigs'])} zurückgesetzt)",
+                    'error': 'partial_failure',
+                    'execution': execution
+                }
+
+            for rig_id in changes:
+                self.rig_assignments.setdefault(rig_id, {})['current_algorithm'] = new_algorithm
 
             return {
                 'success': True,
                 'message': f'Algorithmus gewechselt zu {new_algorithm}',
-                'analysis': analysis_data
+                'analysis': analysis_data,
+                'execution': execution
             }
 
         except Exception as e:
@@ -299,6 +691,33 @@ class AlgorithmSwitcher:
                 'error': str(e)
             }
 
+    def apply_rig_assignments(self, assignments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Wendet Per-Rig-Zuweisungen (assign_algorithms_per_rig) parallel an"""
+        if assignments is None:
+            assignments = self.assign_algorithms_per_rig()
+
+        changes = {
+            rig_id: (data.get('current_algorithm'), data['algorithm'])
+            for rig_id, data in assignments.items()
+            if data.get('algorithm') and data.get('algorithm') != data.get('current_algorithm')
+        }
+        execution = self.switch_executor.execute(changes)
+
+        for rig_id, outcome in execution['rig_results'].items():
+            if outcome['status'] == 'switched' or (outcome['status'] == 'timeout' and outcome['completed_late']):
+                assignments[rig_id]['current_algorithm'] = assignments[rig_id]['algorithm']
+
+        if changes:
+            log_event('RIG_ALGORITHM_ASSIGNMENTS_APPLIED', {
+                'rigs': len(changes),
+                'switched': execution['switched_rigs'],
+                'failed': execution['failed_rigs'],
+                'rolled_back': execution['rolled_back_rigs'],
+                'duration_ms': execution['duration_ms']
+            })
+
+        return execution
+
     def get_algorithm_analytics(self) -> Dict[str, Any]:
         """Gibt Algorithmus-Analytics zurück"""
         return {
@@ -309,6 +728,11 @@ class AlgorithmSwitcher:
             'monitoring_active': self.monitoring_active,
             'analysis_window_hours': self.switch_config.get('AnalysisWindowHours', 24),
             'risk_tolerance': self.switch_config.get('RiskTolerance', 'medium'),
+            'trigger_mode': self.switch_config.get('TriggerMode', 'interval'),
+            'event_stats': dict(self.event_stats),
+            'score_cache_stats': dict(self.score_cache_stats),
+            'rig_assignments': self.rig_assignments,
+            'last_switch_execution': self.switch_executor.last_execution,
             'performance_data': self.analyze_algorithm_performance()
         }
 
@@ -332,6 +756,10 @@ def switch_to_best_algorithm():
     """Wechselt zu bestem Algorithmus"""
     return algorithm_switcher.switch_to_best_algorithm()
 
+def assign_rig_algorithms():
+    """Weist jedem Rig seinen besten Algorithmus zu"""
+    return algorithm_switcher.assign_algorithms_per_rig()
+
 def get_algorithm_analytics():
     """Holt Analytics-Daten"""
     return algorithm_switcher.get_algorithm_analytics()
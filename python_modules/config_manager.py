@@ -17,6 +17,7 @@ class ConfigManager:
         self.config_file = config_file
         self.config = {}
         self.env_vars = {}
+        self.config_version = 0  # Steigt bei jedem Laden/Setzen (Cache-Invalidierung)
 
         # Lokale .env (optional) laden, ohne echte ENV zu überschreiben
         self._load_dotenv()
@@ -133,6 +134,8 @@ class ConfigManager:
 
     def load_config(self):
         """Lädt Konfiguration aus JSON-Datei"""
+        self.config_version += 1
+
         if not os.path.exists(self.config_file):
             print(
                 f"WARNING: Config file {self.config_file} not found, "
@@ -297,6 +300,7 @@ class ConfigManager:
 
         # Setze Wert
         config[keys[-1]] = value
+        self.config_version += 1
         self.save_config()
 
     def get_section(self, section: str) -> Dict[str, Any]:
@@ -432,6 +436,11 @@ def get_rigs_config():
     return config_manager.get_rigs_config()
 
 
+def get_config_version() -> int:
+    """Aktuelle Konfigurations-Version (ändert sich bei Laden/Setzen)"""
+    return config_manager.config_version
+
+
 def get_mining_config():
     """Holt Mining-Konfiguration"""
     return config_manager.get_mining_config()
@@ -5,10 +5,16 @@ Analysiert Hashrate vs. Leistungsaufnahme und gibt Optimierungsanweisungen.
 """
 from __future__ import annotations
 
-from typing import Dict, Any
+import logging
+import os
+import random
+import time
+from typing import Dict, Any, List
 
 from python_modules.config_manager import get_config, get_rigs_config
 from python_modules.enhanced_logging import log_event
+from python_modules.single_flight import single_flight
+from python_modules.http_client import http_client
 
 
 class EnergyEfficiencyManager:
@@ -187,6 +193,11 @@ class LiveEnergyManager:
             time.time() - self.price_cache[cache_key]['timestamp'] < self.cache_timeout):
             return self.price_cache[cache_key]['data']
 
+        # Gleichzeitige Cache-Misses teilen sich einen API-Call
+        return single_flight.do(f"energy:{cache_key}", self._fetch_electricity_price, cache_key)
+
+    def _fetch_electricity_price(self, cache_key: str) -> Dict[str, Any]:
+        """Lädt Strompreise von der API und aktualisiert den Cache"""
         # API Call wenn verfügbar
         if self.electricity_api_key:
             try:
@@ -217,6 +228,11 @@ class LiveEnergyManager:
             time.time() - self.weather_cache[cache_key]['timestamp'] < self.cache_timeout):
             return self.weather_cache[cache_key]['data']
 
+        # Gleichzeitige Cache-Misses teilen sich einen API-Call
+        return single_flight.do(f"energy:{cache_key}", self._fetch_weather_data, cache_key)
+
+    def _fetch_weather_data(self, cache_key: str) -> Dict[str, Any]:
+        """Lädt Wetter-Daten von OpenWeather und aktualisiert den Cache"""
         # OpenWeather API Call
         if self.weather_api_key:
             try:
@@ -227,7 +243,7 @@ class LiveEnergyManager:
                     'appid': self.weather_api_key,
                     'units': 'metric'
                 }
-                response = requests.get(url, params=params, timeout=10)
+                response = http_client.get(url, params=params, endpoint="openweather /data/2.5/weather")
                 response.raise_for_status()
 
                 data = response.json()
@@ -2,14 +2,29 @@
 """
 CASH MONEY COLORS ORIGINAL (R) - ENHANCED LOGGING SYSTEM
 Strukturiertes Logging mit Log-Leveln für Mining-System
+Optional asynchron: Hot-Loops reihen nur ein, ein Writer-Thread schreibt gebündelt
 """
+import atexit
 import logging
 import logging.handlers
 import json
 import os
+import queue
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+from python_modules.config_manager import get_config
+from python_modules.event_store import EventStore
+from python_modules.rate_limiter import TokenBucket
+
+
+ASYNC_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# Events, die nie gesampelt oder gedrosselt werden
+UNSAMPLED_EVENT_TYPES = ("STARTUP", "SHUTDOWN", "ERROR", "WARNING")
 
 
 class MiningFormatter(logging.Formatter):
@@ -35,6 +50,266 @@ class MiningFormatter(logging.Formatter):
         return base_format
 
 
+class LazyFormat:
+    """Verzögerter Log-Text: fn(*args) läuft erst, wenn ein Handler den Record formatiert
+
+    Für extra-Felder und %-Argumente, deren Aufbau teuer ist. Das Ergebnis
+    wird gecacht, damit mehrere Handler nur einmal formatieren.
+    """
+    __slots__ = ("fn", "args", "_value")
+
+    def __init__(self, fn, *args):
+        self.fn = fn
+        self.args = args
+        self._value = None
+
+    def __str__(self) -> str:
+        if self._value is None:
+            self._value = str(self.fn(*self.args))
+        return self._value
+
+    def snapshot(self) -> "LazyFormat":
+        """Kopiert dict-Argumente flach, damit spätere Änderungen des Aufrufers
+        (Async-Modus: Formatierung im Writer-Thread) den Record nicht verfälschen"""
+        if self._value is None:
+            self.args = tuple(dict(arg) if isinstance(arg, dict) else arg for arg in self.args)
+        return self
+
+
+# extra-Felder der Log-Methoden, die LazyFormat-Werte tragen können
+LAZY_EXTRA_FIELDS = ("mining_data", "profit_info", "rig_info")
+
+
+def _format_cycle(cycle_data: Dict[str, Any]) -> str:
+    return (
+        f"Cycle_{cycle_data.get('cycle', 'N/A')} | Capital: {cycle_data.get('capital_after', 0):.2f} CHF"
+        f" | Profit: {cycle_data.get('cycle_profit', 0):.2f} CHF"
+    )
+
+
+def _format_profit(profit_data: Dict[str, Any]) -> str:
+    return (
+        f"Algorithm: {profit_data.get('algorithm', 'N/A')}"
+        f" | Expected: {profit_data.get('expected_profit_chf', 0):.2f} CHF/day"
+    )
+
+
+def _format_rig(rig_data: Dict[str, Any]) -> str:
+    status = "ACTIVE" if rig_data.get("status") == "ACTIVE" else "INACTIVE"
+    return (
+        f"{rig_data.get('id', 'N/A')} | {rig_data.get('type', 'N/A')}"
+        f" | Temp: {rig_data.get('temperature', 0)}°C | Status: {status}"
+    )
+
+
+class EventSampler:
+    """Sampling und Token-Bucket-Drosselung pro Event-Typ
+
+    Sampling ist zählerbasiert (bei Rate 0.1 jedes zehnte Event), danach
+    begrenzt ein Token-Bucket pro Typ den Durchsatz. Verworfene Events
+    werden gezählt und einmal pro Zusammenfassungs-Intervall gemeldet.
+    """
+
+    def __init__(self, default_rate: float = 1.0, rates: Optional[Dict[str, float]] = None,
+                 default_limit: Optional[Dict[str, float]] = None,
+                 limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 summary_interval_seconds: float = 60.0,
+                 unsampled_types=UNSAMPLED_EVENT_TYPES):
+        self.default_rate = float(default_rate)
+        self.rates = {event_type: float(rate) for event_type, rate in (rates or {}).items()}
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self.summary_interval = summary_interval_seconds
+        self.unsampled_types = set(unsampled_types)
+
+        self._lock = threading.Lock()
+        self._accumulators: Dict[str, float] = {}
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._window_start = time.monotonic()
+        self.stats = {"allowed": 0, "sampled_out": 0, "rate_limited": 0}
+
+    def _bucket(self, event_type: str) -> Optional[TokenBucket]:
+        if event_type not in self._buckets:
+            limit = self.limits.get(event_type, self.default_limit)
+            self._buckets[event_type] = (
+                TokenBucket(limit.get("Rate", 1.0), limit.get("Burst", 1.0)) if limit else None
+            )
+        return self._buckets[event_type]
+
+    def allow(self, event_type: str) -> bool:
+        """True wenn das Event geloggt werden soll"""
+        if event_type in self.unsampled_types:
+            return True
+        with self._lock:
+            rate = self.rates.get(event_type, self.default_rate)
+            if rate < 1.0:
+                accumulator = self._accumulators.get(event_type, 1.0 - rate) + rate
+                if accumulator < 1.0:
+                    self._accumulators[event_type] = accumulator
+                    self._suppressed[event_type] = self._suppressed.get(event_type, 0) + 1
+                    self.stats["sampled_out"] += 1
+                    return False
+                self._accumulators[event_type] = accumulator - 1.0
+
+            bucket = self._bucket(event_type)
+            if bucket is not None and not bucket.try_acquire():
+                self._suppressed[event_type] = self._suppressed.get(event_type, 0) + 1
+                self.stats["rate_limited"] += 1
+                return False
+
+            self.stats["allowed"] += 1
+            return True
+
+    def drain_summary(self, force: bool = False) -> Optional[Tuple[Dict[str, int], float]]:
+        """(Unterdrückte Events pro Typ, Fensterlänge in s), sobald das Intervall abgelaufen ist"""
+        now = time.monotonic()
+        if not force and now - self._window_start < self.summary_interval:
+            return None
+        with self._lock:
+            suppressed, self._suppressed = self._suppressed, {}
+            window = now - self._window_start
+            self._window_start = now
+        return (suppressed, window) if suppressed else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "suppressed_current_window": dict(self._suppressed)}
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler, dessen Flush pro Record abschaltbar ist
+
+    Im Async-Modus flusht der Writer-Thread einmal pro Batch statt nach
+    jedem Record (defer_flush=True).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.defer_flush = False
+
+    def flush(self):
+        if not self.defer_flush:
+            super().flush()
+
+    def flush_batch(self):
+        """Schreibt gepufferte Records auf die Platte"""
+        super().flush()
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler mit begrenzter Queue und Overflow-Policy
+
+    drop_oldest verwirft den ältesten wartenden Record, drop_newest den
+    neuen, block wartet bis block_timeout. Records ab ERROR warten immer
+    bis block_timeout, bevor sie verworfen werden. Formatiert wird erst im
+    Writer-Thread; der Aufrufer zahlt nur das Einreihen.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow_policy: str = "drop_oldest",
+                 block_timeout: float = 0.05):
+        if overflow_policy not in ASYNC_OVERFLOW_POLICIES:
+            raise ValueError(f"Unbekannte Overflow-Policy: {overflow_policy}")
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self._stats_lock = threading.Lock()
+        self.stats = {"enqueued": 0, "dropped": 0, "dropped_errors": 0, "max_queue_depth": 0}
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # In-Process Queue: kein Pickling nötig, Formatierung übernimmt der Listener.
+        # Verzögerte Payloads werden hier (im Aufrufer-Thread) flach kopiert.
+        if isinstance(record.args, tuple):
+            for arg in record.args:
+                if isinstance(arg, LazyFormat):
+                    arg.snapshot()
+        for name in LAZY_EXTRA_FIELDS:
+            value = record.__dict__.get(name)
+            if isinstance(value, LazyFormat):
+                value.snapshot()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if not self._enqueue_full(record):
+                with self._stats_lock:
+                    self.stats["dropped"] += 1
+                    if record.levelno >= logging.ERROR:
+                        self.stats["dropped_errors"] += 1
+                return
+        with self._stats_lock:
+            self.stats["enqueued"] += 1
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queue.qsize())
+
+    def _enqueue_full(self, record: logging.LogRecord) -> bool:
+        """Overflow-Policy anwenden; True wenn der Record eingereiht wurde"""
+        if self.overflow_policy == "block" or record.levelno >= logging.ERROR:
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+                return True
+            except queue.Full:
+                return False
+        if self.overflow_policy == "drop_newest":
+            return False
+        try:
+            self.queue.get_nowait()
+            self.queue.task_done()
+            with self._stats_lock:
+                self.stats["dropped"] += 1
+            self.queue.put_nowait(record)
+            return True
+        except (queue.Empty, queue.Full):
+            return False
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener, der bis zu batch_size Records am Stück schreibt und dann flusht"""
+
+    def __init__(self, log_queue: queue.Queue, *handlers, batch_size: int = 256,
+                 respect_handler_level: bool = True):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = max(1, int(batch_size))
+        self.batches = 0
+
+    def _monitor(self):
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+                q.task_done()
+            self._flush_handlers()
+            self.batches += 1
+            if stop:
+                return
+
+    def _flush_handlers(self):
+        for handler in self.handlers:
+            try:
+                if isinstance(handler, BufferedRotatingFileHandler):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+            except Exception as e:
+                print(f"❌ Log-Flush Fehler: {e}")
+
+    def enqueue_sentinel(self):
+        # Blockierend, damit der Stopp auch bei voller Queue ankommt
+        self.queue.put(self._sentinel)
+
+
 class MiningLogger:
     """Erweitertes Logging-System für Mining-Operationen"""
 
@@ -43,10 +318,16 @@ class MiningLogger:
         log_dir: str = "logs",
         max_bytes: int = 10 * 1024 * 1024,
         backup_count: int = 5,
+        async_mode: Optional[bool] = None,
     ):
         self.log_dir = log_dir
         self.max_bytes = max_bytes
         self.backup_count = backup_count
+        if async_mode is None:
+            async_mode = get_config("Logging.AsyncEnabled", False)
+        self.async_mode = bool(async_mode)
+        self.queue_handler = None
+        self.listener = None
 
         # Log-Verzeichnis erstellen
         os.makedirs(log_dir, exist_ok=True)
@@ -58,6 +339,7 @@ class MiningLogger:
         # Bestehende Handler entfernen
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
+        self.handlers = []
 
         # Formatter
         self.formatter = MiningFormatter(
@@ -69,103 +351,215 @@ class MiningLogger:
         self.console_handler = logging.StreamHandler()
         self.console_handler.setLevel(logging.INFO)
         self.console_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.console_handler)
+        self.handlers.append(self.console_handler)
 
         # File Handler für alle Logs
-        self.all_handler = logging.handlers.RotatingFileHandler(
+        self.all_handler = BufferedRotatingFileHandler(
             os.path.join(log_dir, "mining_all.log"),
             maxBytes=max_bytes,
             backupCount=backup_count,
         )
         self.all_handler.setLevel(logging.DEBUG)
         self.all_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.all_handler)
+        self.handlers.append(self.all_handler)
 
         # File Handler für Fehler
-        self.error_handler = logging.handlers.RotatingFileHandler(
+        self.error_handler = BufferedRotatingFileHandler(
             os.path.join(log_dir, "mining_errors.log"),
             maxBytes=max_bytes,
             backupCount=backup_count,
         )
         self.error_handler.setLevel(logging.ERROR)
         self.error_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.error_handler)
+        self.handlers.append(self.error_handler)
 
         # File Handler für Mining-Operationen
-        self.mining_handler = logging.handlers.RotatingFileHandler(
+        self.mining_handler = BufferedRotatingFileHandler(
             os.path.join(log_dir, "mining_operations.log"),
             maxBytes=max_bytes,
             backupCount=backup_count,
         )
         self.mining_handler.setLevel(logging.INFO)
         self.mining_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.mining_handler)
+        self.handlers.append(self.mining_handler)
+
+        # Sampling/Drosselung von log_event pro Event-Typ
+        sampling_config = get_config("Logging.EventSampling", {})
+        self.sampler = None
+        if sampling_config.get("Enabled", True):
+            self.sampler = EventSampler(
+                default_rate=sampling_config.get("DefaultRate", 1.0),
+                rates=sampling_config.get("Rates", {}),
+                default_limit=sampling_config.get("DefaultLimit", {"Rate": 20, "Burst": 100}),
+                limits=sampling_config.get("Limits", {}),
+                summary_interval_seconds=float(sampling_config.get("SummaryIntervalSeconds", 60)),
+            )
+
+        # Logger-Level als einziges Gate: isEnabledFor() spart Payload-Aufbau
+        self.set_level(get_config("Logging.Level", "DEBUG"))
+
+        # Strukturierte Events zusätzlich als indizierte JSON-Lines
+        self.event_store = None
+        event_store_config = get_config("Logging.EventStore", {})
+        if event_store_config.get("Enabled", True):
+            try:
+                self.event_store = EventStore(
+                    event_store_config.get("Directory", os.path.join(log_dir, "events")),
+                    segment_max_bytes=int(event_store_config.get("SegmentMaxMB", 64)) * 1024 * 1024,
+                    bucket_seconds=int(event_store_config.get("BucketSeconds", 3600)),
+                    retention_days=event_store_config.get("RetentionDays", 30),
+                )
+                atexit.register(self.event_store.close)
+            except Exception as e:
+                print(f"⚠️ Event-Store nicht verfügbar: {e}")
+
+        if self.async_mode:
+            self._start_async()
+        else:
+            for handler in self.handlers:
+                self.logger.addHandler(handler)
+        if self.sampler:
+            # Letzte Zusammenfassung vor dem Stoppen der Handler (atexit ist LIFO)
+            atexit.register(self._log_sampling_summary, True)
 
         print("ENHANCED LOGGING SYSTEM INITIALIZED")
         print(f"Log-Verzeichnis: {log_dir}")
         print("Log-Rotation: Aktiviert")
+        if self.async_mode:
+            print("Async-Logging: Aktiviert")
+
+    def _start_async(self):
+        """Hängt einen QueueHandler an den Logger; Datei-I/O läuft im Listener-Thread"""
+        log_queue = queue.Queue(maxsize=int(get_config("Logging.AsyncQueueSize", 10000)))
+        self.queue_handler = BoundedQueueHandler(
+            log_queue,
+            overflow_policy=get_config("Logging.AsyncOverflowPolicy", "drop_oldest"),
+            block_timeout=float(get_config("Logging.AsyncBlockTimeoutSeconds", 0.05)),
+        )
+        for handler in self.handlers:
+            if isinstance(handler, BufferedRotatingFileHandler):
+                handler.defer_flush = True
+        self.listener = BatchingQueueListener(
+            log_queue,
+            *self.handlers,
+            batch_size=int(get_config("Logging.AsyncBatchSize", 256)),
+        )
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+        # Nach logging's eigenem atexit registriert, läuft also davor (LIFO)
+        atexit.register(self.stop_async)
+
+    def stop_async(self):
+        """Schreibt die Queue leer und stoppt den Writer-Thread"""
+        if self.listener and self.listener._thread:
+            self.listener.stop()
+
+    def set_level(self, level):
+        """Setzt das Log-Level (Name oder Zahl); nie unter das niedrigste Handler-Level"""
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.DEBUG
+        self.logger.setLevel(max(level, min(handler.level for handler in self.handlers)))
 
     def log_mining_cycle(self, cycle_data: Dict[str, Any]):
         """Loggt Mining-Zyklus-Daten"""
-        extra = {
-            "mining_data": f"Cycle_{cycle_data.get('cycle', 'N/A')} | Capital: {cycle_data.get('capital_after', 0):.2f} CHF | Profit: {cycle_data.get('cycle_profit', 0):.2f} CHF"
-        }
-        self.logger.info(f"MINING_CYCLE_COMPLETED", extra=extra)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        extra = {"mining_data": LazyFormat(_format_cycle, cycle_data)}
+        self.logger.info("MINING_CYCLE_COMPLETED", extra=extra)
 
     def log_profit_calculation(self, profit_data: Dict[str, Any]):
         """Loggt Profit-Berechnungen"""
-        extra = {
-            "profit_info": f"Algorithm: {profit_data.get('algorithm', 'N/A')} | Expected: {profit_data.get('expected_profit_chf', 0):.2f} CHF/day"
-        }
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        extra = {"profit_info": LazyFormat(_format_profit, profit_data)}
         self.logger.info(
-            f"PROFIT_CALCULATION | {profit_data.get('best_coin', 'N/A')}", extra=extra
+            "PROFIT_CALCULATION | %s", profit_data.get("best_coin", "N/A"), extra=extra
         )
 
     def log_rig_status(self, rig_data: Dict[str, Any]):
         """Loggt Rig-Status"""
-        status = "ACTIVE" if rig_data.get("status") == "ACTIVE" else "INACTIVE"
-        extra = {
-            "rig_info": f"{rig_data.get('id', 'N/A')} | {rig_data.get('type', 'N/A')} | Temp: {rig_data.get('temperature', 0)}°C | Status: {status}"
-        }
-        self.logger.info(f"RIG_STATUS_UPDATE", extra=extra)
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        extra = {"rig_info": LazyFormat(_format_rig, rig_data)}
+        self.logger.info("RIG_STATUS_UPDATE", extra=extra)
 
     def log_system_event(self, event_type: str, event_data: Dict[str, Any]):
-        """Loggt System-Events"""
+        """Loggt System-Events
+
+        Der Event-Store erhält jedes Event (Abfragen pro Rig bleiben
+        vollständig); Sampling/Drosselung gilt nur für die Log-Zeile.
+        """
+        if self.event_store:
+            try:
+                self.event_store.append(
+                    event_type, event_data, rig_id=event_data.get("rig_id")
+                )
+            except Exception as e:
+                print(f"❌ Event-Store Fehler: {e}")
+
+        if self.sampler:
+            self._log_sampling_summary()
+            if not self.sampler.allow(event_type):
+                return
+
         if event_type == "STARTUP":
             self.logger.info(
-                f"SYSTEM_STARTUP | Version: {event_data.get('version', 'N/A')}"
+                "SYSTEM_STARTUP | Version: %s", event_data.get("version", "N/A")
             )
         elif event_type == "SHUTDOWN":
             self.logger.info(
-                f"SYSTEM_SHUTDOWN | Uptime: {event_data.get('uptime', 'N/A')}"
+                "SYSTEM_SHUTDOWN | Uptime: %s", event_data.get("uptime", "N/A")
             )
         elif event_type == "OPTIMIZATION":
             self.logger.info(
-                f"OPTIMIZATION_EXECUTED | Type: {event_data.get('optimization_type', 'N/A')}"
+                "OPTIMIZATION_EXECUTED | Type: %s",
+                event_data.get("optimization_type", "N/A"),
             )
         elif event_type == "ERROR":
             self.logger.error(
-                f"SYSTEM_ERROR | {event_data.get('error_message', 'Unknown error')}"
+                "SYSTEM_ERROR | %s", event_data.get("error_message", "Unknown error")
             )
         elif event_type == "WARNING":
             self.logger.warning(
-                f"SYSTEM_WARNING | {event_data.get('warning_message', 'Unknown warning')}"
+                "SYSTEM_WARNING | %s",
+                event_data.get("warning_message", "Unknown warning"),
+            )
+        elif self.logger.isEnabledFor(logging.INFO):
+            # JSON erst beim Schreiben erzeugen
+            self.logger.info(
+                "EVENT_%s | %s", event_type, LazyFormat(json.dumps, event_data)
+            )
+
+    def _log_sampling_summary(self, force: bool = False):
+        """Meldet "N suppressed in last 60s" je Event-Typ"""
+        summary = self.sampler.drain_summary(force)
+        if not summary:
+            return
+        suppressed, window = summary
+        for event_type, count in sorted(suppressed.items()):
+            self.logger.info(
+                "EVENT_SAMPLING | %s: %d suppressed in last %.0fs", event_type, count, window
             )
-        else:
-            self.logger.info(f"EVENT_{event_type} | {json.dumps(event_data)}")
 
     def log_market_data(self, market_data: Dict[str, Any]):
         """Loggt Markt-Daten"""
-        coins_logged = len(market_data)
-        self.logger.info(f"MARKET_DATA_UPDATED | {coins_logged} coins refreshed")
+        self.logger.info("MARKET_DATA_UPDATED | %d coins refreshed", len(market_data))
 
-        # Detaillierte Logs für wichtige Coins
+        # Detaillierte Logs für wichtige Coins (nur wenn DEBUG aktiv ist)
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         important_coins = ["BTC", "ETH", "RVN", "XMR"]
         for coin in important_coins:
             if coin in market_data:
                 data = market_data[coin]
                 self.logger.debug(
-                    f"MARKET_{coin} | USD: ${data.get('usd', 0):.2f} | CHF: CHF {data.get('chf', 0):.2f} | Change: {data.get('change_24h', 0):+.1f}%"
+                    "MARKET_%s | USD: $%.2f | CHF: CHF %.2f | Change: %+.1f%%",
+                    coin,
+                    data.get("usd", 0),
+                    data.get("chf", 0),
+                    data.get("change_24h", 0),
                 )
 
     def log_backup_operation(self, operation: str, backup_data: Dict[str, Any]):
@@ -181,9 +575,36 @@ class MiningLogger:
                 f"BACKUP_DELETED | {backup_data.get('filename', 'N/A')} (old backup cleanup)"
             )
 
+    def query_events(
+        self,
+        event_type: Optional[str] = None,
+        rig_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        last_seconds: Optional[float] = None,
+        limit: Optional[int] = None,
+    ):
+        """Strukturierte Events aus dem Event-Store (leer wenn deaktiviert)"""
+        if not self.event_store:
+            return []
+        return self.event_store.query(
+            event_type, since, until, rig_id, last_seconds=last_seconds, limit=limit
+        )
+
     def get_log_stats(self) -> Dict[str, Any]:
         """Gibt Logging-Statistiken zurück"""
         stats = {"log_directory": self.log_dir, "log_files": [], "total_size_mb": 0}
+        if self.queue_handler:
+            stats["async_queue"] = {
+                **self.queue_handler.stats,
+                "queue_depth": self.queue_handler.queue.qsize(),
+                "batches_written": self.listener.batches,
+                "overflow_policy": self.queue_handler.overflow_policy,
+            }
+        if self.event_store:
+            stats["event_store"] = self.event_store.get_stats()
+        if self.sampler:
+            stats["event_sampling"] = self.sampler.get_stats()
 
         if os.path.exists(self.log_dir):
             for file in os.listdir(self.log_dir):
@@ -252,6 +673,13 @@ def log_event(event_type, event_data=None):
     mining_logger.log_system_event(event_type, event_data)
 
 
+def query_events(event_type=None, rig_id=None, last_seconds=None, limit=None):
+    """Strukturierte Events abfragen"""
+    return mining_logger.query_events(
+        event_type, rig_id, last_seconds=last_seconds, limit=limit
+    )
+
+
 def log_market(market_data):
     """Loggt Markt-Daten"""
     mining_logger.log_market_data(market_data)
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - EVENT STORE
+Strukturiertes Event-Log als kompakte JSON-Lines-Segmente
+Sidecar-Index (Event-Typ, Zeit-Bucket, Rig) -> Byte-Offsets für direkte Seeks bei Abfragen
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+
+SEGMENT_PREFIX = "events-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".idx"
+
+
+class _Segment:
+    __slots__ = ("path", "start_ts")
+
+    def __init__(self, path: str, start_ts: float):
+        self.path = path
+        self.start_ts = start_ts
+
+    @property
+    def index_path(self) -> str:
+        return self.path + INDEX_SUFFIX
+
+
+class EventStore:
+    """Append-only Event-Log mit Index pro Segment
+
+    Jede Zeile eines Segments ist ein Event {"ts", "type", "rig", "data"}.
+    Die .idx-Datei daneben enthält pro Flush und Schlüssel eine Zeile
+    {"t": Typ, "b": Zeit-Bucket, "r": Rig, "o": [Offsets]}. Abfragen lesen
+    nur den Index der Segmente im Zeitraum und springen per seek() direkt
+    zu den Treffern.
+    """
+
+    def __init__(self, directory: str = "logs/events", segment_max_bytes: int = 64 * 1024 * 1024,
+                 bucket_seconds: int = 3600, index_flush_records: int = 1000,
+                 flush_interval_seconds: float = 5.0, retention_days: Optional[float] = 30,
+                 index_cache_segments: int = 16):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.bucket_seconds = bucket_seconds
+        self.index_flush_records = index_flush_records
+        self.flush_interval_seconds = flush_interval_seconds
+        self.retention_days = retention_days
+        self.index_cache_segments = index_cache_segments
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._segments: List[_Segment] = self._scan_segments()
+        self._index_cache: "OrderedDict[str, Dict[Tuple[str, int, str], List[int]]]" = OrderedDict()
+        self.stats = {"appended": 0, "index_flushes": 0, "segments_rotated": 0, "recovered": 0}
+
+        if self._segments:
+            self._recover(self._segments[-1])
+        # Neues Segment erst beim ersten Event, benannt nach dessen Zeitstempel
+        self._file = None
+        self._index_file = None
+        self._offset = 0
+        self._active_index: Dict[Tuple[str, int, str], List[int]] = {}
+        self._pending_index: Dict[Tuple[str, int, str], List[int]] = {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+    # --- Segmente ----------------------------------------------------------
+
+    def _scan_segments(self) -> List[_Segment]:
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                try:
+                    start_ms = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                except ValueError:
+                    continue
+                segments.append(_Segment(os.path.join(self.directory, name), start_ms / 1000))
+        return sorted(segments, key=lambda segment: segment.start_ts)
+
+    def _open_segment(self, timestamp: float):
+        start_ms = int(timestamp * 1000)
+        if self._segments and start_ms <= int(self._segments[-1].start_ts * 1000):
+            start_ms = int(self._segments[-1].start_ts * 1000) + 1
+        segment = _Segment(os.path.join(self.directory, f"{SEGMENT_PREFIX}{start_ms:015d}{SEGMENT_SUFFIX}"),
+                           start_ms / 1000)
+        self._segments.append(segment)
+        self._file = open(segment.path, "ab")
+        self._index_file = open(segment.index_path, "a", encoding="utf-8")
+        self._offset = 0
+        self._active_index: Dict[Tuple[str, int, str], List[int]] = {}
+        self._pending_index: Dict[Tuple[str, int, str], List[int]] = {}
+        self._pending_count = 0
+        self._last_flush = time.monotonic()
+
+    def _rotate(self, timestamp: float):
+        self._flush_locked()
+        self._file.close()
+        self._index_file.close()
+        self._open_segment(timestamp)
+        self.stats["segments_rotated"] += 1
+        if self.retention_days:
+            self.prune(self.retention_days)
+
+    def _recover(self, segment: _Segment):
+        """Indiziert Events, die nach dem letzten Index-Flush geschrieben wurden (z.B. Absturz)"""
+        index = self._read_index(segment)
+        indexed_end = max((max(offsets) for offsets in index.values()), default=-1)
+        recovered: Dict[Tuple[str, int, str], List[int]] = {}
+        with open(segment.path, "rb+") as f:
+            offset = 0
+            if indexed_end >= 0:
+                f.seek(indexed_end)
+                offset = indexed_end + len(f.readline())
+            f.seek(offset)
+            for line in iter(f.readline, b""):
+                if not line.endswith(b"\n"):
+                    f.truncate(offset)  # unvollständige letzte Zeile
+                    break
+                try:
+                    record = json.loads(line)
+                    key = (record["type"], int(record["ts"] // self.bucket_seconds), record.get("rig", ""))
+                except (ValueError, KeyError, TypeError):
+                    offset += len(line)
+                    continue
+                recovered.setdefault(key, []).append(offset)
+                offset += len(line)
+        if recovered:
+            with open(segment.index_path, "a", encoding="utf-8") as index_file:
+                self._write_index_lines(index_file, recovered)
+            self.stats["recovered"] += sum(len(offsets) for offsets in recovered.values())
+
+    # --- Schreibpfad -------------------------------------------------------
+
+    def append(self, event_type: str, data: Optional[Dict[str, Any]] = None,
+               rig_id: Optional[str] = None, timestamp: Optional[float] = None):
+        """Schreibt ein Event (gepuffert; Index wird in Batches nachgezogen)"""
+        timestamp = time.time() if timestamp is None else timestamp
+        record = {"ts": round(timestamp, 3), "type": event_type}
+        if rig_id is not None:
+            record["rig"] = str(rig_id)
+        record["data"] = data or {}
+        line = (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+        key = (event_type, int(timestamp // self.bucket_seconds), record.get("rig", ""))
+
+        with self._lock:
+            if self._file is None:
+                self._open_segment(timestamp)
+            elif self._offset and self._offset + len(line) > self.segment_max_bytes:
+                self._rotate(timestamp)
+            offset = self._offset
+            self._file.write(line)
+            self._offset += len(line)
+            self._active_index.setdefault(key, []).append(offset)
+            self._pending_index.setdefault(key, []).append(offset)
+            self._pending_count += 1
+            self.stats["appended"] += 1
+            if (self._pending_count >= self.index_flush_records
+                    or time.monotonic() - self._last_flush >= self.flush_interval_seconds):
+                self._flush_locked()
+
+    def _write_index_lines(self, index_file, index: Dict[Tuple[str, int, str], List[int]]):
+        for (event_type, bucket, rig), offsets in index.items():
+            index_file.write(json.dumps({"t": event_type, "b": bucket, "r": rig, "o": offsets},
+                                        separators=(",", ":")) + "\n")
+        index_file.flush()
+
+    def _flush_locked(self):
+        if self._file is None or self._file.closed:
+            return
+        # Daten vor dem Index schreiben, damit der Index nie ins Leere zeigt
+        self._file.flush()
+        if self._pending_index:
+            self._write_index_lines(self._index_file, self._pending_index)
+            self._pending_index = {}
+            self._pending_count = 0
+            self.stats["index_flushes"] += 1
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._file and not self._file.closed:
+                self._flush_locked()
+                self._file.close()
+                self._index_file.close()
+            self._file = None
+
+    # --- Abfragen ----------------------------------------------------------
+
+    def _read_index(self, segment: _Segment) -> Dict[Tuple[str, int, str], List[int]]:
+        index: Dict[Tuple[str, int, str], List[int]] = {}
+        if not os.path.exists(segment.index_path):
+            return index
+        with open(segment.index_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # abgebrochene Zeile nach Absturz
+                index.setdefault((entry["t"], entry["b"], entry.get("r", "")), []).extend(entry["o"])
+        return index
+
+    def _segment_index(self, segment: _Segment) -> Dict[Tuple[str, int, str], List[int]]:
+        """Index eines Segments (aktives Segment aus dem Speicher, sonst LRU-Cache)"""
+        if self._file is not None and segment is self._segments[-1]:
+            return self._active_index
+        index = self._index_cache.get(segment.path)
+        if index is None:
+            index = self._index_cache[segment.path] = self._read_index(segment)
+            if len(self._index_cache) > self.index_cache_segments:
+                self._index_cache.popitem(last=False)
+        else:
+            self._index_cache.move_to_end(segment.path)
+        return index
+
+    def _segments_in_range(self, since: Optional[float], until: Optional[float]) -> List[_Segment]:
+        result = []
+        for i, segment in enumerate(self._segments):
+            end = self._segments[i + 1].start_ts if i + 1 < len(self._segments) else float("inf")
+            if (since is None or end >= since) and (until is None or segment.start_ts <= until):
+                result.append(segment)
+        return result
+
+    def _matching_offsets(self, index: Dict[Tuple[str, int, str], List[int]], event_type: Optional[str],
+                          since: Optional[float], until: Optional[float],
+                          rig_id: Optional[str] = None) -> List[int]:
+        first = None if since is None else int(since // self.bucket_seconds)
+        last = None if until is None else int(until // self.bucket_seconds)
+        offsets = []
+        for (indexed_type, bucket, rig), bucket_offsets in index.items():
+            if event_type is not None and indexed_type != event_type:
+                continue
+            if rig_id is not None and rig != rig_id:
+                continue
+            if (first is not None and bucket < first) or (last is not None and bucket > last):
+                continue
+            offsets.extend(bucket_offsets)
+        offsets.sort()
+        return offsets
+
+    def query(self, event_type: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, rig_id: Optional[str] = None,
+              last_seconds: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events chronologisch; bei limit die neuesten limit Treffer"""
+        if last_seconds is not None:
+            since = time.time() - last_seconds
+        rig_id = None if rig_id is None else str(rig_id)
+        results = []
+        with self._lock:
+            self._flush_locked()
+            for segment in reversed(self._segments_in_range(since, until)):
+                offsets = self._matching_offsets(self._segment_index(segment), event_type, since, until, rig_id)
+                if not offsets:
+                    continue
+                matches = []
+                with open(segment.path, "rb") as f:
+                    for offset in reversed(offsets):
+                        f.seek(offset)
+                        record = json.loads(f.readline())
+                        if since is not None and record["ts"] < since:
+                            continue
+                        if until is not None and record["ts"] > until:
+                            continue
+                        matches.append(record)
+                        if limit is not None and len(results) + len(matches) >= limit:
+                            break
+                results.extend(matches)
+                if limit is not None and len(results) >= limit:
+                    break
+        results.reverse()
+        return results
+
+    def count_by_type(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, int]:
+        """Event-Anzahl pro Typ allein aus dem Index (Genauigkeit: ganze Zeit-Buckets)"""
+        counts: Dict[str, int] = {}
+        first = None if since is None else int(since // self.bucket_seconds)
+        last = None if until is None else int(until // self.bucket_seconds)
+        with self._lock:
+            for segment in self._segments_in_range(since, until):
+                for (event_type, bucket, _rig), offsets in self._segment_index(segment).items():
+                    if (first is None or bucket >= first) and (last is None or bucket <= last):
+                        counts[event_type] = counts.get(event_type, 0) + len(offsets)
+        return counts
+
+    def prune(self, older_than_days: float):
+        """Löscht Segmente, deren Events alle älter als older_than_days sind"""
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock:
+            keep = []
+            for i, segment in enumerate(self._segments):
+                next_start = self._segments[i + 1].start_ts if i + 1 < len(self._segments) else None
+                if next_start is not None and next_start < cutoff:
+                    for path in (segment.path, segment.index_path):
+                        if os.path.exists(path):
+                            os.remove(path)
+                    self._index_cache.pop(segment.path, None)
+                else:
+                    keep.append(segment)
+            self._segments = keep
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "segments": len(self._segments), "active_segment_bytes": self._offset,
+                    "directory": self.directory}
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - HTTP CLIENT
+Gemeinsamer HTTP-Client für alle externen Integrationen
+Keep-Alive Connection-Pools pro Host, Timeouts, Retries mit Jitter, Latenz-Histogramme
+"""
+import random
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from python_modules.config_manager import get_config
+
+
+# Obergrenzen der Latenz-Buckets in Millisekunden (letzter Bucket: darüber)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Methoden, die ohne Nebenwirkungen wiederholt werden dürfen
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+class LatencyHistogram:
+    """Latenz-Histogramm eines Endpoints mit festen Buckets"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, latency_ms: float, error: bool = False):
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        if error:
+            self.errors += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Perzentil als Bucket-Obergrenze (ms)"""
+        if not self.count:
+            return None
+        target = self.count * p / 100
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'retries': self.retries,
+            'avg_ms': self.total_ms / self.count if self.count else None,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'buckets': dict(zip(labels, self.buckets)),
+        }
+
+
+class HttpClient:
+    """Geteilte requests.Session mit Connection-Pooling und Retry-Logik"""
+
+    def __init__(self):
+        self.config = get_config('Http', {})
+        self.connect_timeout = float(self.config.get('ConnectTimeoutSeconds', 3.05))
+        self.read_timeout = float(self.config.get('ReadTimeoutSeconds', 10))
+        self.max_retries = int(self.config.get('MaxRetries', 2))
+        self.backoff_base = float(self.config.get('BackoffBaseSeconds', 0.25))
+        self.backoff_max = float(self.config.get('BackoffMaxSeconds', 4.0))
+        self.retry_status_codes = set(self.config.get('RetryStatusCodes', [429, 500, 502, 503, 504]))
+
+        # Ein Pool pro Host; Retries übernimmt dieser Client (mit Jitter und Metriken)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=int(self.config.get('PoolConnections', 10)),
+            pool_maxsize=int(self.config.get('PoolMaxSize', 20)),
+            max_retries=0,
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._stats_lock = threading.Lock()
+        self.endpoint_stats: Dict[str, LatencyHistogram] = {}
+
+    def _timeout(self, timeout: Union[None, float, Tuple[float, float]]) -> Tuple[float, float]:
+        """Einzelwert = Read-Timeout; Connect-Timeout kommt aus der Konfiguration"""
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        if isinstance(timeout, tuple):
+            return timeout
+        return (min(self.connect_timeout, timeout), timeout)
+
+    def _backoff_delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Full-Jitter Backoff; Retry-After des Servers hat Vorrang"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.backoff_max)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _record(self, endpoint: str, latency_ms: float, error: bool, retried: bool):
+        with self._stats_lock:
+            histogram = self.endpoint_stats.get(endpoint)
+            if histogram is None:
+                histogram = self.endpoint_stats[endpoint] = LatencyHistogram()
+            histogram.observe(latency_ms, error)
+            if retried:
+                histogram.retries += 1
+
+    def request(self, method: str, url: str, endpoint: Optional[str] = None,
+                timeout: Union[None, float, Tuple[float, float]] = None,
+                retries: Optional[int] = None, retry_status_codes: Optional[set] = None,
+                **kwargs) -> requests.Response:
+        """Sendet einen Request über den gemeinsamen Pool
+
+        endpoint: Label für die Latenz-Statistik (ohne Tokens/IDs aus der URL).
+        retries: Standard MaxRetries für idempotente Methoden, 0 für POST.
+        retry_status_codes: überschreibt die wiederholbaren Status-Codes.
+        Nach erschöpften Retries wird die letzte Antwort zurückgegeben bzw.
+        die letzte Exception geworfen.
+        """
+        method = method.upper()
+        if endpoint is None:
+            parts = urlsplit(url)
+            endpoint = f"{method} {parts.netloc}{parts.path}"
+        if retries is None:
+            retries = self.max_retries if method in IDEMPOTENT_METHODS else 0
+        timeout = self._timeout(timeout)
+        if retry_status_codes is None:
+            retry_status_codes = self.retry_status_codes
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            response = None
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(endpoint, (time.perf_counter() - start) * 1000, True, attempt > 0)
+                if attempt >= retries:
+                    raise
+            else:
+                failed = response.status_code in retry_status_codes
+                self._record(endpoint, (time.perf_counter() - start) * 1000,
+                             response.status_code >= 400, attempt > 0)
+                if not failed or attempt >= retries:
+                    return response
+
+            time.sleep(self._backoff_delay(attempt, response))
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request('DELETE', url, **kwargs)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latenz-Histogramme aller Endpoints"""
+        with self._stats_lock:
+            return {endpoint: histogram.to_dict() for endpoint, histogram in self.endpoint_stats.items()}
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.endpoint_stats.clear()
+
+    def close(self):
+        """Schließt alle offenen Verbindungen"""
+        self.session.close()
+
+
+# Globale HTTP-Client Instanz
+http_client = HttpClient()
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """GET über den gemeinsamen HTTP-Client"""
+    return http_client.get(url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """POST über den gemeinsamen HTTP-Client"""
+    return http_client.post(url, **kwargs)
+
+
+def get_http_stats() -> Dict[str, Dict[str, Any]]:
+    """Latenz-Statistik pro Endpoint"""
+    return http_client.get_latency_stats()
@@ -2,15 +2,24 @@
 """
 CASH MONEY COLORS ORIGINAL (R) - MARKET INTEGRATION
 Echte Markt-Daten für realistische Mining-Profit-Kalkulation
-CoinGecko API Integration für Live-Krypto-Preise
+CoinGecko, Binance und Coinbase parallel abgefragt für Live-Krypto-Preise
 """
-import requests
+import asyncio
 import json
+import statistics
 import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Callable, Optional, Tuple
 import os
 from pathlib import Path
+from python_modules.config_manager import get_config
+from python_modules.single_flight import single_flight
+from python_modules.http_client import http_client
+from python_modules.price_history import PriceHistory
 
 # Universal Integration Setup
 def setup_universal_integration():
@@ -52,16 +61,140 @@ def setup_universal_integration():
 # Automatische Integration beim Import
 universal_config = setup_universal_integration()
 
+# Preis-Provider: jeder liefert {SYMBOL: {'usd', 'chf', 'change_24h'}} für die angefragten Coins
+# Provider wiederholen nicht selbst: Redundanz kommt aus den parallelen Quellen
+class PriceProvider:
+    """Basisklasse für Preisquellen"""
+
+    name = "base"
+
+    def __init__(self, base_url: str, timeout: float):
+        self.base_url = base_url
+        self.timeout = timeout
+
+    def fetch(self, coins: List[str]) -> Dict[str, Dict]:
+        raise NotImplementedError
+
+
+class CoinGeckoProvider(PriceProvider):
+    """CoinGecko simple/price (USD, CHF und 24h-Änderung in einem Request)"""
+
+    name = "coingecko"
+
+    def __init__(self, base_url: str, timeout: float, coin_ids: Dict[str, str]):
+        super().__init__(base_url, timeout)
+        self.coin_ids = coin_ids
+
+    def fetch(self, coins: List[str]) -> Dict[str, Dict]:
+        ids = {self.coin_ids.get(coin, coin.lower()): coin for coin in coins}
+        response = http_client.get(f"{self.base_url}/simple/price", params={
+            'ids': ','.join(ids),
+            'vs_currencies': 'usd,chf',
+            'include_24hr_change': 'true'
+        }, timeout=self.timeout, retries=0, endpoint="coingecko /simple/price")
+        response.raise_for_status()
+
+        return {
+            ids.get(coin_id, coin_id.upper()): {
+                'usd': coin_data.get('usd', 0),
+                'chf': coin_data.get('chf'),
+                'change_24h': coin_data.get('usd_24h_change', 0),
+            }
+            for coin_id, coin_data in response.json().items()
+        }
+
+
+class BinanceProvider(PriceProvider):
+    """Binance 24h-Ticker gegen USDT (kein CHF, wird umgerechnet)"""
+
+    name = "binance"
+    listed = {'BTC', 'ETH', 'ETC', 'RVN', 'CFX', 'BCH', 'KAS'}
+
+    def fetch(self, coins: List[str]) -> Dict[str, Dict]:
+        symbols = [f"{coin}USDT" for coin in coins if coin in self.listed]
+        if not symbols:
+            return {}
+        response = http_client.get(f"{self.base_url}/api/v3/ticker/24hr", params={
+            'symbols': json.dumps(symbols, separators=(',', ':'))
+        }, timeout=self.timeout, retries=0, endpoint="binance /api/v3/ticker/24hr")
+        response.raise_for_status()
+
+        return {
+            ticker['symbol'][:-4]: {
+                'usd': float(ticker['lastPrice']),
+                'chf': None,
+                'change_24h': float(ticker.get('priceChangePercent', 0)),
+            }
+            for ticker in response.json()
+            if ticker.get('symbol', '').endswith('USDT')
+        }
+
+
+class CoinbaseProvider(PriceProvider):
+    """Coinbase Wechselkurse (USD-Basis, enthält CHF; keine 24h-Änderung)"""
+
+    name = "coinbase"
+
+    def fetch(self, coins: List[str]) -> Dict[str, Dict]:
+        response = http_client.get(f"{self.base_url}/v2/exchange-rates", params={'currency': 'USD'},
+                                   timeout=self.timeout, retries=0, endpoint="coinbase /v2/exchange-rates")
+        response.raise_for_status()
+        rates = response.json().get('data', {}).get('rates', {})
+        usd_chf = float(rates['CHF']) if rates.get('CHF') else None
+
+        prices = {}
+        for coin in coins:
+            rate = float(rates.get(coin) or 0)
+            if rate > 0:
+                usd = 1.0 / rate
+                prices[coin] = {
+                    'usd': usd,
+                    'chf': usd * usd_chf if usd_chf else None,
+                    'change_24h': None,
+                }
+        return prices
+
+
+PRICE_PROVIDERS = {
+    'coingecko': (CoinGeckoProvider, "https://api.coingecko.com/api/v3"),
+    'binance': (BinanceProvider, "https://api.binance.com"),
+    'coinbase': (CoinbaseProvider, "https://api.coinbase.com"),
+}
+
+
 class MarketIntegration:
     """Echte Markt-Daten Integration für Mining-System"""
 
     def __init__(self):
-        self.base_url = "https://api.coingecko.com/api/v3"
+        self.base_url = get_config('Market.CoinGeckoBaseUrl', "https://api.coingecko.com/api/v3")
         self.cache_file = "market_cache.json"
-        self.cache_duration = 300  # 5 Minuten Cache
+        self.cache_duration = float(get_config('Market.CacheDurationMinutes', 5)) * 60
+        self.stale_max_age = float(get_config('Market.StaleMaxAgeMinutes', 60)) * 60
+        self.refresh_ahead = float(get_config('Market.RefreshAheadSeconds', 30))
+        self.error_retry_seconds = float(get_config('Market.ErrorRetrySeconds', 30))
+        self.background_refresh_enabled = bool(get_config('Market.BackgroundRefresh', True))
         self.last_update = None
+        self.last_error = None
         self.market_data = {}
 
+        # In-Memory Preis-Cache (monotone Uhr); Datei nur als Warm-Start-Snapshot
+        self._prices_fetched_at: Optional[float] = None
+        self._fetched_coins = set()
+        self._next_retry_at = 0.0
+        self._flight_key = "market:prices"
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._refresh_stopped = False  # explizit gestoppt: kein Auto-Start mehr
+        self.cache_stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0,
+                            'quorum_misses': 0}
+        self.price_listeners: List[Callable[[Dict], None]] = []
+
+        # Versionen für abhängige Caches (steigen nur bei geänderten Werten)
+        self.price_snapshot_id = 0
+        self.coin_versions: Dict[str, int] = {}
+        self._coin_fingerprints: Dict[str, tuple] = {}
+
         # Mining-relevante Coins
         self.mining_coins = {
             'BTC': 'bitcoin',
@@ -71,8 +204,10 @@ class MarketIntegration:
             'ERG': 'ergo',
             'CFX': 'conflux-token',
             'KAS': 'kaspa',
-            'ETC': 'ethereum-classic'
+            'ETC': 'ethereum-classic',
+            'BCH': 'bitcoin-cash'
         }
+        self._tracked_coins = set(self.mining_coins.keys())
 
         # Algorithmus-Mapping für Profit-Kalkulation
         self.algorithm_coins = {
@@ -84,68 +219,383 @@ class MarketIntegration:
             'octopus': ['CFX'],
             'kheavyhash': ['KAS']
         }
+        self.algorithm_ids = list(self.algorithm_coins)
+
+        # Vereinfachte Coin-Parameter: (Block-Belohnung, Blöcke pro Tag, Schwierigkeits-Faktor)
+        self.coin_parameters = {
+            'BTC': (6.25, 144, 1.0),     # ca. 2023
+            'ETH': (2.0, 7200, 0.8),     # ca. nach Merge
+            'RVN': (2500, 1440, 0.9),
+        }
+        self.default_coin_parameters = (1.0, 1000, 1.0)  # Generische Werte für andere Coins
+
+        # Preis-Provider werden parallel abgefragt (schnellste Antwort oder Median-Quorum)
+        self.provider_mode = get_config('Market.ProviderMode', 'fastest')
+        self.quorum_size = max(1, int(get_config('Market.QuorumSize', 2)))
+        self.provider_timeout = float(get_config('Market.ProviderTimeoutSeconds', 3.0))
+        self.coverage_grace = float(get_config('Market.CoverageGraceSeconds', 0.25))
+        self.usd_to_chf = float(get_config('Market.UsdToChf', 0.88))
+        self.providers = self._create_providers(
+            get_config('Market.Providers', ['coingecko', 'binance', 'coinbase']),
+            get_config('Market.ProviderBaseUrls', {})
+        )
+        self._provider_lock = threading.Lock()
+        self.provider_stats = {
+            provider.name: {'requests': 0, 'errors': 0, 'wins': 0, 'last_error': None,
+                            'latencies_ms': deque(maxlen=200)}
+            for provider in self.providers
+        }
+        self._provider_pool = ThreadPoolExecutor(max_workers=max(2, 2 * len(self.providers)),
+                                                 thread_name_prefix="price-provider")
+        self._provider_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._provider_loop_lock = threading.Lock()
+
+        # Preis-Historie für Volatilität/Drawdown (1-Minuten-Buckets)
+        self.price_history = PriceHistory(
+            retention_days=get_config('Market.PriceHistoryDays', 90),
+            window_hours=get_config('Market.VolatilityWindowHours', 24),
+            ewma_halflife_hours=get_config('Market.EwmaHalfLifeHours', 6),
+            min_history_minutes=get_config('Market.MinHistoryMinutes', 60),
+        )
+        self.price_history_file = get_config('Market.PriceHistoryFile', 'price_history.npz')
+        self.history_save_interval = float(get_config('Market.PriceHistorySaveMinutes', 60)) * 60
+        self._history_saved_at = time.monotonic()
+        self._load_price_history()
+
+        self._warm_start_from_snapshot()
 
         print("[COIN] MARKET INTEGRATION INITIALIZED")
         print("[STATS] Live Crypto-Preise für realistische Mining-Kalkulation")
 
     def get_crypto_prices(self, coins: List[str] = None) -> Dict[str, float]:
-        """Holt aktuelle Krypto-Preise von CoinGecko"""
-        if coins is None:
-            coins = list(self.mining_coins.keys())
+        """Holt aktuelle Krypto-Preise (In-Memory-Cache, CoinGecko bei Bedarf)
+
+        Heißer Pfad ohne Datei-I/O: gültige Daten kommen direkt aus dem
+        Speicher. Abgelaufene Daten werden weiter ausgeliefert, während im
+        Hintergrund aktualisiert wird (stale-while-revalidate). Das
+        zurückgegebene Dict ist geteilt und darf nicht verändert werden.
+        """
+        if coins and not self._tracked_coins.issuperset(coins):
+            self._tracked_coins.update(coins)
+            self.cache_stats['misses'] += 1
+            return self._refresh_prices()
+
+        if self.background_refresh_enabled and self._refresh_thread is None and not self._refresh_stopped:
+            self.start_background_refresh()
+
+        prices = self.market_data
+        age = self._cache_age()
+        if prices and age < self.cache_duration:
+            self.cache_stats['hits'] += 1
+            return prices
 
-        # Cache prüfen
-        if self._is_cache_valid():
-            return self._load_cache()
+        if prices and age < self.stale_max_age:
+            self.cache_stats['stale_hits'] += 1
+            self._trigger_async_refresh()
+            return prices
 
+        self.cache_stats['misses'] += 1
+        return self._refresh_prices()
+
+    def _cache_age(self) -> float:
+        """Alter der In-Memory-Preise in Sekunden (monotone Uhr)"""
+        if self._prices_fetched_at is None:
+            return float('inf')
+        return time.monotonic() - self._prices_fetched_at
+
+    def _trigger_async_refresh(self):
+        """Startet eine Hintergrund-Aktualisierung, falls keine läuft"""
+        if single_flight.in_flight(self._flight_key) or time.monotonic() < self._next_retry_at:
+            return
+        threading.Thread(target=self._refresh_prices, daemon=True).start()
+
+    def _refresh_prices(self) -> Dict:
+        """Lädt Preise; gleichzeitige Aufrufer teilen sich einen laufenden Fetch"""
+        return single_flight.do(self._flight_key, self._load_prices)
+
+    def _load_prices(self) -> Dict:
+        """Lädt Preise von CoinGecko; bei Fehlern werden alte Daten weiter ausgeliefert"""
+        # Ein gerade abgeschlossener Refresh hat die Daten evtl. schon aktualisiert
+        if (self.market_data and self._cache_age() < self.cache_duration
+                and self._tracked_coins.issubset(self._fetched_coins)):
+            return self.market_data
+
+        coins = sorted(self._tracked_coins)
         try:
-            # CoinGecko IDs sammeln
-            coin_ids = [self.mining_coins.get(coin, coin.lower()) for coin in coins]
-            coin_ids_str = ','.join(coin_ids)
-
-            # API Request
-            url = f"{self.base_url}/simple/price"
-            params = {
-                'ids': coin_ids_str,
-                'vs_currencies': 'usd,chf',
-                'include_24hr_change': 'true'
-            }
+            prices = self._fetch_prices(coins)
+        except Exception as e:
+            self.last_error = str(e)
+            self.cache_stats['refresh_errors'] += 1
+            self._next_retry_at = time.monotonic() + self.error_retry_seconds
+            print(f"[ERROR] Fehler beim Laden der Markt-Daten: {e}")
 
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-
-            # Daten formatieren
-            prices = {}
-            for coin, coin_data in data.items():
-                # Coin Symbol finden
-                symbol = None
-                for sym, id in self.mining_coins.items():
-                    if id == coin:
-                        symbol = sym
-                        break
-                if not symbol:
-                    symbol = coin.upper()
-
-                prices[symbol] = {
-                    'usd': coin_data.get('usd', 0),
-                    'chf': coin_data.get('chf', 0),
-                    'change_24h': coin_data.get('usd_24h_change', 0),
-                    'last_update': datetime.now().isoformat()
-                }
+            # Stale-on-Error: vorhandene Daten behalten, sonst Fallback
+            if self.market_data and self._cache_age() < self.stale_max_age:
+                return self.market_data
+            prices = self._get_fallback_prices(coins)
+            self._publish_prices(prices, coins, fresh=False)
+            return prices
 
-            # Cache speichern
-            self._save_cache(prices)
-            self.market_data = prices
-            self.last_update = datetime.now()
+        self.price_history.record_snapshot(prices)
+        degraded = any(data.get('degraded') for data in prices.values())
+        self._publish_prices(prices, coins, fresh=not degraded)
+        if degraded:
+            # Ohne Quorum gelten die Preise als abgelaufen: nach Retry-Pause neu versuchen
+            self.last_error = "Preis-Quorum verfehlt"
+            self._next_retry_at = time.monotonic() + self.error_retry_seconds
+        self.cache_stats['refreshes'] += 1
+        print(f"[MONEY] Preise aktualisiert für {len(prices)} Coins")
+        self._notify_price_listeners(prices)
+        self._save_cache(prices)
+        if time.monotonic() - self._history_saved_at >= self.history_save_interval:
+            self.save_price_history()
+        return prices
 
-            print(f"[MONEY] Preise aktualisiert für {len(prices)} Coins")
-            return prices
+    def _publish_prices(self, prices: Dict, coins: List[str], fresh: bool):
+        """Ersetzt den In-Memory-Snapshot atomar"""
+        self.market_data = prices
+        self._fetched_coins = set(coins)
+        self.last_update = datetime.now()
+        if fresh:
+            self._prices_fetched_at = time.monotonic()
+            self.last_error = None
+        else:
+            # Fallback-Daten gelten als abgelaufen, damit bald neu versucht wird
+            self._prices_fetched_at = time.monotonic() - self.cache_duration
+        self._register_snapshot(prices)
+
+    def _create_providers(self, names: List[str], base_urls: Dict[str, str]) -> List[PriceProvider]:
+        """Erstellt die konfigurierten Preis-Provider"""
+        providers = []
+        for name in names:
+            if name not in PRICE_PROVIDERS:
+                print(f"[WARN] Unbekannter Preis-Provider: {name}")
+                continue
+            provider_class, default_url = PRICE_PROVIDERS[name]
+            base_url = base_urls.get(name) or (self.base_url if name == 'coingecko' else default_url)
+            if provider_class is CoinGeckoProvider:
+                providers.append(provider_class(base_url, self.provider_timeout, self.mining_coins))
+            else:
+                providers.append(provider_class(base_url, self.provider_timeout))
+        return providers
+
+    def _get_provider_loop(self) -> asyncio.AbstractEventLoop:
+        """Eigener Event-Loop-Thread für den Provider-Fan-out
+
+        asyncio.run() scheitert in Threads mit laufendem Loop (z.B. Dashboard);
+        der Fan-out läuft daher immer auf diesem Loop.
+        """
+        with self._provider_loop_lock:
+            if self._provider_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="price-provider-loop", daemon=True).start()
+                self._provider_loop = loop
+            return self._provider_loop
+
+    def _required_quorum(self) -> int:
+        return 1 if self.provider_mode == 'fastest' else min(self.quorum_size, len(self.providers))
+
+    def _fetch_prices(self, coins: List[str]) -> Dict:
+        """Fragt alle Provider parallel ab und führt die Antworten zusammen
+
+        Verfehlt der Quorum-Modus sein Quorum, sind alle Einträge als
+        'degraded' markiert (mit 'quorum' = "Antworten/benötigt").
+        """
+        responses = asyncio.run_coroutine_threadsafe(
+            self._gather_provider_prices(coins), self._get_provider_loop()
+        ).result()
+        if not responses:
+            raise RuntimeError("Keine Preisquelle hat rechtzeitig geantwortet")
+
+        with self._provider_lock:
+            for name in responses:
+                self.provider_stats[name]['wins'] += 1
+        prices = self._merge_provider_prices(responses)
+
+        quorum = self._required_quorum()
+        if len(responses) < quorum:
+            self.cache_stats['quorum_misses'] += 1
+            print(f"[WARN] Preis-Quorum verfehlt: {len(responses)}/{quorum} Provider")
+            for data in prices.values():
+                data['degraded'] = True
+                data['quorum'] = f"{len(responses)}/{quorum}"
+        return prices
 
+    async def _gather_provider_prices(self, coins: List[str]) -> Dict[str, Dict]:
+        """Wartet auf die schnellste gültige Antwort bzw. auf das Quorum"""
+        loop = asyncio.get_running_loop()
+        tasks = {
+            loop.run_in_executor(self._provider_pool, self._call_provider, provider, coins): provider.name
+            for provider in self.providers
+        }
+        quorum = self._required_quorum()
+        deadline = loop.time() + self.provider_timeout
+
+        responses: Dict[str, Dict] = {}
+        first_response_at = 0.0
+        pending = set(tasks)
+        while pending:
+            covered = set().union(*responses.values()) if responses else set()
+            if len(responses) >= quorum:
+                if self.provider_mode != 'fastest' or covered.issuperset(coins):
+                    break
+                # Schnellste Antwort unvollständig: kurz auf fehlende Coins warten
+                deadline = min(deadline, first_response_at + self.coverage_grace)
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                prices = task.result()
+                if prices:
+                    if not responses:
+                        first_response_at = loop.time()
+                    responses[tasks[task]] = prices
+
+        # Nachzügler laufen im Pool weiter und fließen nur noch in die Statistik ein
+        for task in pending:
+            task.cancel()
+        return responses
+
+    def _call_provider(self, provider: PriceProvider, coins: List[str]) -> Optional[Dict[str, Dict]]:
+        """Ruft einen Provider auf und erfasst Latenz/Fehler"""
+        start = time.perf_counter()
+        error = None
+        try:
+            prices = {
+                coin: data for coin, data in provider.fetch(coins).items()
+                if coin in coins and data.get('usd') and data['usd'] > 0
+            }
+            if not prices:
+                error = "Leere Antwort"
         except Exception as e:
-            print(f"[ERROR] Fehler beim Laden der Markt-Daten: {e}")
-            # Fallback auf Cache oder simulierte Daten
-            return self._get_fallback_prices(coins)
+            prices = None
+            error = str(e)
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        with self._provider_lock:
+            stats = self.provider_stats[provider.name]
+            stats['requests'] += 1
+            stats['latencies_ms'].append(latency_ms)
+            if error:
+                stats['errors'] += 1
+                stats['last_error'] = error
+        return None if error else prices
+
+    def _merge_provider_prices(self, responses: Dict[str, Dict]) -> Dict:
+        """Median je Coin über alle vorliegenden Provider-Antworten"""
+        # USD/CHF-Kurs aus Providern mit CHF-Preisen ableiten, sonst Konfiguration
+        fx_rates = [
+            data['chf'] / data['usd']
+            for prices in responses.values() for data in prices.values()
+            if data.get('chf')
+        ]
+        usd_to_chf = statistics.median(fx_rates) if fx_rates else self.usd_to_chf
+
+        merged = {}
+        now = datetime.now().isoformat()
+        for coin in set().union(*responses.values()):
+            quotes = [(name, prices[coin]) for name, prices in responses.items() if coin in prices]
+            changes = [q['change_24h'] for _, q in quotes if q.get('change_24h') is not None]
+            merged[coin] = {
+                'usd': statistics.median(q['usd'] for _, q in quotes),
+                'chf': statistics.median(q['chf'] or q['usd'] * usd_to_chf for _, q in quotes),
+                'change_24h': statistics.median(changes) if changes else 0,
+                'last_update': now,
+                'sources': [name for name, _ in quotes],
+            }
+        return merged
+
+    def get_provider_stats(self) -> Dict[str, Dict]:
+        """Latenz- und Fehlerstatistik je Preis-Provider"""
+        with self._provider_lock:
+            result = {}
+            for name, stats in self.provider_stats.items():
+                latencies = sorted(stats['latencies_ms'])
+                result[name] = {
+                    'requests': stats['requests'],
+                    'errors': stats['errors'],
+                    'wins': stats['wins'],
+                    'error_rate': stats['errors'] / stats['requests'] if stats['requests'] else 0.0,
+                    'last_error': stats['last_error'],
+                    'latency_p50_ms': latencies[len(latencies) // 2] if latencies else None,
+                    'latency_p95_ms': latencies[int(len(latencies) * 0.95)] if latencies else None,
+                }
+            return result
+
+    def start_background_refresh(self):
+        """Startet proaktive Hintergrund-Aktualisierung vor Ablauf der TTL"""
+        with self._refresh_lock:
+            self._refresh_stopped = False
+            if (self._refresh_thread is not None and self._refresh_thread.is_alive()
+                    and not self._refresh_stop.is_set()):
+                return
+            previous = self._refresh_thread
+            if previous is not None and previous is not threading.current_thread():
+                # Alte Schleife zuerst beenden, nie zwei Refresh-Schleifen gleichzeitig
+                previous.join()
+            # Jede Schleife hat ihr eigenes Stop-Event, ein Neustart weckt keine alte
+            self._refresh_stop = threading.Event()
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh_loop, args=(self._refresh_stop,), daemon=True)
+            self._refresh_thread.start()
+
+    def stop_background_refresh(self, timeout: float = 10.0):
+        """Stoppt die Hintergrund-Aktualisierung (bis zum nächsten expliziten Start)"""
+        with self._refresh_lock:
+            self._refresh_stopped = True
+            self._refresh_stop.set()
+            thread = self._refresh_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._refresh_lock:
+            if self._refresh_thread is thread and (thread is None or not thread.is_alive()):
+                self._refresh_thread = None
+
+    def _background_refresh_loop(self, stop: threading.Event):
+        """Aktualisiert Preise kurz bevor sie ablaufen"""
+        while not stop.is_set():
+            wait_seconds = max(self.cache_duration - self.refresh_ahead - self._cache_age(),
+                               self._next_retry_at - time.monotonic(), 1.0)
+            if stop.wait(wait_seconds):
+                break
+            try:
+                self._refresh_prices()
+            except Exception as e:
+                print(f"[WARN] Hintergrund-Refresh fehlgeschlagen: {e}")
+
+    def _register_snapshot(self, prices: Dict):
+        """Aktualisiert Snapshot-/Coin-Versionen wenn sich Preisdaten geändert haben"""
+        changed = False
+        for coin, data in prices.items():
+            fingerprint = (data.get('usd'), data.get('chf'), data.get('change_24h'))
+            if self._coin_fingerprints.get(coin) != fingerprint:
+                self._coin_fingerprints[coin] = fingerprint
+                self.coin_versions[coin] = self.coin_versions.get(coin, 0) + 1
+                changed = True
+
+        if changed:
+            self.price_snapshot_id += 1
+
+    def add_price_listener(self, callback: Callable[[Dict], None]):
+        """Registriert Callback für frisch geladene Preise"""
+        if callback not in self.price_listeners:
+            self.price_listeners.append(callback)
+
+    def remove_price_listener(self, callback: Callable[[Dict], None]):
+        """Entfernt Preis-Callback"""
+        if callback in self.price_listeners:
+            self.price_listeners.remove(callback)
+
+    def _notify_price_listeners(self, prices: Dict):
+        """Benachrichtigt Abonnenten über neue Preise"""
+        for callback in list(self.price_listeners):
+            try:
+                callback(prices)
+            except Exception as e:
+                print(f"[WARN] Preis-Listener Fehler: {e}")
 
     def calculate_mining_profit(self, algorithm: str, hash_rate: float,
                               power_consumption: float, electricity_cost: float = 0.15) -> Dict:
@@ -172,23 +622,8 @@ class MarketIntegration:
             coin_data = market_data[coin]
 
             # Simulierte Block-Belohnung und Schwierigkeit
-            if coin == 'BTC':
-                block_reward = 6.25  # ca. 2023
-                difficulty_factor = 1.0
-                blocks_per_day = 144  # ca.
-            elif coin == 'ETH':
-                block_reward = 2.0  # ca. nach Merge
-                difficulty_factor = 0.8
-                blocks_per_day = 7200  # ca.
-            elif coin == 'RVN':
-                block_reward = 2500
-                difficulty_factor = 0.9
-                blocks_per_day = 1440
-            else:
-                # Generische Werte für andere Coins
-                block_reward = 1.0
-                difficulty_factor = 1.0
-                blocks_per_day = 1000
+            block_reward, blocks_per_day, difficulty_factor = self.coin_parameters.get(
+                coin, self.default_coin_parameters)
 
             # Profit-Kalkulation
             daily_reward = block_reward * blocks_per_day * (hash_rate / 1000000) * difficulty_factor
@@ -224,6 +659,124 @@ class MarketIntegration:
             'electricity_cost_per_kwh': electricity_cost
         }
 
+    def _coin_value_matrix(self, coins: List[str], market_data: Dict) -> np.ndarray:
+        """Je Coin: (Block-Belohnung * Blöcke/Tag, Schwierigkeit, USD, CHF); NaN ohne Preis"""
+        values = np.full((len(coins), 4), np.nan)
+        for k, coin in enumerate(coins):
+            coin_data = market_data.get(coin)
+            if not coin_data or not coin_data.get('usd'):
+                continue
+            block_reward, blocks_per_day, difficulty_factor = self.coin_parameters.get(
+                coin, self.default_coin_parameters)
+            values[k] = (block_reward * blocks_per_day, difficulty_factor, coin_data['usd'], coin_data['chf'])
+        return values
+
+    def _algorithm_coin_table(self, algorithms: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Coin-Liste und (Algorithmen x Coin-Slots)-Indextabelle, -1 = kein Coin"""
+        coins = sorted({coin for algo in algorithms for coin in self.algorithm_coins.get(algo, [])})
+        coin_index = {coin: k for k, coin in enumerate(coins)}
+        slots = max((len(self.algorithm_coins.get(algo, [])) for algo in algorithms), default=0)
+        table = np.full((len(algorithms), max(slots, 1)), -1, dtype=np.int64)
+        for a, algo in enumerate(algorithms):
+            for k, coin in enumerate(self.algorithm_coins.get(algo, [])):
+                table[a, k] = coin_index[coin]
+        return coins, table
+
+    def _best_coin_profits(self, hash_rates: np.ndarray, power_cost_usd: np.ndarray,
+                           coin_slots: np.ndarray, coin_values: np.ndarray) -> Dict[str, np.ndarray]:
+        """Bester Coin je Zelle; identisch zur Auswahl in calculate_mining_profit"""
+        valid = coin_slots >= 0
+        safe_slots = np.where(valid, coin_slots, 0)
+        values = np.where(valid[..., None], coin_values[safe_slots], np.nan)
+        blocks_reward, difficulty, usd, chf = np.moveaxis(values, -1, 0)
+
+        # Gleiche Rechenreihenfolge wie die Einzelberechnung (bitgleiche Ergebnisse)
+        revenue_usd = blocks_reward * (hash_rates[..., None] / 1000000) * difficulty * usd
+        profit_usd = revenue_usd - power_cost_usd[..., None]
+        profit_chf = profit_usd * chf / usd
+
+        # Coins ohne Preis fallen weg; bei Gleichstand gewinnt der erste Coin
+        ranked = np.where(np.isnan(profit_chf), -np.inf, profit_chf)
+        best_slot = np.argmax(ranked, axis=-1)
+
+        def take(values: np.ndarray) -> np.ndarray:
+            return np.take_along_axis(values, best_slot[..., None], axis=-1)[..., 0]
+
+        best_value = take(ranked)
+
+        profitable = best_value > 0
+        best_coin = np.where(profitable, take(safe_slots), -1)
+        return {
+            'revenue_usd': take(revenue_usd),
+            'power_cost_usd': np.broadcast_to(power_cost_usd, best_slot.shape).copy(),
+            'profit_usd': take(profit_usd),
+            'best_profit_chf': np.where(profitable, best_value, 0.0),
+            'best_coin_index': best_coin,
+        }
+
+    def calculate_fleet_profit(self, hash_rates, power_consumptions, algorithm_ids,
+                               market_data: Optional[Dict] = None, electricity_cost=0.15) -> Dict:
+        """Vektorisierte Variante von calculate_mining_profit für viele Rigs
+
+        algorithm_ids: Algorithmus-Namen oder Indizes in self.algorithm_ids.
+        Liefert pro Rig Tagesertrag, Stromkosten und Profit des besten Coins;
+        best_profit_chf entspricht exakt dem Einzelergebnis (mind. 0),
+        unbekannte Algorithmen ergeben NaN.
+        """
+        hash_rates = np.asarray(hash_rates, dtype=np.float64)
+        power_cost_usd = (np.asarray(power_consumptions, dtype=np.float64) * 24
+                          * np.asarray(electricity_cost, dtype=np.float64)) / 1000
+        power_cost_usd = np.broadcast_to(power_cost_usd, hash_rates.shape)
+
+        algorithm_ids = np.asarray(algorithm_ids)
+        if algorithm_ids.dtype.kind in 'iu':
+            algo_index = algorithm_ids.astype(np.int64)
+        else:
+            lookup = {algo: a for a, algo in enumerate(self.algorithm_ids)}
+            algo_index = np.array([lookup.get(algo, -1) for algo in algorithm_ids.tolist()], dtype=np.int64)
+        known = (algo_index >= 0) & (algo_index < len(self.algorithm_ids))
+
+        coins, table = self._algorithm_coin_table(self.algorithm_ids)
+        if market_data is None:
+            market_data = self.get_crypto_prices(coins)
+        coin_values = self._coin_value_matrix(coins, market_data)
+
+        coin_slots = np.where(known[:, None], table[np.where(known, algo_index, 0)], -1)
+        result = self._best_coin_profits(hash_rates, power_cost_usd, coin_slots, coin_values)
+        for key in ('revenue_usd', 'profit_usd', 'best_profit_chf'):
+            result[key] = np.where(known, result[key], np.nan)
+        result['coins'] = coins
+        return result
+
+    def calculate_profit_matrix(self, hash_rates, power_consumptions, algorithms: Optional[List[str]] = None,
+                                market_data: Optional[Dict] = None, electricity_cost=0.15) -> Dict:
+        """Profit-Matrix (Rigs x Algorithmen) in einem vektorisierten Aufruf
+
+        hash_rates: Vektor (N) oder Matrix (N x A) für algorithmusabhängige Hashraten.
+        """
+        algorithms = list(algorithms or self.algorithm_ids)
+        unknown = [algo for algo in algorithms if algo not in self.algorithm_coins]
+        if unknown:
+            raise ValueError(f"Algorithmen nicht unterstützt: {unknown}")
+
+        power = np.asarray(power_consumptions, dtype=np.float64)
+        hash_rates = np.asarray(hash_rates, dtype=np.float64)
+        if hash_rates.ndim == 1:
+            hash_rates = np.broadcast_to(hash_rates[:, None], (len(hash_rates), len(algorithms)))
+        power_cost_usd = np.broadcast_to(
+            (power * 24 * np.asarray(electricity_cost, dtype=np.float64) / 1000)[:, None], hash_rates.shape)
+
+        coins, table = self._algorithm_coin_table(algorithms)
+        if market_data is None:
+            market_data = self.get_crypto_prices(coins)
+        coin_values = self._coin_value_matrix(coins, market_data)
+
+        coin_slots = np.broadcast_to(table, hash_rates.shape + table.shape[-1:])
+        result = self._best_coin_profits(hash_rates, power_cost_usd, coin_slots, coin_values)
+        result['algorithms'] = algorithms
+        result['coins'] = coins
+        return result
+
     def get_optimal_algorithm(self, rig_specs: Dict) -> Dict:
         """Findet optimalen Algorithmus für einen Rig"""
 
@@ -232,18 +785,19 @@ class MarketIntegration:
         best_algo = None
         best_coin = None
 
-        for algo in algorithms:
-            profit_data = self.calculate_mining_profit(
-                algo,
-                rig_specs.get('hash_rate', 100),
-                rig_specs.get('power_consumption', 300),
-                rig_specs.get('electricity_cost', 0.15)
-            )
-
-            if 'best_profit_chf' in profit_data and profit_data['best_profit_chf'] > best_profit:
-                best_profit = profit_data['best_profit_chf']
-                best_algo = algo
-                best_coin = profit_data.get('best_coin')
+        # Alle Algorithmen in einem vektorisierten Aufruf bewerten
+        matrix = self.calculate_profit_matrix(
+            [rig_specs.get('hash_rate', 100)],
+            [rig_specs.get('power_consumption', 300)],
+            algorithms,
+            electricity_cost=rig_specs.get('electricity_cost', 0.15)
+        )
+        profits = matrix['best_profit_chf'][0]
+        best_index = int(np.argmax(profits))
+        if profits[best_index] > best_profit:
+            best_profit = float(profits[best_index])
+            best_algo = algorithms[best_index]
+            best_coin = matrix['coins'][matrix['best_coin_index'][0, best_index]]
 
         return {
             'optimal_algorithm': best_algo,
@@ -252,15 +806,55 @@ class MarketIntegration:
             'rig_specs': rig_specs
         }
 
-    def _is_cache_valid(self) -> bool:
-        """Prüft ob Cache noch gültig ist"""
-        if not os.path.exists(self.cache_file):
-            return False
+    def get_coin_volatility(self, coin: str, model: str = 'realized') -> Optional[float]:
+        """Tages-Volatilität (%) aus der Preis-Historie, None bei zu kurzer Historie"""
+        return self.price_history.get_volatility(coin, model)
+
+    def get_price_metrics(self, coin: str) -> Optional[Dict]:
+        """Volatilität, Drawdown und Fensterhoch eines Coins"""
+        return self.price_history.get_metrics(coin)
+
+    def _load_price_history(self):
+        """Lädt gespeicherte Preis-Historie (falls vorhanden)"""
+        if not self.price_history_file or not os.path.exists(self.price_history_file):
+            return
+        try:
+            self.price_history.load(self.price_history_file)
+            print(f"[STATS] Preis-Historie geladen: {len(self.price_history.series)} Coins")
+        except Exception as e:
+            print(f"[WARN] Preis-Historie konnte nicht geladen werden: {e}")
 
-        if self.last_update is None:
-            return False
+    def save_price_history(self):
+        """Speichert die Preis-Historie als npz-Datei"""
+        self._history_saved_at = time.monotonic()
+        if not self.price_history_file:
+            return
+        try:
+            self.price_history.save(self.price_history_file)
+        except Exception as e:
+            print(f"[WARN] Preis-Historie konnte nicht gespeichert werden: {e}")
 
-        return (datetime.now() - self.last_update).seconds < self.cache_duration
+    def _is_cache_valid(self) -> bool:
+        """Prüft ob der In-Memory-Cache noch gültig ist"""
+        return bool(self.market_data) and self._cache_age() < self.cache_duration
+
+    def _warm_start_from_snapshot(self):
+        """Lädt den letzten Datei-Snapshot als Startwert (Alter wird übernommen)"""
+        snapshot = self._load_cache()
+        if not snapshot:
+            return
+
+        # Neues Format: {'saved_at': epoch, 'prices': {...}}; altes Format: nur Preise
+        prices = snapshot.get('prices') if 'prices' in snapshot else snapshot
+        if not isinstance(prices, dict) or not prices:
+            return
+
+        saved_at = snapshot.get('saved_at')
+        age = max(0.0, time.time() - saved_at) if isinstance(saved_at, (int, float)) else self.cache_duration
+        self.market_data = prices
+        self._fetched_coins = set(prices.keys())
+        self._prices_fetched_at = time.monotonic() - age
+        self._register_snapshot(prices)
 
     def _load_cache(self) -> Dict:
         """Lädt Cache-Daten"""
@@ -271,10 +865,12 @@ class MarketIntegration:
             return {}
 
     def _save_cache(self, data: Dict):
-        """Speichert Daten im Cache"""
+        """Speichert Warm-Start-Snapshot (nur im Refresh-Pfad, nie im heißen Pfad)"""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({'saved_at': time.time(), 'prices': data}, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
         except Exception as e:
             print(f"Cache-Speicherung fehlgeschlagen: {e}")
 
@@ -312,6 +908,24 @@ def calculate_mining_profit(algorithm, hash_rate, power_consumption, electricity
     """Berechnet Mining-Profit"""
     return market_integration.calculate_mining_profit(algorithm, hash_rate, power_consumption, electricity_cost)
 
+def calculate_fleet_profit(hash_rates, power_consumptions, algorithm_ids, electricity_cost=0.15):
+    """Berechnet Mining-Profit für viele Rigs in einem Aufruf"""
+    return market_integration.calculate_fleet_profit(hash_rates, power_consumptions, algorithm_ids,
+                                                     electricity_cost=electricity_cost)
+
+def calculate_profit_matrix(hash_rates, power_consumptions, algorithms=None, electricity_cost=0.15):
+    """Profit-Matrix Rigs x Algorithmen"""
+    return market_integration.calculate_profit_matrix(hash_rates, power_consumptions, algorithms,
+                                                      electricity_cost=electricity_cost)
+
+def get_price_provider_stats():
+    """Latenz- und Fehlerstatistik der Preis-Provider"""
+    return market_integration.get_provider_stats()
+
+def get_price_metrics(coin):
+    """Volatilität und Drawdown eines Coins aus der Preis-Historie"""
+    return market_integration.get_price_metrics(coin)
+
 def get_optimal_algorithm(rig_specs):
     """Findet optimalen Algorithmus"""
     return market_integration.get_optimal_algorithm(rig_specs)
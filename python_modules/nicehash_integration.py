@@ -3,23 +3,117 @@
 CASH MONEY COLORS ORIGINAL (R) - NICEHASH MINING POOL INTEGRATION
 Echte NiceHash API Integration für profitable Mining-Operationen
 """
-import requests
 import json
 import hmac
 import hashlib
 import time
 import base64
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable
 import os
+import numpy as np
+import threading
+from collections import OrderedDict
 from python_modules.config_manager import get_config
+from python_modules.single_flight import single_flight
+from python_modules.http_client import http_client
+from python_modules.rate_limiter import RequestScheduler
+
+
+# Rate-Limits je Endpoint-Klasse (Requests/s, Burst) und Priorität (0 = höchste)
+DEFAULT_RATE_LIMITS = {
+    "control": {"Rate": 1.0, "Burst": 3, "Priority": 0},
+    "account": {"Rate": 2.0, "Burst": 5, "Priority": 1},
+    "stats": {"Rate": 2.0, "Burst": 5, "Priority": 2},
+}
+DEFAULT_GLOBAL_RATE_LIMIT = {"Rate": 4.0, "Burst": 8}
+
+# TTL je Endpoint-Präfix (Sekunden); längster passender Präfix gewinnt
+DEFAULT_CACHE_TTLS = {
+    "/main/api/v2/public/stats/global/current": 60,
+    "/main/api/v2/mining/rigs2": 300,
+}
+
+
+class ResponseCache:
+    """Begrenzter LRU-Cache mit TTL pro Endpoint (nur für GET-Antworten)"""
+
+    def __init__(self, max_entries: int = 128, default_ttl: float = 60,
+                 endpoint_ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max(1, int(max_entries))
+        self.default_ttl = default_ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL des längsten passenden Endpoint-Präfixes"""
+        path = endpoint.split("?", 1)[0]
+        matches = [prefix for prefix in self.endpoint_ttls if path.startswith(prefix)]
+        return self.endpoint_ttls[max(matches, key=len)] if matches else self.default_ttl
+
+    def get_stale(self, endpoint: str) -> Optional[Any]:
+        """Letzte Antwort unabhängig von der TTL (Fallback bei Upstream-Fehlern)"""
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            return entry[1] if entry else None
+
+    def get(self, endpoint: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                # Abgelaufene Einträge bleiben als Stale-Fallback bis zur LRU-Verdrängung
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(endpoint)
+            self.stats["hits"] += 1
+            return value
+
+    def set(self, endpoint: str, value: Any):
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[endpoint] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(endpoint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Entfernt alle Einträge (oder alle mit passendem Präfix)"""
+        with self._lock:
+            keys = [key for key in self._entries if prefix is None or key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            self.stats["invalidations"] += len(keys)
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
 
 
 class NiceHashIntegration:
     """Echte NiceHash API Integration für Mining-Pools"""
 
     def __init__(self):
-        self.base_url = "https://api2.nicehash.com"
+        self.base_url = get_config("Pools.NiceHash.BaseUrl", "https://api2.nicehash.com")
         self.api_key = get_config("Pools.NiceHash.ApiKey", "")
         self.api_secret = get_config("Pools.NiceHash.ApiSecret", "")
         self.org_id = get_config("Pools.NiceHash.OrganizationId", "")
@@ -38,9 +132,26 @@ class NiceHashIntegration:
 
         self.reverse_mapping = {v: k for k, v in self.algorithm_mapping.items()}
 
-        self.cache_duration = 300  # 5 Minuten Cache
         self.last_api_call = None
-        self.api_cache = {}
+        self.response_cache = ResponseCache(
+            max_entries=get_config("Pools.NiceHash.CacheMaxEntries", 128),
+            default_ttl=get_config("Pools.NiceHash.CacheDefaultTtlSeconds", 60),
+            endpoint_ttls={**DEFAULT_CACHE_TTLS, **get_config("Pools.NiceHash.CacheTtlSeconds", {})},
+        )
+        rate_limits = {**DEFAULT_RATE_LIMITS, **get_config("Pools.NiceHash.RateLimits", {})}
+        self.request_scheduler = RequestScheduler(
+            rate_limits,
+            global_limit=get_config("Pools.NiceHash.GlobalRateLimit", DEFAULT_GLOBAL_RATE_LIMIT),
+            priorities={name: limit.get("Priority", 100) for name, limit in rate_limits.items()},
+            default_timeout=get_config("Pools.NiceHash.MaxQueueWaitSeconds", 30),
+        )
+        self.stats_listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._last_notified_stats = None
+
+        # Versionen für abhängige Caches (steigen nur bei geänderten Werten)
+        self.pool_snapshot_id = 0
+        self.algo_versions: Dict[str, int] = {}
+        self._algo_fingerprints: Dict[str, tuple] = {}
 
         if self.api_key and self.api_secret:
             print("🏭 NICEHASH INTEGRATION INITIALIZED - Echte API verfügbar")
@@ -85,40 +196,67 @@ class NiceHashIntegration:
 
         url = f"{self.base_url}{endpoint}"
 
-        # Cache prüfen
-        cache_key = f"{method}:{endpoint}"
-        if cache_key in self.api_cache:
-            cache_time, cache_data = self.api_cache[cache_key]
-            if time.time() - cache_time < self.cache_duration:
-                return cache_data
+        if method != "GET":
+            return self._execute_request(url, endpoint, method, data)
+
+        # Cache prüfen (nur GET)
+        cached = self.response_cache.get(endpoint)
+        if cached is not None:
+            return cached
+
+        # Gleichzeitige GETs auf denselben Endpoint teilen sich einen Request
+        return single_flight.do(
+            f"nicehash:GET:{endpoint}", self._execute_request, url, endpoint, method, data
+        )
+
+    def _endpoint_class(self, endpoint: str, method: str) -> str:
+        """Ordnet Requests einer Rate-Limit-Klasse zu"""
+        if method != "GET":
+            return "control"
+        if "/public/" in endpoint:
+            return "stats"
+        return "account"
+
+    def _execute_request(
+        self, url: str, endpoint: str, method: str, data: Dict = None
+    ) -> Optional[Dict]:
+        """Sendet den HTTP-Request über den Scheduler und aktualisiert den Cache"""
+        label = f"nicehash {method} {endpoint.split('?', 1)[0]}"
+        # 429 behandelt der Scheduler (Retry-After), übrige Fehler der HTTP-Client
+        retry_codes = http_client.retry_status_codes - {429}
 
-        try:
+        def send():
+            # Signatur erst bei Vergabe des Slots erzeugen (Zeitstempel muss aktuell sein)
             headers = self._get_auth_headers(method, endpoint)
+            return http_client.request(method, url, json=data if method == "POST" else None,
+                                       headers=headers, endpoint=label,
+                                       retry_status_codes=retry_codes)
 
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == "POST":
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=10)
-
+        try:
+            response = self.request_scheduler.execute(self._endpoint_class(endpoint, method), send)
             response.raise_for_status()
             result = response.json()
 
-            # Cache aktualisieren
-            self.api_cache[cache_key] = (time.time(), result)
+            # Cache aktualisieren (nur GET)
+            if method == "GET":
+                self.response_cache.set(endpoint, result)
             self.last_api_call = datetime.now()
 
             return result
 
         except Exception as e:
             print(f"❌ NiceHash API Fehler: {e}")
+            # Lieber letzte echte Daten als Demo-Daten an den Algorithm-Switcher geben
+            stale = self.response_cache.get_stale(endpoint) if method == "GET" else None
+            if stale is not None:
+                print(f"⚠️ Verwende zwischengespeicherte Daten für {endpoint}")
+                return stale
             return self._get_demo_data(endpoint)
 
     def get_pool_stats(self, algorithm: str = None) -> Dict[str, Any]:
-        """Holt aktuelle Pool-Statistiken"""
-        if algorithm and algorithm in self.reverse_mapping:
-            algorithm = self.reverse_mapping[algorithm]
+        """Holt aktuelle Pool-Statistiken (Filter über lokalen oder NiceHash-Namen)"""
+        if algorithm and algorithm in self.algorithm_mapping:
+            algorithm = self.algorithm_mapping[algorithm]
 
         endpoint = "/main/api/v2/public/stats/global/current"
 
@@ -148,8 +286,52 @@ class NiceHashIntegration:
                     ),
                 }
 
+        # Abonnenten nur bei geänderten Pool-Werten benachrichtigen: Cache-Hits liefern
+        # dasselbe Objekt, Demo-Daten/Neuabrufe neue Objekte mit ggf. gleichen Werten
+        if not algorithm and data is not self._last_notified_stats:
+            self._last_notified_stats = data
+            if self._register_snapshot(stats):
+                self._notify_stats_listeners(stats)
+
         return stats
 
+    def _register_snapshot(self, stats: Dict[str, Any]) -> bool:
+        """Aktualisiert Snapshot-/Algorithmus-Versionen; True wenn sich Pool-Daten geändert haben"""
+        changed = False
+        for algo, algo_stats in stats.items():
+            fingerprint = (
+                algo_stats.get("paying"),
+                algo_stats.get("difficulty"),
+                algo_stats.get("speed"),
+                algo_stats.get("market_factor"),
+            )
+            if self._algo_fingerprints.get(algo) != fingerprint:
+                self._algo_fingerprints[algo] = fingerprint
+                self.algo_versions[algo] = self.algo_versions.get(algo, 0) + 1
+                changed = True
+
+        if changed:
+            self.pool_snapshot_id += 1
+        return changed
+
+    def add_stats_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Registriert Callback für neue Pool-Statistiken"""
+        if callback not in self.stats_listeners:
+            self.stats_listeners.append(callback)
+
+    def remove_stats_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """Entfernt Pool-Statistik-Callback"""
+        if callback in self.stats_listeners:
+            self.stats_listeners.remove(callback)
+
+    def _notify_stats_listeners(self, stats: Dict[str, Any]):
+        """Benachrichtigt Abonnenten über neue Pool-Statistiken"""
+        for callback in list(self.stats_listeners):
+            try:
+                callback(stats)
+            except Exception as e:
+                print(f"⚠️ Pool-Stats-Listener Fehler: {e}")
+
     def get_mining_rigs(self) -> List[Dict[str, Any]]:
         """Holt Mining-Rigs von NiceHash"""
         endpoint = "/main/api/v2/mining/rigs2"
@@ -188,10 +370,16 @@ class NiceHashIntegration:
 
         result = self._api_request(endpoint, "POST", data)
         if result:
+            # Rig-Listen sind jetzt veraltet
+            self.invalidate_cache("/main/api/v2/mining/")
             print(f"✅ Rig erstellt: {rig_name}")
             return True
         return False
 
+    def invalidate_cache(self, prefix: Optional[str] = None) -> int:
+        """Verwirft gecachte Antworten (alle oder mit Endpoint-Präfix)"""
+        return self.response_cache.invalidate(prefix)
+
     def calculate_profit_comparison(self, local_rig: Dict[str, Any]) -> Dict[str, Any]:
         """Vergleicht lokale Rig-Performance mit NiceHash"""
         rig_algorithm = local_rig.get("algorithm", "")
@@ -237,39 +425,78 @@ class NiceHashIntegration:
 
         return comparison
 
+    def calculate_profit_comparisons_batch(
+        self, local_rigs: List[Dict[str, Any]], pool_stats: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Vergleicht alle Rigs mit NiceHash in einem vektorisierten Durchlauf
+
+        Holt die Pool-Statistiken höchstens einmal. Liefert Arrays in
+        Rig-Reihenfolge; die Werte entsprechen calculate_profit_comparison,
+        Rigs ohne Pool-Daten sind in has_pool_data mit False markiert.
+        """
+        if pool_stats is None:
+            pool_stats = self.get_pool_stats()
+
+        algorithms = [rig.get("algorithm", "") for rig in local_rigs]
+        has_pool_data = np.array([algo in pool_stats for algo in algorithms], dtype=bool)
+        paying_usd = np.array(
+            [pool_stats.get(algo, {}).get("paying_usd", 0) for algo in algorithms], dtype=np.float64
+        )
+        hash_rates = np.array([rig.get("hash_rate", 0) for rig in local_rigs], dtype=np.float64)
+        efficiencies = np.array([rig.get("efficiency", 0) for rig in local_rigs], dtype=np.float64)
+        power = np.array([rig.get("power_consumption", 300) for rig in local_rigs], dtype=np.float64)
+
+        # Gleiche Rechenreihenfolge wie calculate_profit_comparison
+        electricity_cost = get_config("Mining.ElectricityCostPerKwh", 0.15)
+        daily_cost = (power * 24) / 1000 * electricity_cost
+        estimated_nh_daily = paying_usd * hash_rates * efficiencies * 24
+        nh_net_profit = estimated_nh_daily - daily_cost
+
+        return {
+            "rig_ids": [rig.get("id", "") for rig in local_rigs],
+            "algorithms": algorithms,
+            "has_pool_data": has_pool_data,
+            "nicehash_paying_rate": paying_usd,
+            "estimated_nh_daily_profit": estimated_nh_daily,
+            "local_daily_cost": daily_cost,
+            "nh_net_profit": nh_net_profit,
+            "should_use_nicehash": nh_net_profit > 0,
+            "pool_stats": pool_stats,
+        }
+
     def optimize_mining_strategy(
         self, local_rigs: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Optimiert Mining-Strategie basierend auf NiceHash Daten"""
-        # Hole alle Pool-Stats
+        """Optimiert Mining-Strategie basierend auf NiceHash Daten (ein API-Abruf)"""
+        # Hole alle Pool-Stats einmal für die gesamte Flotte
         all_stats = self.get_pool_stats()
-
-        best_strategies = []
-        total_local_profit = 0
-        total_nh_profit = 0
-
-        for rig in local_rigs:
-            comparison = self.calculate_profit_comparison(rig)
-
-            if "error" not in comparison:
-                local_daily = rig.get("profit_per_day", 0)
-                nh_daily = comparison.get("nh_net_profit", 0)
-
-                total_local_profit += local_daily
-                total_nh_profit += nh_daily
-
-                best_strategies.append(
-                    {
-                        "rig_id": rig["id"],
-                        "current_local_profit": local_daily,
-                        "nicehash_profit": nh_daily,
-                        "recommendation": (
-                            "nicehash" if comparison["should_use_nicehash"] else "local"
-                        ),
-                        "profit_gain": nh_daily - local_daily,
-                        "algorithm": rig.get("algorithm", ""),
-                    }
-                )
+        if not all_stats:
+            local_rigs = []
+
+        batch = self.calculate_profit_comparisons_batch(local_rigs, all_stats)
+        valid = batch["has_pool_data"]
+        local_daily = np.array(
+            [rig.get("profit_per_day", 0) for rig in local_rigs], dtype=np.float64
+        )
+        nh_daily = batch["nh_net_profit"]
+        profit_gain = nh_daily - local_daily
+
+        best_strategies = [
+            {
+                "rig_id": batch["rig_ids"][i],
+                "current_local_profit": local_rigs[i].get("profit_per_day", 0),
+                "nicehash_profit": float(nh_daily[i]),
+                "recommendation": (
+                    "nicehash" if batch["should_use_nicehash"][i] else "local"
+                ),
+                "profit_gain": float(profit_gain[i]),
+                "algorithm": batch["algorithms"][i],
+            }
+            for i in np.flatnonzero(valid)
+        ]
+
+        total_local_profit = float(local_daily[valid].sum())
+        total_nh_profit = float(nh_daily[valid].sum())
 
         return {
             "total_local_profit": total_local_profit,
@@ -329,7 +556,9 @@ class NiceHashIntegration:
             "last_api_call": (
                 self.last_api_call.isoformat() if self.last_api_call else None
             ),
-            "cached_requests": len(self.api_cache),
+            "cached_requests": len(self.response_cache),
+            "response_cache": self.response_cache.get_metrics(),
+            "rate_limiter": self.request_scheduler.get_metrics(),
             "supported_algorithms": len(self.algorithm_mapping),
             "organization_id": self.org_id if self.org_id else None,
         }
@@ -355,6 +584,11 @@ def calculate_profit_comparison(local_rig):
     return nicehash_integration.calculate_profit_comparison(local_rig)
 
 
+def calculate_profit_comparisons_batch(local_rigs, pool_stats=None):
+    """Vergleicht Profitabilität aller Rigs in einem Durchlauf"""
+    return nicehash_integration.calculate_profit_comparisons_batch(local_rigs, pool_stats)
+
+
 def optimize_mining_strategy(local_rigs):
     """Optimiert Mining-Strategie"""
     return nicehash_integration.optimize_mining_strategy(local_rigs)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - PRICE HISTORY
+Kompakte Preis-Zeitreihen pro Coin (1-Minuten-Buckets, Ringpuffer)
+Realisierte Volatilität, EWMA-Volatilität und Drawdown inkrementell in O(1)
+"""
+import math
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+MINUTES_PER_DAY = 1440
+
+
+class CoinPriceSeries:
+    """Ringpuffer für einen Coin mit laufenden Risiko-Kennzahlen
+
+    Jede Stichprobe ist ein 1-Minuten-Bucket (Schlusskurs). Renditen laufen
+    zwischen aufeinanderfolgenden Stichproben; Lücken werden über die
+    Zeitdifferenz normiert, damit die Volatilität unabhängig vom
+    Abfrage-Intervall pro Tag ausgewiesen wird.
+    """
+
+    def __init__(self, capacity: int, window_minutes: int, ewma_halflife_minutes: float):
+        self.capacity = capacity
+        self.window_minutes = min(window_minutes, capacity - 1)
+        self.ewma_tau = ewma_halflife_minutes / math.log(2)
+
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.minutes = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+
+        # Renditen [window_start, count) liegen im Volatilitätsfenster
+        self.window_start = 1
+        self.sum_sq_returns = 0.0
+        self.sum_dt = 0
+        self.ewma_var: Optional[float] = None
+        self._ewma_before_last: Optional[float] = None
+        # Absolute Indizes abgeschlossener Buckets mit monoton fallenden Preisen; der
+        # offene letzte Bucket bleibt draußen, damit Überschreiben O(1) bleibt
+        self._window_max = deque()
+        self._updates_since_resync = 0
+
+    @property
+    def last_minute(self) -> Optional[int]:
+        return int(self.minutes[(self.count - 1) % self.capacity]) if self.count else None
+
+    @property
+    def last_price(self) -> Optional[float]:
+        return float(self.prices[(self.count - 1) % self.capacity]) if self.count else None
+
+    def _return(self, i: int) -> Tuple[float, int]:
+        """Log-Rendite und Zeitabstand (Minuten) von Stichprobe i-1 zu i"""
+        cap = self.capacity
+        r = math.log(self.prices[i % cap] / self.prices[(i - 1) % cap])
+        return r, int(self.minutes[i % cap] - self.minutes[(i - 1) % cap])
+
+    def record(self, minute: int, price: float):
+        """Fügt einen Preis ein (gleiche Minute überschreibt den Schlusskurs)"""
+        if price <= 0 or not math.isfinite(price):
+            return
+        last_minute = self.last_minute
+        if last_minute is not None and minute < last_minute:
+            return
+        if last_minute is not None and minute == last_minute:
+            self._update_last(price)
+            return
+
+        i = self.count
+        slot = i % self.capacity
+        self.prices[slot] = price
+        self.minutes[slot] = minute
+        self.count += 1
+
+        if i >= 1:
+            r, dt = self._return(i)
+            self.sum_sq_returns += r * r
+            self.sum_dt += dt
+            self._ewma_before_last = self.ewma_var
+            self.ewma_var = self._ewma_step(self.ewma_var, r, dt)
+
+        if i >= 1:
+            self._push_window_max(i - 1)
+
+        self._evict(minute)
+
+        self._updates_since_resync += 1
+        if self._updates_since_resync >= self.capacity:
+            self._resync()
+
+    def _update_last(self, price: float):
+        """Überschreibt den Schlusskurs des letzten Buckets"""
+        i = self.count - 1
+        slot = i % self.capacity
+
+        if i >= self.window_start:
+            r, dt = self._return(i)
+            self.sum_sq_returns -= r * r
+            self.sum_dt -= dt
+        self.prices[slot] = price
+        if i >= self.window_start:
+            r, dt = self._return(i)
+            self.sum_sq_returns += r * r
+            self.sum_dt += dt
+        if i >= 1:
+            r, dt = self._return(i)
+            self.ewma_var = self._ewma_step(self._ewma_before_last, r, dt)
+
+    def _ewma_step(self, var: Optional[float], r: float, dt: int) -> float:
+        """EWMA der Varianzrate (pro Minute), zeitgewichtet über dt"""
+        rate = r * r / max(dt, 1)
+        if var is None:
+            return rate
+        decay = math.exp(-dt / self.ewma_tau)
+        return decay * var + (1.0 - decay) * rate
+
+    def _evict(self, now_minute: int):
+        """Entfernt Renditen und Hochs, die aus dem Fenster fallen"""
+        cutoff = now_minute - self.window_minutes
+        cap = self.capacity
+        while self.window_start < self.count and self.minutes[(self.window_start - 1) % cap] < cutoff:
+            r, dt = self._return(self.window_start)
+            self.sum_sq_returns -= r * r
+            self.sum_dt -= dt
+            self.window_start += 1
+
+        oldest = self.window_start - 1
+        while self._window_max and self._window_max[0] < oldest:
+            self._window_max.popleft()
+
+    def _window_indices(self) -> np.ndarray:
+        """Ring-Slots der Preise im Fenster (chronologisch)"""
+        start = max(self.window_start - 1, 0)
+        return np.arange(start, self.count) % self.capacity
+
+    def _push_window_max(self, i: int):
+        """Nimmt den abgeschlossenen Bucket i in die Fenster-Maximum-Deque auf"""
+        price = self.prices[i % self.capacity]
+        while self._window_max and self.prices[self._window_max[-1] % self.capacity] <= price:
+            self._window_max.pop()
+        self._window_max.append(i)
+
+    def _rebuild_window_max(self):
+        self._window_max.clear()
+        for i in range(max(self.window_start - 1, 0), self.count - 1):
+            self._push_window_max(i)
+
+    def _resync(self):
+        """Berechnet laufende Summen exakt neu (begrenzt Rundungsdrift)"""
+        self._updates_since_resync = 0
+        slots = self._window_indices()
+        if len(slots) < 2:
+            self.sum_sq_returns, self.sum_dt = 0.0, 0
+            return
+        returns = np.diff(np.log(self.prices[slots]))
+        self.sum_sq_returns = float(np.dot(returns, returns))
+        self.sum_dt = int(self.minutes[slots[-1]] - self.minutes[slots[0]])
+
+    def load(self, minutes: np.ndarray, prices: np.ndarray):
+        """Lädt eine chronologische Historie in einem Schritt (vektorisiert)"""
+        minutes = np.asarray(minutes, dtype=np.int64)[-self.capacity:]
+        prices = np.asarray(prices, dtype=np.float64)[-self.capacity:]
+        n = len(prices)
+        self.count = n
+        self.prices[:n] = prices
+        self.minutes[:n] = minutes
+        self.ewma_var = self._ewma_before_last = None
+        if n == 0:
+            self.window_start = 1
+            self.sum_sq_returns, self.sum_dt = 0.0, 0
+            self._window_max.clear()
+            return
+
+        cutoff = minutes[-1] - self.window_minutes
+        self.window_start = max(int(np.searchsorted(minutes, cutoff, side='left')) + 1, 1)
+        self._resync()
+        self._rebuild_window_max()
+
+        # EWMA nur über die letzten ~20 Halbwertszeiten (ältere Gewichte vernachlässigbar)
+        start = max(int(np.searchsorted(minutes, minutes[-1] - 20 * self.ewma_tau, side='left')), 1)
+        for i in range(start, n):
+            r, dt = self._return(i)
+            self._ewma_before_last = self.ewma_var
+            self.ewma_var = self._ewma_step(self.ewma_var, r, dt)
+
+    def series(self, minutes: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Chronologische Kopie (Minuten seit Epoch, Preise), optional nur die letzten N Minuten"""
+        n = min(self.count, self.capacity)
+        slots = np.arange(self.count - n, self.count) % self.capacity
+        times, values = self.minutes[slots], self.prices[slots]
+        if minutes is not None and n:
+            start = int(np.searchsorted(times, times[-1] - minutes, side='left'))
+            times, values = times[start:], values[start:]
+        return times.copy(), values.copy()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Aktuelle Kennzahlen (Volatilität in % pro Tag, Drawdown in %)"""
+        realized = None
+        if self.sum_dt > 0:
+            realized = math.sqrt(max(self.sum_sq_returns, 0.0) / self.sum_dt * MINUTES_PER_DAY) * 100
+        ewma = math.sqrt(self.ewma_var * MINUTES_PER_DAY) * 100 if self.ewma_var is not None else None
+
+        last_price = self.last_price
+        window_high = last_price
+        if self._window_max:
+            window_high = max(float(self.prices[self._window_max[0] % self.capacity]), last_price)
+        drawdown = (last_price / window_high - 1.0) * 100 if window_high else None
+
+        return {
+            'samples': min(self.count, self.capacity),
+            'window_minutes_covered': self.sum_dt,
+            'realized_volatility': realized,
+            'ewma_volatility': ewma,
+            'drawdown_percent': drawdown,
+            'window_high': window_high,
+            'last_price': last_price,
+        }
+
+
+class PriceHistory:
+    """Preis-Historie aller Coins mit inkrementellen Risiko-Kennzahlen"""
+
+    def __init__(self, retention_days: float = 90, window_hours: float = 24,
+                 ewma_halflife_hours: float = 6, min_history_minutes: int = 60):
+        self.capacity = int(retention_days * MINUTES_PER_DAY)
+        self.window_minutes = int(window_hours * 60)
+        self.ewma_halflife_minutes = ewma_halflife_hours * 60
+        self.min_history_minutes = min_history_minutes
+        self.series: Dict[str, CoinPriceSeries] = {}
+
+    def _get_series(self, coin: str) -> CoinPriceSeries:
+        series = self.series.get(coin)
+        if series is None:
+            series = CoinPriceSeries(self.capacity, self.window_minutes, self.ewma_halflife_minutes)
+            self.series[coin] = series
+        return series
+
+    def record(self, coin: str, price: float, timestamp: Optional[float] = None):
+        """Erfasst einen Preis (Unix-Zeit, Standard: jetzt) im 1-Minuten-Bucket"""
+        minute = int((time.time() if timestamp is None else timestamp) // 60)
+        self._get_series(coin).record(minute, float(price))
+
+    def record_snapshot(self, prices: Dict[str, Dict], timestamp: Optional[float] = None):
+        """Erfasst die USD-Preise eines Markt-Snapshots"""
+        for coin, data in prices.items():
+            price = data.get('usd') if isinstance(data, dict) else None
+            if price:
+                self.record(coin, price, timestamp)
+
+    def get_metrics(self, coin: str) -> Optional[Dict[str, Any]]:
+        """Kennzahlen eines Coins oder None ohne Historie"""
+        series = self.series.get(coin)
+        return series.metrics() if series and series.count else None
+
+    def get_volatility(self, coin: str, model: str = 'realized') -> Optional[float]:
+        """Tages-Volatilität in %; None solange die Historie zu kurz ist"""
+        series = self.series.get(coin)
+        if not series or series.sum_dt < self.min_history_minutes:
+            return None
+        metrics = series.metrics()
+        return metrics['ewma_volatility'] if model == 'ewma' else metrics['realized_volatility']
+
+    def get_series(self, coin: str, minutes: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Zeitreihe eines Coins (Minuten seit Epoch, USD-Preise)"""
+        series = self.series.get(coin)
+        if not series:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+        return series.series(minutes)
+
+    def save(self, path: str):
+        """Speichert alle Zeitreihen als komprimierte npz-Datei"""
+        arrays = {}
+        for coin, series in self.series.items():
+            arrays[f"{coin}__minutes"], arrays[f"{coin}__prices"] = series.series()
+        np.savez_compressed(path, **arrays)
+
+    def load(self, path: str):
+        """Lädt Zeitreihen aus einer npz-Datei"""
+        with np.load(path) as data:
+            coins = {key.rsplit('__', 1)[0] for key in data.files}
+            for coin in coins:
+                self._get_series(coin).load(data[f"{coin}__minutes"], data[f"{coin}__prices"])
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - QUANTUM BENCHMARK
+Reproduzierbarer Benchmark-Harness für den Quantum-Optimizer
+Misst Durchsatz und Latenz-Perzentile auf synthetischen Flotten
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Sequence
+
+import numpy as np
+
+try:
+    from python_modules.quantum_optimizer import QuantumOptimizer
+except ModuleNotFoundError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from python_modules.quantum_optimizer import QuantumOptimizer
+
+
+DEFAULT_FLEET_SIZES = (10, 1000, 10000)
+PERCENTILES = (50, 90, 95, 99)
+
+
+def generate_synthetic_fleet(size: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Erzeugt eine reproduzierbare synthetische Rig-Flotte"""
+    rng = np.random.default_rng(seed)
+
+    hashrates = rng.uniform(60, 180, size)
+    powers = rng.uniform(220, 450, size)
+    temperatures = rng.normal(68, 6, size)
+    efficiencies = rng.uniform(0.6, 0.98, size)
+    stabilities = rng.uniform(0.75, 0.99, size)
+
+    return [
+        {
+            'id': f"bench_rig_{i:05d}",
+            'hashrate': float(hashrates[i]),
+            'power_consumption': float(powers[i]),
+            'temperature': float(temperatures[i]),
+            'efficiency': float(efficiencies[i]),
+            'stability': float(stabilities[i]),
+        }
+        for i in range(size)
+    ]
+
+
+def _percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """Berechnet Latenz-Perzentile (p50/p90/p95/p99)"""
+    if not samples:
+        return {f"p{p}": 0.0 for p in PERCENTILES}
+    values = np.percentile(np.asarray(samples, dtype=np.float64), PERCENTILES)
+    return {f"p{p}": float(v) for p, v in zip(PERCENTILES, values)}
+
+
+def state_checksum(optimizer: QuantumOptimizer, fleet: List[Dict[str, Any]]) -> float:
+    """Prüfsumme über generierte Quantenzustände (Reproduzierbarkeits-Check)"""
+    total = 0.0
+    for rig in fleet:
+        state = optimizer.generate_quantum_state(rig)
+        total += state.stability_factor + state.optimization_potential
+    return round(total, 9)
+
+
+def result_checksum(results: List[Any]) -> float:
+    """Prüfsumme über die Optimierungsergebnisse (deterministischer Pfad)"""
+    total = 0.0
+    for result in results:
+        total += result.quantum_level + result.efficiency_gain + result.stability_score
+    return round(total, 9)
+
+
+class QuantumBenchmark:
+    """Benchmark-Harness für optimize_all_rigs auf synthetischen Flotten"""
+
+    def __init__(self, seed: int = 42, repetitions: int = 5, warmup: int = 1,
+                 include_apply: bool = False):
+        self.seed = seed
+        self.repetitions = max(1, repetitions)
+        self.warmup = max(0, warmup)
+        self.include_apply = include_apply
+
+    def _create_optimizer(self) -> QuantumOptimizer:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            optimizer = QuantumOptimizer(seed=self.seed)
+        optimizer.config = dict(optimizer.config)
+        optimizer.config['AutoApplyOptimizations'] = self.include_apply
+        return optimizer
+
+    def run_fleet(self, size: int) -> Dict[str, Any]:
+        """Benchmarkt eine Flottengröße"""
+        fleet = generate_synthetic_fleet(size, self.seed)
+        optimizer = self._create_optimizer()
+
+        # Latenz pro Rig messen (Wrapper um den Kern-Algorithmus)
+        rig_latencies_us: List[float] = []
+        core_algorithm = optimizer.quantum_optimization_algorithm
+
+        def timed_algorithm(rig_id, rig):
+            start = time.perf_counter()
+            try:
+                return core_algorithm(rig_id, rig)
+            finally:
+                rig_latencies_us.append((time.perf_counter() - start) * 1e6)
+
+        optimizer.quantum_optimization_algorithm = timed_algorithm
+
+        run_latencies_ms: List[float] = []
+        results: List[Any] = []
+        try:
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                for _ in range(self.warmup):
+                    optimizer.optimize_all_rigs(fleet)
+                rig_latencies_us.clear()
+
+                for _ in range(self.repetitions):
+                    start = time.perf_counter()
+                    results = optimizer.optimize_all_rigs(fleet)
+                    run_latencies_ms.append((time.perf_counter() - start) * 1000)
+
+                optimizer.set_seed(self.seed)
+                checksum = state_checksum(optimizer, fleet)
+        finally:
+            optimizer.executor.shutdown(wait=True)
+
+        median_run_s = float(np.median(run_latencies_ms)) / 1000
+        return {
+            'fleet_size': size,
+            'optimized_rigs': len(results),
+            'repetitions': self.repetitions,
+            'throughput_rigs_per_sec': size / median_run_s if median_run_s > 0 else 0.0,
+            'run_latency_ms': _percentiles(run_latencies_ms),
+            'rig_latency_us': _percentiles(rig_latencies_us),
+            'state_checksum': checksum,
+            'result_checksum': result_checksum(results),
+        }
+
+    def run(self, fleet_sizes: Sequence[int] = DEFAULT_FLEET_SIZES) -> Dict[str, Any]:
+        """Führt den Benchmark für alle Flottengrößen aus"""
+        fleets = {}
+        for size in fleet_sizes:
+            print(f"Benchmark Flotte {size} Rigs...")
+            result = self.run_fleet(size)
+            fleets[str(size)] = result
+            print(f"   {result['throughput_rigs_per_sec']:.0f} Rigs/s | "
+                  f"p50 {result['run_latency_ms']['p50']:.1f} ms | "
+                  f"p99 {result['run_latency_ms']['p99']:.1f} ms")
+
+        return {
+            'seed': self.seed,
+            'repetitions': self.repetitions,
+            'include_apply': self.include_apply,
+            'timestamp': datetime.now().isoformat(),
+            'fleets': fleets,
+        }
+
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any],
+                          max_regression_percent: float = 20.0) -> List[str]:
+    """Vergleicht Ergebnisse mit einer Baseline und liefert Regressionen"""
+    regressions = []
+
+    for size, current in results.get('fleets', {}).items():
+        reference = baseline.get('fleets', {}).get(size)
+        if not reference:
+            continue
+
+        if (results.get('seed') == baseline.get('seed')
+                and current['state_checksum'] != reference['state_checksum']):
+            regressions.append(
+                f"Flotte {size}: Quantenzustände nicht reproduzierbar "
+                f"({current['state_checksum']} != {reference['state_checksum']})"
+            )
+
+        if ('result_checksum' in reference
+                and current['result_checksum'] != reference['result_checksum']):
+            regressions.append(
+                f"Flotte {size}: Optimierungsergebnisse abweichend "
+                f"({current['result_checksum']} != {reference['result_checksum']})"
+            )
+
+        ref_throughput = reference.get('throughput_rigs_per_sec', 0)
+        if ref_throughput > 0:
+            drop = (ref_throughput - current['throughput_rigs_per_sec']) / ref_throughput * 100
+            if drop > max_regression_percent:
+                regressions.append(f"Flotte {size}: Durchsatz -{drop:.1f}%")
+
+        ref_p99 = reference.get('run_latency_ms', {}).get('p99', 0)
+        if ref_p99 > 0:
+            growth = (current['run_latency_ms']['p99'] - ref_p99) / ref_p99 * 100
+            if growth > max_regression_percent:
+                regressions.append(f"Flotte {size}: p99-Latenz +{growth:.1f}%")
+
+    return regressions
+
+
+def run_quantum_benchmark(fleet_sizes: Sequence[int] = DEFAULT_FLEET_SIZES, seed: int = 42,
+                          repetitions: int = 5) -> Dict[str, Any]:
+    """Führt den Quantum-Benchmark mit Standardparametern aus"""
+    return QuantumBenchmark(seed=seed, repetitions=repetitions).run(fleet_sizes)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Quantum-Optimizer Benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_FLEET_SIZES))
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--include-apply', action='store_true',
+                        help="apply_optimizations (Logging) mitmessen")
+    parser.add_argument('--output', help="Ergebnisse als JSON speichern")
+    parser.add_argument('--baseline', help="Baseline-JSON für Regressionsvergleich")
+    parser.add_argument('--tolerance', type=float, default=20.0,
+                        help="Erlaubte Regression in Prozent")
+    args = parser.parse_args(argv)
+
+    print("CASH MONEY COLORS ORIGINAL (R) - QUANTUM BENCHMARK")
+    print("=" * 60)
+
+    benchmark = QuantumBenchmark(seed=args.seed, repetitions=args.repetitions,
+                                 warmup=args.warmup, include_apply=args.include_apply)
+    results = benchmark.run(args.sizes)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Ergebnisse gespeichert: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print("REGRESSIONEN gefunden:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            return 1
+        print("Keine Regressionen gegenüber Baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
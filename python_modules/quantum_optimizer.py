@@ -6,11 +6,12 @@ Implementiert fortschrittliche Algorithmen für optimale Performance
 """
 
 import time
-import random
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from datetime import datetime
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 
 try:
     from python_modules.config_manager import get_config, get_rigs_config
@@ -51,7 +52,7 @@ class OptimizationResult:
 class QuantumOptimizer:
     """Maximale Quantum-Stufe-Optimierer für autonome Systeme"""
 
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.config = get_config('QuantumOptimizer', {
             'MaxQuantumLevel': 10,
             'OptimizationIntervalSeconds': 300,
@@ -59,9 +60,17 @@ class QuantumOptimizer:
             'StabilityWeight': 0.7,
             'EfficiencyWeight': 0.3,
             'AutoApplyOptimizations': True,
-            'QuantumStatesHistorySize': 1000
+            'QuantumStatesHistorySize': 1000,
+            'RandomSeed': None  # None = nicht deterministisch
         })
 
+        # Injizierbarer Zufallsgenerator (Seed aus Parameter oder Konfiguration);
+        # betrifft nur das Rauschen in generate_quantum_state
+        if seed is None:
+            seed = self.config.get('RandomSeed')
+        self.seed = seed
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
         self.quantum_states: List[QuantumState] = []
         self.optimization_history: List[OptimizationResult] = []
         self.last_optimization = datetime.now()
@@ -71,6 +80,17 @@ class QuantumOptimizer:
         max_level = self.config.get('MaxQuantumLevel', 10)
         print(f"   Max Quantum Level: {max_level}")
         print(f"   Auto-Apply: {self.config.get('AutoApplyOptimizations', True)}")
+        if self.seed is not None:
+            print(f"   Deterministischer Modus: Seed {self.seed}")
+
+    def set_seed(self, seed: Optional[int]):
+        """Setzt den Zufallsgenerator neu (None = nicht deterministisch)"""
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+
+    def set_rng(self, rng: np.random.Generator):
+        """Injiziert einen externen NumPy-Generator (z.B. für Benchmarks/Tests)"""
+        self.rng = rng
 
     def calculate_quantum_potential(self, rig_data: Dict[str, Any]) -> float:
         """Berechnet das Quantenpotenzial eines Rigs"""
@@ -112,14 +132,14 @@ class QuantumOptimizer:
 
         # Stabilitätsfaktor mit Rauschen
         stability_base = rig_data.get('stability', 0.9)
-        stability_noise = random.gauss(0, 0.05)
+        stability_noise = self.rng.normal(0, 0.05)
         stability_factor = max(0.0, min(1.0, stability_base + stability_noise))
 
         # Konvergenzrate basierend auf aktueller Performance
         convergence_rate = potential * stability_factor
 
         # Optimierungspotenzial
-        optimization_potential = potential * (1 + random.uniform(-0.1, 0.1))
+        optimization_potential = potential * (1 + self.rng.uniform(-0.1, 0.1))
 
         return QuantumState(
             energy_level=energy_level,
@@ -185,11 +205,17 @@ class QuantumOptimizer:
 
         return best_result
 
-    def optimize_all_rigs(self) -> List[OptimizationResult]:
-        """Optimiert alle Rigs mit Quantum-Algorithmus"""
+    def optimize_all_rigs(self, rigs: Optional[List[Dict[str, Any]]] = None) -> List[OptimizationResult]:
+        """Optimiert alle Rigs mit Quantum-Algorithmus
+
+        Ohne ``rigs`` wird die konfigurierte Flotte verwendet; der Benchmark
+        übergibt hier synthetische Flotten. Der Pfad ist deterministisch (kein
+        Zufall, unabhängig vom Seed); die Ergebnisse kommen in Flotten-Reihenfolge.
+        """
         print("Starte Quantum-Optimierung fuer alle Rigs...")
 
-        rigs = get_rigs_config()
+        if rigs is None:
+            rigs = get_rigs_config()
         results = []
 
         # Parallele Verarbeitung
@@ -199,8 +225,8 @@ class QuantumOptimizer:
             future = self.executor.submit(self.quantum_optimization_algorithm, rig_id, rig)
             futures.append(future)
 
-        # Ergebnisse sammeln
-        for future in as_completed(futures):
+        # Ergebnisse in Flotten-Reihenfolge sammeln (reproduzierbar)
+        for future in futures:
             try:
                 result = future.result()
                 results.append(result)
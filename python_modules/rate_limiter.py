@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - RATE LIMITER
+Token-Buckets und prioritätsbasierter Request-Scheduler für externe APIs
+Wartet auf freie Tokens statt Requests in Rate-Limits laufen zu lassen
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Optional
+
+
+class RateLimitTimeout(Exception):
+    """Kein Token innerhalb der erlaubten Wartezeit verfügbar"""
+
+
+class TokenBucket:
+    """Klassischer Token-Bucket mit Sperre nach Retry-After (nicht thread-sicher)"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_available(self, tokens: float = 1.0, now: Optional[float] = None) -> float:
+        """Sekunden bis tokens verfügbar sind (0 = sofort)"""
+        now = time.monotonic() if now is None else now
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self._refill(now)
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate if self.rate > 0 else float('inf')
+
+    def consume(self, tokens: float = 1.0):
+        self.tokens -= tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        if self.time_until_available(tokens) == 0.0:
+            self.consume(tokens)
+            return True
+        return False
+
+    def block_for(self, seconds: float):
+        """Sperrt den Bucket (z.B. nach HTTP 429 mit Retry-After)"""
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = self.blocked_until
+
+
+class _Ticket:
+    __slots__ = ('priority', 'seq', 'endpoint_class', 'granted', 'enqueued_at')
+
+    def __init__(self, priority: int, seq: int, endpoint_class: str):
+        self.priority = priority
+        self.seq = seq
+        self.endpoint_class = endpoint_class
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other: '_Ticket') -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RequestScheduler:
+    """Vergibt Request-Slots je Endpoint-Klasse nach Priorität
+
+    Jede Klasse hat einen eigenen Token-Bucket, zusätzlich teilen sich alle
+    Klassen einen globalen Bucket. Ist der globale Bucket leer, werden
+    Slots strikt nach Priorität vergeben (niedrigere Zahl = wichtiger);
+    ist nur der Bucket einer Klasse leer, dürfen andere Klassen vorbei.
+    """
+
+    def __init__(self, class_limits: Dict[str, Dict[str, float]],
+                 global_limit: Optional[Dict[str, float]] = None,
+                 priorities: Optional[Dict[str, int]] = None, default_timeout: float = 30.0):
+        self.buckets = {
+            name: TokenBucket(limit.get('Rate', 1.0), limit.get('Burst', 1.0))
+            for name, limit in class_limits.items()
+        }
+        self.global_bucket = (TokenBucket(global_limit.get('Rate', 1.0), global_limit.get('Burst', 1.0))
+                              if global_limit else None)
+        self.priorities = dict(priorities or {})
+        self.default_timeout = default_timeout
+
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._seq = itertools.count()
+        self.metrics = {
+            name: {'granted': 0, 'timeouts': 0, 'rate_limited': 0, 'max_queue_depth': 0,
+                   'wait_ms': deque(maxlen=500)}
+            for name in self.buckets
+        }
+
+    def _dispatch(self, now: float) -> Optional[float]:
+        """Vergibt freie Slots; liefert Sekunden bis zur nächsten Vergabe"""
+        next_wait = None
+        granted = False
+        for ticket in sorted(self._waiting):
+            class_wait = self.buckets[ticket.endpoint_class].time_until_available(now=now)
+            global_wait = self.global_bucket.time_until_available(now=now) if self.global_bucket else 0.0
+
+            if class_wait == 0.0 and global_wait == 0.0:
+                self.buckets[ticket.endpoint_class].consume()
+                if self.global_bucket:
+                    self.global_bucket.consume()
+                ticket.granted = True
+                granted = True
+                continue
+
+            wait = max(class_wait, global_wait)
+            next_wait = wait if next_wait is None else min(next_wait, wait)
+            if global_wait > 0:
+                # Globaler Bucket leer: niemand mit niedrigerer Priorität darf vorbei
+                break
+
+        if granted:
+            self._waiting = [ticket for ticket in self._waiting if not ticket.granted]
+            heapq.heapify(self._waiting)
+            self._cond.notify_all()
+        return next_wait
+
+    def acquire(self, endpoint_class: str, priority: Optional[int] = None,
+                timeout: Optional[float] = None) -> float:
+        """Blockiert bis ein Slot frei ist; liefert die Wartezeit in Sekunden"""
+        if endpoint_class not in self.buckets:
+            raise ValueError(f"Unbekannte Endpoint-Klasse: {endpoint_class}")
+        if priority is None:
+            priority = self.priorities.get(endpoint_class, 100)
+        timeout = self.default_timeout if timeout is None else timeout
+        metrics = self.metrics[endpoint_class]
+
+        with self._cond:
+            ticket = _Ticket(priority, next(self._seq), endpoint_class)
+            heapq.heappush(self._waiting, ticket)
+            depth = sum(1 for t in self._waiting if t.endpoint_class == endpoint_class)
+            metrics['max_queue_depth'] = max(metrics['max_queue_depth'], depth)
+            deadline = ticket.enqueued_at + timeout
+
+            while True:
+                now = time.monotonic()
+                next_wait = self._dispatch(now)
+                if ticket.granted:
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    metrics['timeouts'] += 1
+                    self._cond.notify_all()
+                    raise RateLimitTimeout(f"Kein Slot für {endpoint_class} innerhalb {timeout:.1f}s")
+                self._cond.wait(min(remaining, next_wait if next_wait is not None else remaining))
+
+            waited = time.monotonic() - ticket.enqueued_at
+            metrics['granted'] += 1
+            metrics['wait_ms'].append(waited * 1000)
+            return waited
+
+    def penalize(self, endpoint_class: str, retry_after_seconds: float):
+        """Honoriert Retry-After: sperrt die Klasse für die angegebene Zeit"""
+        with self._cond:
+            self.buckets[endpoint_class].block_for(retry_after_seconds)
+            self.metrics[endpoint_class]['rate_limited'] += 1
+            self._cond.notify_all()
+
+    def execute(self, endpoint_class: str, fn: Callable[[], Any], priority: Optional[int] = None,
+                timeout: Optional[float] = None, max_rate_limit_retries: int = 2,
+                retry_after_default: float = 1.0) -> Any:
+        """Führt fn mit Slot aus; HTTP 429 sperrt die Klasse und wiederholt den Request"""
+        attempt = 0
+        while True:
+            self.acquire(endpoint_class, priority, timeout)
+            response = fn()
+            if getattr(response, 'status_code', None) != 429 or attempt >= max_rate_limit_retries:
+                return response
+            self.penalize(endpoint_class, parse_retry_after(response, retry_after_default))
+            attempt += 1
+
+    def queue_depth(self, endpoint_class: Optional[str] = None) -> int:
+        with self._cond:
+            return sum(1 for t in self._waiting if endpoint_class is None or t.endpoint_class == endpoint_class)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue-Tiefe, Wartezeiten und 429-Zähler je Endpoint-Klasse"""
+        with self._cond:
+            result = {}
+            for name, metrics in self.metrics.items():
+                waits = sorted(metrics['wait_ms'])
+                result[name] = {
+                    'queue_depth': sum(1 for t in self._waiting if t.endpoint_class == name),
+                    'max_queue_depth': metrics['max_queue_depth'],
+                    'granted': metrics['granted'],
+                    'timeouts': metrics['timeouts'],
+                    'rate_limited': metrics['rate_limited'],
+                    'wait_p50_ms': waits[len(waits) // 2] if waits else 0.0,
+                    'wait_p95_ms': waits[int(len(waits) * 0.95)] if waits else 0.0,
+                    'wait_max_ms': waits[-1] if waits else 0.0,
+                }
+            return result
+
+
+def parse_retry_after(response: Any, default: float = 1.0) -> float:
+    """Liest Retry-After (Sekunden) aus einer HTTP-Antwort"""
+    value = getattr(response, 'headers', {}).get('Retry-After')
+    try:
+        return max(float(value), 0.0) if value is not None else default
+    except (TypeError, ValueError):
+        return default
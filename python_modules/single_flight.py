@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - SINGLE FLIGHT
+Bündelt gleichzeitige Abfragen mit demselben Schlüssel zu einem einzigen Fetch
+Verhindert doppelte HTTP-Requests wenn mehrere Threads gleichzeitig Cache-Misses haben
+"""
+import threading
+from typing import Dict, Any, Callable, Optional
+
+
+class _Call:
+    """Ein laufender Fetch, auf den weitere Aufrufer warten"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Pro Schlüssel läuft höchstens ein Fetch; alle Aufrufer teilen sein Ergebnis"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.stats = {'executions': 0, 'shared': 0, 'errors': 0}
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Führt fn aus oder wartet auf den bereits laufenden Aufruf für key
+
+        Fehler des führenden Aufrufs werden an alle wartenden Aufrufer
+        weitergegeben. Nach Abschluss wird der Schlüssel sofort freigegeben,
+        das Ergebnis wird hier nicht gecacht.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.stats['shared'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats['executions'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            self.stats['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key: str) -> bool:
+        """Prüft ob für key gerade ein Fetch läuft"""
+        with self._lock:
+            return key in self._calls
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiken: ausgeführte Fetches, geteilte Ergebnisse, Fehler"""
+        with self._lock:
+            return {**self.stats, 'in_flight': len(self._calls)}
+
+
+# Globale Single-Flight Instanz (geteilt von Markt-, Pool- und Energie-Abfragen)
+single_flight = SingleFlight()
+
+
+def single_flight_do(key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Führt fn gebündelt über die globale Single-Flight Instanz aus"""
+    return single_flight.do(key, fn, *args, **kwargs)
+
+
+def get_single_flight_stats() -> Dict[str, Any]:
+    """Statistiken der globalen Single-Flight Instanz"""
+    return single_flight.get_stats()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - SWITCH EXECUTOR
+Parallele, begrenzte Ausführung von Algorithmus-Wechseln über viele Rigs
+Mit Ergebnis-Tracking pro Rig und Rollback bei Teilausfällen
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional, Tuple
+
+
+RigSwitchFn = Callable[[str, str], None]
+
+
+class SwitchExecutor:
+    """Wendet Algorithmus-Wechsel parallel mit begrenzter Parallelität an"""
+
+    def __init__(self, max_parallel: int = 16, timeout_seconds: float = 30.0,
+                 rollback_on_failure: bool = True, switch_delay_seconds: float = 2.0,
+                 apply_fn: Optional[RigSwitchFn] = None):
+        self.max_parallel = max(1, int(max_parallel))
+        self.timeout_seconds = timeout_seconds
+        self.rollback_on_failure = rollback_on_failure
+        self.switch_delay_seconds = switch_delay_seconds
+        self.apply_fn: RigSwitchFn = apply_fn or self._simulate_rig_switch
+        self.executor = ThreadPoolExecutor(max_workers=self.max_parallel,
+                                           thread_name_prefix="rig-switch")
+        self.last_execution: Optional[Dict[str, Any]] = None
+
+    def _simulate_rig_switch(self, rig_id: str, algorithm: str):
+        """Standard-Anwendung: simuliert Treiber-/Pool-Umstellung eines Rigs"""
+        # Hier würde die eigentliche Hardware-Konfiguration erfolgen
+        # (GPU-Treiber neu laden, Pool-URLs ändern, etc.)
+        time.sleep(self.switch_delay_seconds)
+
+    def _timed_apply(self, rig_id: str, algorithm: str) -> float:
+        start = time.perf_counter()
+        self.apply_fn(rig_id, algorithm)
+        return (time.perf_counter() - start) * 1000
+
+    def _run_parallel(self, targets: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Führt apply_fn für alle Rigs parallel aus und sammelt Ergebnisse
+
+        Das Timeout gilt pro Rig ab dessen Start, nicht für den ganzen Batch:
+        Rigs, die hinter max_parallel warten, verbrauchen noch kein Budget.
+        Überfällige Rigs lassen sich nicht abbrechen; auf sie wird vor der
+        Rückgabe erneut bis zu timeout_seconds gewartet, damit das Ergebnis
+        den tatsächlichen Zustand beschreibt (completed_late / in_flight).
+        """
+        started: Dict[str, float] = {}
+
+        def run(rig_id: str, algorithm: str) -> float:
+            started[rig_id] = time.monotonic()
+            return self._timed_apply(rig_id, algorithm)
+
+        futures = {
+            self.executor.submit(run, rig_id, algorithm): rig_id
+            for rig_id, algorithm in targets.items()
+        }
+        # Obergrenze für Rigs, die nie einen Worker bekommen (z.B. hängende Worker)
+        waves = -(-len(futures) // self.max_parallel)
+        batch_deadline = time.monotonic() + self.timeout_seconds * (waves + 1)
+
+        outcomes: Dict[str, Dict[str, Any]] = {}
+        overdue = {}
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            deadlines = [started[futures[future]] + self.timeout_seconds
+                         for future in pending if futures[future] in started]
+            next_deadline = min(deadlines + [batch_deadline])
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - now),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                outcomes[futures[future]] = self._outcome(future, targets[futures[future]])
+
+            now = time.monotonic()
+            for future in list(pending):
+                rig_id = futures[future]
+                if future.done():
+                    continue
+                if rig_id in started:
+                    if now - started[rig_id] < self.timeout_seconds:
+                        continue
+                    overdue[future] = rig_id
+                elif now < batch_deadline or not future.cancel():
+                    continue
+                pending.discard(future)
+                outcomes[rig_id] = {'status': 'timeout', 'algorithm': targets[rig_id],
+                                    'started': rig_id in started, 'in_flight': rig_id in started,
+                                    'completed_late': False,
+                                    'error': f'Timeout nach {self.timeout_seconds}s'
+                                             if rig_id in started else 'Nicht gestartet'}
+
+        if overdue:
+            # Laufende Wechsel können nicht abgebrochen werden: Ende abwarten
+            wait(overdue, timeout=self.timeout_seconds)
+            for future, rig_id in overdue.items():
+                outcome = outcomes[rig_id]
+                outcome['in_flight'] = not future.done()
+                outcome['completed_late'] = future.done() and future.exception() is None
+        return outcomes
+
+    @staticmethod
+    def _outcome(future, algorithm: str) -> Dict[str, Any]:
+        try:
+            return {'status': 'switched', 'algorithm': algorithm, 'duration_ms': future.result()}
+        except Exception as e:
+            return {'status': 'failed', 'algorithm': algorithm, 'error': str(e)}
+
+    def execute(self, changes: Dict[str, Tuple[str, str]]) -> Dict[str, Any]:
+        """Wendet Wechsel an: changes = {rig_id: (alter_algorithmus, neuer_algorithmus)}"""
+        start = time.perf_counter()
+
+        targets = {rig_id: new for rig_id, (_, new) in changes.items()}
+        outcomes = self._run_parallel(targets) if targets else {}
+
+        failed = [rig_id for rig_id, outcome in outcomes.items() if outcome['status'] != 'switched']
+        rolled_back = []
+
+        if failed and self.rollback_on_failure:
+            # Umgestellte Rigs auf den vorherigen Algorithmus zurücksetzen; dazu
+            # zählen überfällige Rigs, deren Wechsel inzwischen beendet ist
+            # (Zustand unklar), nicht aber noch laufende oder nie gestartete
+            rollback_targets = {
+                rig_id: changes[rig_id][0]
+                for rig_id, outcome in outcomes.items()
+                if changes[rig_id][0] and (
+                    outcome['status'] == 'switched'
+                    or (outcome['status'] == 'timeout' and outcome['started'] and not outcome['in_flight']))
+            }
+            rollback_outcomes = self._run_parallel(rollback_targets) if rollback_targets else {}
+            for rig_id, outcome in rollback_outcomes.items():
+                if outcome['status'] == 'switched':
+                    outcomes[rig_id]['status'] = 'rolled_back'
+                    rolled_back.append(rig_id)
+                else:
+                    outcomes[rig_id]['status'] = 'rollback_failed'
+                    outcomes[rig_id]['error'] = outcome.get('error')
+
+        result = {
+            'success': not failed,
+            'total_rigs': len(changes),
+            'switched_rigs': sum(1 for o in outcomes.values() if o['status'] == 'switched'),
+            'failed_rigs': failed,
+            'rolled_back_rigs': rolled_back,
+            'rig_results': outcomes,
+            'duration_ms': (time.perf_counter() - start) * 1000,
+            'timestamp': datetime.now().isoformat(),
+        }
+        self.last_execution = result
+        return result
+
+    def shutdown(self):
+        """Beendet den Worker-Pool"""
+        self.executor.shutdown(wait=False)
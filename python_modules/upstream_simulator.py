@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - UPSTREAM SIMULATOR
+Lokaler Stand-in Server für NiceHash, CoinGecko, Binance und Coinbase
+Konfigurierbare Latenz, Fehlerquote und Rate-Limits; Benchmark-Modus für die Integrationen
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+
+# Basispreise (USD) und NiceHash-Algorithmen des Simulators
+BASE_PRICES_USD = {
+    'BTC': 45000.0, 'ETH': 2800.0, 'RVN': 0.035, 'XMR': 150.0, 'ERG': 1.5,
+    'CFX': 0.15, 'KAS': 0.12, 'ETC': 25.0, 'BCH': 250.0,
+}
+COINGECKO_IDS = {
+    'bitcoin': 'BTC', 'ethereum': 'ETH', 'ravencoin': 'RVN', 'monero': 'XMR', 'ergo': 'ERG',
+    'conflux-token': 'CFX', 'kaspa': 'KAS', 'ethereum-classic': 'ETC', 'bitcoin-cash': 'BCH',
+}
+NICEHASH_ALGORITHMS = {
+    'DAGGERHASHIMOTO': 25000000, 'ETCHASH': 22000000, 'KAWPOW': 15000000, 'RANDOMXMONERO': 9000000,
+    'AUTOLYKOS': 12000000, 'OCTOPUS': 11000000, 'KHEAVYHASH': 8000000, 'SHA256ASICBOOST': 5000000,
+}
+USD_TO_CHF = 0.88
+
+
+def _route_upstream(path: str) -> Optional[str]:
+    """Ordnet einen Pfad dem simulierten Upstream zu"""
+    if path.startswith('/main/api/v2/'):
+        return 'nicehash'
+    if path.startswith('/api/v3/simple/'):
+        return 'coingecko'
+    if path.startswith('/api/v3/ticker/'):
+        return 'binance'
+    if path.startswith('/v2/exchange-rates'):
+        return 'coinbase'
+    return None
+
+
+class _UpstreamBucket:
+    """Serverseitiges Rate-Limit (Token-Bucket) je Upstream"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """0 wenn erlaubt, sonst Sekunden bis zum nächsten Token"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class UpstreamSimulator:
+    """ThreadingHTTPServer, der die genutzten Upstream-Endpoints nachbildet"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency_ms: float = 50.0,
+                 jitter_ms: float = 20.0, error_rate: float = 0.0,
+                 rate_limit_per_second: Optional[float] = None, burst: Optional[float] = None,
+                 seed: int = 42):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_per_second = rate_limit_per_second
+        self.burst = burst if burst is not None else (rate_limit_per_second or 0) * 2
+        self.rng = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _UpstreamBucket] = {}
+        self._price_state = dict(BASE_PRICES_USD)
+        self._price_updated = time.monotonic()
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.created_rigs: List[Dict[str, Any]] = []
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> str:
+        """Startet den Server im Hintergrund und liefert die Basis-URL"""
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                simulator._handle(self, 'GET')
+
+            def do_POST(self):
+                simulator._handle(self, 'POST')
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def _count(self, endpoint: str, key: str):
+        with self._lock:
+            stats = self.stats.setdefault(endpoint, {'requests': 0, 'errors': 0, 'rate_limited': 0})
+            stats[key] += 1
+
+    def _check_rate_limit(self, upstream: str) -> float:
+        if not self.rate_limit_per_second:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.get(upstream)
+            if bucket is None:
+                bucket = self._buckets[upstream] = _UpstreamBucket(self.rate_limit_per_second, self.burst)
+            return bucket.take()
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str):
+        parts = urlsplit(handler.path)
+        upstream = _route_upstream(parts.path)
+        endpoint = f"{method} {parts.path}"
+        self._count(endpoint, 'requests')
+
+        body_length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(body_length) if body_length else b''
+
+        delay = max(0.0, self.rng.gauss(self.latency_ms, self.jitter_ms)) / 1000
+        time.sleep(delay)
+
+        if upstream is None:
+            return self._send(handler, 404, {'error': 'unknown endpoint'})
+
+        retry_after = self._check_rate_limit(upstream)
+        if retry_after > 0:
+            self._count(endpoint, 'rate_limited')
+            return self._send(handler, 429, {'error': 'rate limited'},
+                              {'Retry-After': f"{math.ceil(retry_after * 10) / 10:.1f}"})
+
+        if self.rng.random() < self.error_rate:
+            self._count(endpoint, 'errors')
+            return self._send(handler, 503, {'error': 'simulated upstream failure'})
+
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        payload = self._build_response(method, parts.path, query, body)
+        if payload is None:
+            return self._send(handler, 404, {'error': 'unknown endpoint'})
+        self._send(handler, 200, payload)
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, payload: Any,
+              headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload).encode('utf-8')
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _current_prices(self) -> Dict[str, float]:
+        """Preise als Random-Walk, der sich höchstens einmal pro Sekunde bewegt"""
+        with self._lock:
+            if time.monotonic() - self._price_updated >= 1.0:
+                self._price_updated = time.monotonic()
+                for coin, price in self._price_state.items():
+                    self._price_state[coin] = price * math.exp(self.rng.gauss(0, 0.002))
+            return dict(self._price_state)
+
+    def _build_response(self, method: str, path: str, query: Dict[str, str], body: bytes) -> Optional[Any]:
+        now_ms = int(time.time() * 1000)
+        prices = self._current_prices()
+
+        if method == 'GET' and path == '/main/api/v2/public/stats/global/current':
+            return {'algos': [
+                {'algorithm': algo, 'paying': paying * (1 + self.rng.uniform(-0.05, 0.05)),
+                 'difficulty': 1e12, 'speed': 1e9, 'marketFactor': 1.0, 'timestamp': now_ms}
+                for algo, paying in NICEHASH_ALGORITHMS.items()
+            ]}
+        if method == 'GET' and path == '/main/api/v2/public/simplemultialgo/info':
+            return {'miningAlgorithms': [
+                {'algorithm': algo, 'paying': f"{paying / 1e8:.8f}"} for algo, paying in NICEHASH_ALGORITHMS.items()
+            ]}
+        if method == 'GET' and path == '/main/api/v2/mining/rigs2':
+            return {'miningRigs': [
+                {'rigId': f"sim_rig_{i}", 'name': f"Sim Rig {i}", 'minerStatus': 'MINING',
+                 'algorithm': 'DAGGERHASHIMOTO', 'totalProfitabilityLocal': 10.0 + i,
+                 'totalHashrate': 90 + i, 'deviceId': [f"gpu{i}"], 'profitabilityLocal': 10.0 + i,
+                 'unpaidAmount': 0.01 * i}
+                for i in range(3 + len(self.created_rigs))
+            ]}
+        if method == 'POST' and path == '/main/api/v2/mining/rig':
+            rig = json.loads(body or b'{}')
+            with self._lock:
+                self.created_rigs.append(rig)
+            return {'success': True, 'rigId': f"sim_rig_created_{len(self.created_rigs)}"}
+
+        if method == 'GET' and path == '/api/v3/simple/price':
+            ids = [coin_id for coin_id in query.get('ids', '').split(',') if coin_id in COINGECKO_IDS]
+            return {
+                coin_id: {'usd': prices[COINGECKO_IDS[coin_id]],
+                          'chf': prices[COINGECKO_IDS[coin_id]] * USD_TO_CHF,
+                          'usd_24h_change': self.rng.uniform(-5, 5)}
+                for coin_id in ids
+            }
+        if method == 'GET' and path == '/api/v3/ticker/24hr':
+            symbols = json.loads(query.get('symbols', '[]'))
+            return [
+                {'symbol': symbol, 'lastPrice': f"{prices[symbol[:-4]]:.8f}",
+                 'priceChangePercent': f"{self.rng.uniform(-5, 5):.3f}"}
+                for symbol in symbols if symbol.endswith('USDT') and symbol[:-4] in prices
+            ]
+        if method == 'GET' and path == '/v2/exchange-rates':
+            rates = {coin: f"{1 / price:.12f}" for coin, price in prices.items()}
+            rates['CHF'] = f"{USD_TO_CHF:.4f}"
+            return {'data': {'currency': 'USD', 'rates': rates}}
+        return None
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self.stats.items()}
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    values = np.percentile(np.asarray(samples), (50, 95, 99))
+    return {'p50': float(values[0]), 'p95': float(values[1]), 'p99': float(values[2])}
+
+
+def run_integration_benchmark(simulator: UpstreamSimulator, threads: int = 16, duration_seconds: float = 10.0,
+                              cache_ttl_seconds: Optional[float] = None, seed: int = 42) -> Dict[str, Any]:
+    """Treibt NiceHash- und Markt-Integration gleichzeitig gegen den Simulator"""
+    try:
+        from python_modules.nicehash_integration import NiceHashIntegration
+        from python_modules.market_integration import MarketIntegration
+        from python_modules.single_flight import single_flight
+        from python_modules.http_client import http_client
+    except ModuleNotFoundError:
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from python_modules.nicehash_integration import NiceHashIntegration
+        from python_modules.market_integration import MarketIntegration
+        from python_modules.single_flight import single_flight
+        from python_modules.http_client import http_client
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        nicehash = NiceHashIntegration()
+        market = MarketIntegration()
+    nicehash.base_url = simulator.url
+    nicehash.api_key = nicehash.api_key or 'simulator-key'
+    nicehash.api_secret = nicehash.api_secret or 'simulator-secret'
+    market.cache_file = os.devnull
+    market.price_history_file = None
+    market.background_refresh_enabled = False
+    market.market_data = {}
+    market._prices_fetched_at = None
+    for provider in market.providers:
+        provider.base_url = simulator.url + ('/api/v3' if provider.name == 'coingecko' else '')
+    if cache_ttl_seconds is not None:
+        market.cache_duration = cache_ttl_seconds
+        nicehash.response_cache.default_ttl = cache_ttl_seconds
+        nicehash.response_cache.endpoint_ttls = {
+            prefix: cache_ttl_seconds for prefix in nicehash.response_cache.endpoint_ttls
+        }
+    http_client.reset_stats()
+    flight_before = single_flight.get_stats()
+
+    operations = {
+        'pool_stats': nicehash.get_pool_stats,
+        'mining_rigs': nicehash.get_mining_rigs,
+        'crypto_prices': market.get_crypto_prices,
+    }
+    latencies: Dict[str, List[float]] = {name: [] for name in operations}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration_seconds
+
+    def worker(worker_seed: int):
+        rng = random.Random(worker_seed)
+        names = list(operations)
+        local: Dict[str, List[float]] = {name: [] for name in names}
+        while time.monotonic() < stop_at:
+            name = rng.choice(names)
+            start = time.perf_counter()
+            operations[name]()
+            local[name].append((time.perf_counter() - start) * 1000)
+        with lock:
+            for name, values in local.items():
+                latencies[name].extend(values)
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        workers = [threading.Thread(target=worker, args=(seed + i,)) for i in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    market.stop_background_refresh()
+
+    server_stats = simulator.get_stats()
+    upstream_requests = sum(stats['requests'] for stats in server_stats.values())
+    total_calls = sum(len(values) for values in latencies.values())
+    flight_after = single_flight.get_stats()
+
+    return {
+        'threads': threads,
+        'duration_seconds': duration_seconds,
+        'total_calls': total_calls,
+        'calls_per_second': total_calls / duration_seconds if duration_seconds else 0.0,
+        'upstream_requests': upstream_requests,
+        'upstream_ratio': upstream_requests / total_calls if total_calls else 0.0,
+        'operations': {
+            name: {'calls': len(values), 'latency_ms': _percentiles(values)}
+            for name, values in latencies.items()
+        },
+        'server': server_stats,
+        'nicehash_cache': nicehash.response_cache.get_metrics(),
+        'market_cache': dict(market.cache_stats),
+        'single_flight_shared': flight_after['shared'] - flight_before['shared'],
+        'provider_stats': market.get_provider_stats(),
+        'http_stats': http_client.get_latency_stats(),
+        'timestamp': datetime.now().isoformat(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Lokaler Upstream-Simulator (NiceHash/CoinGecko/Binance/Coinbase)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=None, help="Requests pro Sekunde je Upstream")
+    parser.add_argument('--burst', type=float, default=None)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--benchmark', action='store_true', help="Integrationen gegen den Simulator messen")
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--cache-ttl', type=float, default=None, help="Cache-TTL (s) für den Benchmark")
+    parser.add_argument('--output', help="Benchmark-Ergebnisse als JSON speichern")
+    args = parser.parse_args(argv)
+
+    print("CASH MONEY COLORS ORIGINAL (R) - UPSTREAM SIMULATOR")
+    print("=" * 60)
+
+    simulator = UpstreamSimulator(
+        host=args.host, port=0 if args.benchmark else args.port, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_limit_per_second=args.rate_limit, burst=args.burst, seed=args.seed,
+    )
+    url = simulator.start()
+    print(f"Simulator läuft auf {url}")
+
+    if not args.benchmark:
+        print("Pools.NiceHash.BaseUrl und Market.ProviderBaseUrls auf diese URL setzen (Strg+C beendet)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            simulator.stop()
+        return 0
+
+    results = run_integration_benchmark(simulator, threads=args.threads, duration_seconds=args.duration,
+                                        cache_ttl_seconds=args.cache_ttl, seed=args.seed)
+    simulator.stop()
+
+    print(f"Aufrufe: {results['total_calls']} ({results['calls_per_second']:.0f}/s) | "
+          f"Upstream-Requests: {results['upstream_requests']} ({results['upstream_ratio'] * 100:.2f}%)")
+    for name, operation in results['operations'].items():
+        latency = operation['latency_ms']
+        print(f"   {name:14s} {operation['calls']:8d} Aufrufe | p50 {latency['p50']:.2f} ms | "
+              f"p95 {latency['p95']:.2f} ms | p99 {latency['p99']:.2f} ms")
+    print(f"NiceHash-Cache Trefferquote: {results['nicehash_cache']['hit_rate'] * 100:.1f}% | "
+          f"Single-Flight geteilt: {results['single_flight_shared']}")
+    for endpoint, stats in results['server'].items():
+        print(f"   {endpoint:45s} {stats['requests']:6d} req | {stats['errors']} Fehler | "
+              f"{stats['rate_limited']} x 429")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"Ergebnisse gespeichert: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - PRICE HISTORY TESTS
+Inkrementelle Kennzahlen gegen Brute-Force-Neuberechnung
+Inklusive Überschreiben derselben Minute, Lücken und Verdrängung bei voller Kapazität
+"""
+import math
+import random
+
+import numpy as np
+import pytest
+
+from python_modules.price_history import MINUTES_PER_DAY, CoinPriceSeries, PriceHistory
+
+
+CAPACITY = 120
+WINDOW_MINUTES = 45
+HALFLIFE_MINUTES = 20.0
+
+
+def _brute_metrics(samples, capacity, window_minutes, halflife_minutes):
+    """Kennzahlen direkt aus allen Schlusskursen [(Minute, Preis), ...]"""
+    window_minutes = min(window_minutes, capacity - 1)
+    retained = samples[-capacity:]
+    minutes = [minute for minute, _ in retained]
+    prices = [price for _, price in retained]
+    last_minute, last_price = minutes[-1], prices[-1]
+    cutoff = last_minute - window_minutes
+
+    sum_sq, sum_dt = 0.0, 0
+    for i in range(1, len(retained)):
+        if minutes[i - 1] >= cutoff:
+            r = math.log(prices[i] / prices[i - 1])
+            sum_sq += r * r
+            sum_dt += minutes[i] - minutes[i - 1]
+    realized = math.sqrt(sum_sq / sum_dt * MINUTES_PER_DAY) * 100 if sum_dt else None
+
+    # EWMA läuft über die gesamte Historie, auch über verdrängte Stichproben
+    tau = halflife_minutes / math.log(2)
+    var = None
+    for (m0, p0), (m1, p1) in zip(samples, samples[1:]):
+        dt = m1 - m0
+        rate = math.log(p1 / p0) ** 2 / max(dt, 1)
+        decay = math.exp(-dt / tau)
+        var = rate if var is None else decay * var + (1.0 - decay) * rate
+    ewma = math.sqrt(var * MINUTES_PER_DAY) * 100 if var is not None else None
+
+    window_high = max(price for minute, price in retained if minute >= cutoff)
+    return {
+        'realized_volatility': realized,
+        'ewma_volatility': ewma,
+        'window_high': window_high,
+        'drawdown_percent': (last_price / window_high - 1.0) * 100,
+        'window_minutes_covered': sum_dt,
+        'last_price': last_price,
+    }
+
+
+def _assert_metrics_match(actual, expected, rel=1e-9):
+    for key, value in expected.items():
+        if value is None:
+            assert actual[key] is None, key
+        else:
+            assert actual[key] == pytest.approx(value, rel=rel, abs=1e-9), key
+
+
+def _random_ticks(seed, steps):
+    """(Minute, Preis)-Ticks: ~40% Überschreiben derselben Minute, gelegentliche Lücken"""
+    rng = random.Random(seed)
+    minute, price = 1_000_000, 100.0
+    for _ in range(steps):
+        roll = rng.random()
+        if roll > 0.4:
+            minute += 1 if roll < 0.9 else rng.randint(2, 30)
+        price = max(0.01, price * math.exp(rng.gauss(0, 0.02)))
+        yield minute, price
+
+
+def _record_all(series, ticks):
+    samples = []
+    for minute, price in ticks:
+        series.record(minute, price)
+        if samples and samples[-1][0] == minute:
+            samples[-1] = (minute, price)
+        else:
+            samples.append((minute, price))
+        yield samples
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_metrics_match_brute_force(seed):
+    """Jeder Tick inkl. Überschreiben und Verdrängung bei voller Kapazität"""
+    series = CoinPriceSeries(CAPACITY, WINDOW_MINUTES, HALFLIFE_MINUTES)
+    evicted = False
+    for samples in _record_all(series, _random_ticks(seed, 3000)):
+        evicted = evicted or len(samples) > CAPACITY
+        _assert_metrics_match(series.metrics(),
+                              _brute_metrics(samples, CAPACITY, WINDOW_MINUTES, HALFLIFE_MINUTES))
+    assert evicted
+
+
+def test_lower_overwrite_restores_previous_window_high():
+    """Ein gesenkter Schlusskurs gibt das vorherige Fensterhoch wieder frei"""
+    series = CoinPriceSeries(CAPACITY, WINDOW_MINUTES, HALFLIFE_MINUTES)
+    for minute, price in enumerate([50.0, 80.0, 60.0, 70.0]):
+        series.record(minute, price)
+    series.record(3, 200.0)
+    assert series.metrics()['window_high'] == 200.0
+    series.record(3, 10.0)
+    metrics = series.metrics()
+    assert metrics['window_high'] == 80.0
+    assert metrics['drawdown_percent'] == pytest.approx((10.0 / 80.0 - 1.0) * 100)
+
+
+def test_window_high_expires_with_window():
+    series = CoinPriceSeries(CAPACITY, 10, HALFLIFE_MINUTES)
+    series.record(0, 500.0)
+    for minute in range(1, 30):
+        series.record(minute, 100.0 + minute)
+    assert series.metrics()['window_high'] == 129.0
+
+
+def test_load_matches_incremental_recording():
+    ticks = list(_random_ticks(7, 2000))
+    incremental = CoinPriceSeries(CAPACITY, WINDOW_MINUTES, HALFLIFE_MINUTES)
+    samples = list(_record_all(incremental, ticks))[-1]
+
+    loaded = CoinPriceSeries(CAPACITY, WINDOW_MINUTES, HALFLIFE_MINUTES)
+    minutes, prices = incremental.series()
+    loaded.load(minutes, prices)
+
+    expected = _brute_metrics(samples, CAPACITY, WINDOW_MINUTES, HALFLIFE_MINUTES)
+    # load() kennt nur die gespeicherte Historie: EWMA nur näherungsweise gleich
+    ewma = expected.pop('ewma_volatility')
+    _assert_metrics_match(loaded.metrics(), expected)
+    assert loaded.metrics()['ewma_volatility'] == pytest.approx(ewma, rel=1e-3)
+
+
+def test_volatility_requires_min_history():
+    history = PriceHistory(retention_days=1, window_hours=1, ewma_halflife_hours=0.5, min_history_minutes=30)
+    start = 1_700_000_000
+    for minute in range(20):
+        history.record('BTC', 100.0 + minute % 3, start + minute * 60)
+    assert history.get_volatility('BTC') is None
+    for minute in range(20, 40):
+        history.record('BTC', 100.0 + minute % 3, start + minute * 60)
+    assert history.get_volatility('BTC') > 0
+    assert history.get_volatility('BTC', 'ewma') > 0
+
+
+def test_invalid_and_out_of_order_prices_are_ignored():
+    series = CoinPriceSeries(CAPACITY, WINDOW_MINUTES, HALFLIFE_MINUTES)
+    series.record(10, 100.0)
+    series.record(11, 0.0)
+    series.record(11, float('nan'))
+    series.record(9, 50.0)
+    assert series.count == 1
+    assert series.last_price == 100.0
+    minutes, prices = series.series()
+    assert np.array_equal(minutes, [10]) and np.array_equal(prices, [100.0])
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - QUANTUM OPTIMIZER TESTS
+Seed-Reproduzierbarkeit der Quantenzustände und deterministischer Optimierungspfad
+"""
+import importlib
+
+import pytest
+
+
+@pytest.fixture
+def modules(tmp_path, monkeypatch):
+    """Import im Temp-Verzeichnis: die globalen Instanzen legen settings.json und logs/ an"""
+    monkeypatch.chdir(tmp_path)
+    optimizer_module = importlib.import_module('python_modules.quantum_optimizer')
+    benchmark_module = importlib.import_module('python_modules.quantum_benchmark')
+    return optimizer_module, benchmark_module
+
+
+def _run(modules, seed, fleet):
+    optimizer_module, benchmark_module = modules
+    optimizer = optimizer_module.QuantumOptimizer(seed=seed)
+    optimizer.config = dict(optimizer.config)
+    optimizer.config['AutoApplyOptimizations'] = False
+    try:
+        results = optimizer.optimize_all_rigs(fleet)
+        optimizer.set_seed(seed)
+        states = [(state.stability_factor, state.optimization_potential)
+                  for state in map(optimizer.generate_quantum_state, fleet)]
+    finally:
+        optimizer.executor.shutdown(wait=True)
+    return results, states, benchmark_module.result_checksum(results)
+
+
+def test_same_seed_reproduces_states_and_results(modules):
+    fleet = modules[1].generate_synthetic_fleet(200, seed=3)
+    results_a, states_a, checksum_a = _run(modules, 7, fleet)
+    results_b, states_b, checksum_b = _run(modules, 7, fleet)
+
+    assert states_a == states_b
+    assert checksum_a == checksum_b
+    # Ergebnisse in Flotten-Reihenfolge, unabhängig von der Thread-Abarbeitung
+    assert [r.rig_id for r in results_a] == [rig['id'] for rig in fleet]
+    assert [r.rig_id for r in results_b] == [rig['id'] for rig in fleet]
+
+
+def test_different_seed_changes_states_only(modules):
+    """Der Seed wirkt nur auf das Rauschen der Quantenzustände"""
+    fleet = modules[1].generate_synthetic_fleet(50, seed=3)
+    _, states_a, checksum_a = _run(modules, 1, fleet)
+    _, states_b, checksum_b = _run(modules, 2, fleet)
+
+    assert states_a != states_b
+    assert checksum_a == checksum_b
+
+
+def test_synthetic_fleet_is_seeded(modules):
+    generate = modules[1].generate_synthetic_fleet
+    assert generate(20, seed=5) == generate(20, seed=5)
+    assert generate(20, seed=5) != generate(20, seed=6)
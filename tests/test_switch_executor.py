@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+CASH MONEY COLORS ORIGINAL (R) - SWITCH EXECUTOR TESTS
+Timeout pro Rig ab Start, Flotten größer als max_parallel und Rollback überfälliger Rigs
+"""
+import threading
+import time
+
+from python_modules.switch_executor import SwitchExecutor
+
+
+def _changes(count: int):
+    return {f"rig_{i}": ("ethash", "kawpow") for i in range(count)}
+
+
+def test_fleet_larger_than_max_parallel_succeeds():
+    """20 Rigs mit 2 Workern: wartende Rigs dürfen kein Timeout-Budget verbrauchen"""
+    executor = SwitchExecutor(max_parallel=2, timeout_seconds=0.5, switch_delay_seconds=0.1)
+    try:
+        result = executor.execute(_changes(20))
+    finally:
+        executor.shutdown()
+
+    assert result['success'], result['failed_rigs']
+    assert result['switched_rigs'] == 20
+    assert result['rolled_back_rigs'] == []
+
+
+def test_overdue_rig_is_awaited_and_rolled_back():
+    """Ein überfälliger Rig wird abgewartet und zusammen mit den übrigen zurückgesetzt"""
+    applied = {}
+    lock = threading.Lock()
+
+    def apply(rig_id, algorithm):
+        time.sleep(0.8 if (rig_id, algorithm) == ("rig_3", "kawpow") else 0.02)
+        with lock:
+            applied[rig_id] = algorithm
+
+    executor = SwitchExecutor(max_parallel=2, timeout_seconds=0.5, apply_fn=apply)
+    try:
+        result = executor.execute(_changes(6))
+    finally:
+        executor.shutdown()
+
+    assert not result['success']
+    assert result['failed_rigs'] == ["rig_3"]
+    outcome = result['rig_results']["rig_3"]
+    assert outcome['completed_late'] and not outcome['in_flight']
+    assert sorted(result['rolled_back_rigs']) == sorted(_changes(6))
+    # Kein Rig bleibt auf dem neuen Algorithmus stehen
+    assert set(applied.values()) == {"ethash"}